@@ -1,5 +1,6 @@
 import logging
 import re
+from functools import lru_cache
 
 import torch
 from transformers import BertTokenizer
@@ -13,6 +14,21 @@ DEFAULT_TOKEN_LENGTH = 100  # Maximum length of tokens for BERT
 DEFAULT_ENCODE_BATCH_SIZE = 500  # Number of samples to encode at once
 NEWLINE_TOKEN = "[NL]"  # Special token for new lines
 DEFAULT_OWN_SEGMENT_IDS = False  # Whether to use own segment ids or not
+TOKENIZER_NAME = "bert-base-cased"
+
+
+@lru_cache(maxsize=2)
+def _load_tokenizer(own_segment_ids: bool = DEFAULT_OWN_SEGMENT_IDS) -> BertTokenizer:
+    """
+    Loads the BERT tokenizer once per process. With own segment ids, the special
+    NEWLINE token is added to the vocabulary of a separate tokenizer instance.
+    :param own_segment_ids: Whether to use own segment ids or not.
+    :return: The tokenizer. It must not be modified by the caller.
+    """
+    tokenizer = BertTokenizer.from_pretrained(TOKENIZER_NAME)
+    if own_segment_ids:
+        tokenizer.add_tokens(NEWLINE_TOKEN)
+    return tokenizer
 
 
 class BertEncoder(EncoderInterface):
@@ -39,12 +55,8 @@ class BertEncoder(EncoderInterface):
         :param own_segment_ids: Whether to use own segment ids or not.
         :return: The encoded dataset.
         """
-        # Load the BERT tokenizer
-        tokenizer = BertTokenizer.from_pretrained("bert-base-cased")
-
-        # Add a special token "NEWLINE" to the vocabulary
-        if own_segment_ids:
-            tokenizer.add_tokens(NEWLINE_TOKEN)
+        # Load the BERT tokenizer (with the special token "NEWLINE" if needed)
+        tokenizer = _load_tokenizer(own_segment_ids)
 
         # Split identifiers in code snippets
         for sample in unencoded_dataset:
@@ -102,11 +114,10 @@ class BertEncoder(EncoderInterface):
         :param own_segment_ids: Whether to use own segment ids or not.
         :return: A dictionary containing the encoded input_ids and attention_mask.
         """
-        tokenizer = BertTokenizer.from_pretrained("bert-base-cased")
+        tokenizer = _load_tokenizer(own_segment_ids)
 
-        # Add a special token "NEWLINE" to the vocabulary
+        # Add the special token "NEWLINE" to the text
         if own_segment_ids:
-            tokenizer.add_tokens(NEWLINE_TOKEN)
             text = _add_separators(text, NEWLINE_TOKEN)
 
         # Tokenize the text
@@ -55,7 +55,26 @@ class DatasetEncoder(EncoderInterface):
         matrix_dataset = self.matrix_encoder.encode_dataset(unencoded_dataset)
         bert_dataset = self.bert_encoder.encode_dataset(unencoded_dataset)
         image_dataset = self.visual_encoder.encode_dataset(unencoded_dataset)
+        return self.combine_encodings(
+            unencoded_dataset, matrix_dataset, bert_dataset, image_dataset
+        )
 
+    def combine_encodings(
+        self,
+        unencoded_dataset: list[dict],
+        matrix_dataset: ReadabilityDataset,
+        bert_dataset: ReadabilityDataset,
+        image_dataset: ReadabilityDataset,
+    ) -> ReadabilityDataset:
+        """
+        Combines the encodings of the single encoders with the names and the encoded
+        scores of the unencoded dataset.
+        :param unencoded_dataset: The unencoded dataset.
+        :param matrix_dataset: The matrix encodings.
+        :param bert_dataset: The bert encodings.
+        :param image_dataset: The image encodings.
+        :return: The encoded dataset.
+        """
         # Normalize the scores if they exist
         encoded_scores = ["" for _ in range(len(matrix_dataset))]
         if "score" in unencoded_dataset[0]:
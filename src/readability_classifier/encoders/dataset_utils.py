@@ -2,13 +2,27 @@ import logging
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
 import torch
 from datasets import Dataset as HFDataset
 from datasets import load_from_disk
 from sklearn.model_selection import KFold, train_test_split
-from torch.utils.data import DataLoader, Dataset
+from torch.utils.data import DataLoader, Dataset, default_collate, get_worker_info
 
-from src.readability_classifier.utils.config import DEFAULT_MODEL_BATCH_SIZE
+from src.readability_classifier.utils.config import (
+    DEFAULT_MODEL_BATCH_SIZE,
+    DEFAULT_NUM_WORKERS,
+    DEFAULT_PREFETCH_FACTOR,
+)
+from src.readability_classifier.utils.fold_scheduler import unflatten
+
+BERT_ID_FIELDS = (
+    "input_ids",
+    "token_type_ids",
+    "attention_mask",
+    "segment_ids",
+    "position_ids",
+)
 
 
 class ReadabilityDataset(Dataset):
@@ -65,6 +79,47 @@ class ReadabilityDataset(Dataset):
         return split_data
 
 
+class MemoryMappedDataset(Dataset):
+    """
+    A dataset of selected rows of memory mapped arrays (see
+    utils.fold_scheduler.load_memmap_dataset). The samples have the same structure as
+    the samples of a ReadabilityDataset, but are only read when accessed.
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], indices: np.ndarray = None):
+        """
+        Initialize the dataset.
+        :param arrays: The arrays by flat field name (e.g. "bert.input_ids").
+        :param indices: The rows of the dataset. If None, all rows are used.
+        """
+        self.arrays = arrays
+        num_rows = len(next(iter(arrays.values())))
+        self.indices = np.arange(num_rows) if indices is None else np.asarray(indices)
+
+    def __len__(self) -> int:
+        """
+        Return the total number of samples in the dataset.
+        """
+        return len(self.indices)
+
+    def __getitem__(
+        self, idx: int
+    ) -> dict[str, torch.Tensor | dict[str, torch.Tensor]]:
+        """
+        Return a sample from the dataset by its index. The row is copied out of the
+        read-only memory map.
+        :param idx: The index of the sample.
+        :return: The dictionary containing the sample.
+        """
+        row = self.indices[idx]
+        return unflatten(
+            {
+                key: torch.from_numpy(np.array(array[row]))
+                for key, array in self.arrays.items()
+            }
+        )
+
+
 class EncoderInterface:
     """
     An interface for encoding the code of the dataset.
@@ -241,24 +296,141 @@ def split_train_val(
     return Fold(train_set=train_dataset, val_set=val_dataset)
 
 
+@dataclass
+class PackedBert:
+    """
+    The bert id fields of a batch packed into a single contiguous tensor of shape
+    (fields, batch_size, token_length). The batch is moved to the device with one copy
+    and split into views of the fields afterwards.
+    """
+
+    ids: torch.Tensor
+    fields: tuple[str, ...]
+
+    def pin_memory(self) -> "PackedBert":
+        """
+        Copies the packed ids into pinned memory. Called by the data loader.
+        :return: The pinned packed bert.
+        """
+        return PackedBert(self.ids.pin_memory(), self.fields)
+
+    def to(self, device: torch.device, non_blocking: bool = False) -> "PackedBert":
+        """
+        Sends the packed ids to the device.
+        :param device: The device.
+        :param non_blocking: Whether the copy is asynchronous (needs pinned memory).
+        :return: The packed bert on the device.
+        """
+        return PackedBert(self.ids.to(device, non_blocking=non_blocking), self.fields)
+
+    def unpack(self) -> dict[str, torch.Tensor]:
+        """
+        Splits the packed ids into views of the single fields.
+        :return: The bert encoding as dictionary.
+        """
+        return {field: self.ids[i] for i, field in enumerate(self.fields)}
+
+
+def collate_readability_batch(
+    samples: list[dict[str, torch.Tensor | dict[str, torch.Tensor]]]
+) -> dict[str, torch.Tensor | PackedBert | list]:
+    """
+    Collates the samples of a readability dataset to a batch. All bert id fields are
+    stacked into one PackedBert tensor instead of one tensor per field. Inside a
+    data loader worker, the tensor is allocated in shared memory so that it is passed
+    to the main process without another copy.
+    :param samples: The samples of the batch.
+    :return: The batch.
+    """
+    if "bert" not in samples[0]:
+        return default_collate(samples)
+
+    batch = default_collate(
+        [{key: value for key, value in s.items() if key != "bert"} for s in samples]
+    )
+
+    # Pack the bert id fields into one preallocated tensor
+    first = samples[0]["bert"]
+    fields = tuple(field for field in BERT_ID_FIELDS if field in first)
+    ids = torch.empty(
+        (len(fields), len(samples), *first[fields[0]].shape),
+        dtype=first[fields[0]].dtype,
+    )
+    if get_worker_info() is not None:
+        ids.share_memory_()
+    for i, field in enumerate(fields):
+        torch.stack([sample["bert"][field] for sample in samples], out=ids[i])
+
+    batch["bert"] = PackedBert(ids, fields)
+    return batch
+
+
 def dataset_to_dataloader(
-    dataset: ReadabilityDataset, batch_size: int = DEFAULT_MODEL_BATCH_SIZE
+    dataset: ReadabilityDataset,
+    batch_size: int = DEFAULT_MODEL_BATCH_SIZE,
+    shuffle: bool = True,
+    num_workers: int = DEFAULT_NUM_WORKERS,
+    prefetch_factor: int = DEFAULT_PREFETCH_FACTOR,
+    pin_memory: bool | None = None,
+    persistent_workers: bool = True,
 ) -> DataLoader:
     """
     Converts a readability dataset to a data loader.
     :param dataset: The dataset.
     :param batch_size: The batch size.
+    :param shuffle: Whether to shuffle the dataset. Disable for evaluation loaders.
+    :param num_workers: The number of worker processes loading the batches. If 0, the
+        batches are loaded in the main process.
+    :param prefetch_factor: The number of batches loaded in advance by each worker.
+        Ignored if num_workers is 0.
+    :param pin_memory: Whether to copy the batches into pinned memory. If None, memory
+        is pinned whenever cuda is available.
+    :param persistent_workers: Whether to keep the workers alive between epochs.
+        Ignored if num_workers is 0.
     :return: The data loader.
     """
+    if pin_memory is None:
+        pin_memory = torch.cuda.is_available()
+
+    # Worker specific options are only allowed if workers are used
+    worker_options = {}
+    if num_workers > 0:
+        worker_options["prefetch_factor"] = prefetch_factor
+        worker_options["persistent_workers"] = persistent_workers
+
     # Create data loaders for training, validation, and test sets
-    loader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
+    loader = DataLoader(
+        dataset,
+        batch_size=batch_size,
+        shuffle=shuffle,
+        num_workers=num_workers,
+        pin_memory=pin_memory,
+        collate_fn=collate_readability_batch,
+        **worker_options,
+    )
 
     # Log the number of samples in the training, validation, and test data
-    logging.info(f"Training data: {len(dataset)} samples")
+    logging.info(
+        f"Data loader: {len(dataset)} samples, {num_workers} workers, "
+        f"shuffle={shuffle}, pin_memory={pin_memory}"
+    )
 
     return loader
 
 
+def k_fold_indices(
+    num_samples: int, k_fold: int
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Splits the indices of a dataset into k folds.
+    :param num_samples: The number of samples of the dataset.
+    :param k_fold: The number of folds.
+    :return: The training and validation indices of each fold.
+    """
+    kf = KFold(n_splits=k_fold, shuffle=True, random_state=42)
+    return list(kf.split(np.arange(num_samples)))
+
+
 def split_k_fold(dataset: ReadabilityDataset, k_fold: int = 0) -> list[Fold]:
     """
     Splits the training data into k folds.
@@ -269,12 +441,9 @@ def split_k_fold(dataset: ReadabilityDataset, k_fold: int = 0) -> list[Fold]:
     if k_fold == 0:
         return [split_train_val(dataset)]
 
-    # Split data into k folds
-    kf = KFold(n_splits=k_fold, shuffle=True, random_state=42)
-
     # Convert the split data to ReadabilityDataset
     folds = []
-    for train_index, val_index in kf.split(dataset):
+    for train_index, val_index in k_fold_indices(len(dataset), k_fold):
         train_dataset = ReadabilityDataset([dataset[i] for i in train_index])
         val_dataset = ReadabilityDataset([dataset[i] for i in val_index])
         folds.append(Fold(train_set=train_dataset, val_set=val_dataset))
@@ -2,6 +2,7 @@ import concurrent.futures
 import logging
 import os
 import re
+from functools import lru_cache
 from tempfile import TemporaryDirectory
 
 import cv2
@@ -105,6 +106,16 @@ def _convert_hex_to_rgba(hex_colors: set[str]) -> set[tuple[int, int, int, int]]
     }
 
 
+@lru_cache
+def _load_allowed_colors(css: str) -> frozenset[tuple[int, int, int, int]]:
+    """
+    Load the colors of the css file as rgba once per css file.
+    :param css: path to the css file
+    :return: set of rgba colors
+    """
+    return frozenset(_convert_hex_to_rgba(_load_colors_from_css(css)))
+
+
 def _remove_blur(
     img: Image, width: int, height: int, allowed_colors: set[tuple[int, int, int, int]]
 ) -> Image:
@@ -162,31 +173,14 @@ def _change_padding(img: Image, new_padding: int = 6) -> Image:
     return Image.fromarray(img_array[top : bottom + 1, left : right + 1])
 
 
-def _code_to_image(
-    code: str,
-    output: str = DEFAULT_OUT,
-    css: str = DEFAULT_CSS,
-    width: int = 128,
-    height: int = 128,
-    change_padding: bool = False,
-):
+def _imgkit_options(width: int, height: int) -> dict[str, str]:
     """
-    Convert the given Java code to a visualisation/image.
-    :param code: The code
-    :param output: The path to save the image
-    :param css: The css to use for styling the code
+    Returns the options of imgkit (wkhtmltoimage) for rendering the code.
     :param width: The width of the image
     :param height: The height of the image
-    :param change_padding: Whether to change the padding of the image
-    :return: The image
+    :return: The options
     """
-    # Convert the code to html
-    lexer = JavaLexer()
-    formatter = HtmlFormatter()
-    html = highlight(code, lexer, formatter)
-
-    # Set the options for imgkit
-    options = {
+    return {
         "format": "png",
         "quality": "100",
         "crop-h": str(height),
@@ -200,15 +194,74 @@ def _code_to_image(
         "height": str(height),
     }
 
-    # Convert the html code to image
-    imgkit.from_string(html, output, css=css, options=options)
 
+def _code_to_html(code: str) -> str:
+    """
+    Convert the given Java code to highlighted html.
+    :param code: The code
+    :return: The html
+    """
+    lexer = JavaLexer()
+    formatter = HtmlFormatter()
+    return highlight(code, lexer, formatter)
+
+
+@lru_cache
+def _load_css(css: str) -> str:
+    """
+    Load the css file once.
+    :param css: path to the css file
+    :return: the css code
+    """
+    with open(css, encoding="utf-8") as f:
+        return f.read()
+
+
+def code_to_styled_html(code: str, css: str = DEFAULT_CSS) -> str:
+    """
+    Convert the given Java code to highlighted html with the css inlined, as imgkit
+    does it for the css option.
+    :param code: The code
+    :param css: The css to use for styling the code
+    :return: The html
+    """
+    return f"<style>{_load_css(css)}</style>{_code_to_html(code)}"
+
+
+def render_command(output: str, width: int = 128, height: int = 128) -> list[str]:
+    """
+    Returns the wkhtmltoimage command rendering the html read from stdin, e.g. to run
+    it as asynchronous subprocess.
+    :param output: The path to save the image
+    :param width: The width of the image
+    :param height: The height of the image
+    :return: The command
+    """
+    kit = imgkit.IMGKit("", "string", options=_imgkit_options(width, height))
+    return [str(arg) for arg in kit.command(output)]
+
+
+def postprocess_image(
+    output: str,
+    css: str = DEFAULT_CSS,
+    width: int = 128,
+    height: int = 128,
+    change_padding: bool = False,
+) -> None:
+    """
+    Remove the blur from a rendered image (in place).
+    :param output: The path of the image
+    :param css: The css the code was styled with
+    :param width: The width of the image
+    :param height: The height of the image
+    :param change_padding: Whether to change the padding of the image
+    :return: None
+    """
     # Open the image
     img = Image.open(output)
 
     # Remove the blur from the image
-    allowed_colors = _load_colors_from_css(css)
-    allowed_colors = _convert_hex_to_rgba(allowed_colors)
+    allowed_colors = _load_allowed_colors(css)
     img = _remove_blur(img, width, height, allowed_colors)
 
     if change_padding:
@@ -218,6 +271,35 @@ def _code_to_image(
     img.save(output)
 
 
+def _code_to_image(
+    code: str,
+    output: str = DEFAULT_OUT,
+    css: str = DEFAULT_CSS,
+    width: int = 128,
+    height: int = 128,
+    change_padding: bool = False,
+):
+    """
+    Convert the given Java code to a visualisation/image.
+    :param code: The code
+    :param output: The path to save the image
+    :param css: The css to use for styling the code
+    :param width: The width of the image
+    :param height: The height of the image
+    :param change_padding: Whether to change the padding of the image
+    :return: The image
+    """
+    # Convert the code to html
+    html = _code_to_html(code)
+
+    # Convert the html code to image
+    options = _imgkit_options(width, height)
+    imgkit.from_string(html, output, css=css, options=options)
+
+    # Remove the blur from the image
+    postprocess_image(output, css, width, height, change_padding)
+
+
 def code_to_image_tensor(
     text: str,
     out_dir: str = None,
@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+from src.readability_classifier.evaluation.metrics import (
+    DEFAULT_BOOTSTRAP_SEED,
+    DEFAULT_THRESHOLD,
+    METRICS,
+    ConfusionMatrix,
+    bootstrap_intervals,
+)
+from src.readability_classifier.utils.defaults import (
+    DEFAULT_BOOTSTRAP_SAMPLES,
+    DEFAULT_CONFIDENCE,
+)
+
+STATS_FILE_NAME = "stats.json"  # Stats of all evaluated snippets
+REPORT_FILE_NAME = "evaluation.json"  # Stats of the parts, aggregated stats and CIs
+
+
+@dataclass(frozen=True)
+class PartResult:
+    """
+    Data class for the evaluation of a part of the dataset.
+    """
+
+    part: int
+    counts: ConfusionMatrix
+    stats: dict[str, float]
+    y_true: np.ndarray = field(repr=False)
+    y_pred: np.ndarray = field(repr=False)
+
+    def to_dict(self) -> dict:
+        """
+        Convert to dict without the labels.
+        :return: The part result as dict.
+        """
+        return {
+            "part": self.part,
+            "samples": len(self.y_true),
+            "counts": self.counts.to_dict(),
+            "stats": self.stats,
+        }
+
+
+@dataclass(frozen=True)
+class EvaluationReport:
+    """
+    Data class for the evaluation of all parts. The pooled stats are computed over
+    the snippets of all parts, the confidence intervals by bootstrapping them.
+    """
+
+    parts: list[PartResult]
+    pooled: dict[str, float]
+    mean: dict[str, float]  # Mean and standard deviation over the parts
+    std: dict[str, float]
+    intervals: dict[str, tuple[float, float]]  # Empty if not bootstrapped
+    bootstrap_samples: int
+    confidence: float
+
+    def to_dict(self) -> dict:
+        """
+        Convert to dict.
+        :return: The report as dict.
+        """
+        return {
+            "parts": [part.to_dict() for part in self.parts],
+            "pooled": self.pooled,
+            "mean": self.mean,
+            "std": self.std,
+            "confidence_intervals": {
+                metric: list(bounds) for metric, bounds in self.intervals.items()
+            },
+            "bootstrap_samples": self.bootstrap_samples,
+            "confidence": self.confidence,
+        }
+
+    def store(self, store_dir: Path) -> None:
+        """
+        Stores the pooled stats and the whole report as json.
+        :param store_dir: The directory to store the files in.
+        :return: None
+        """
+        os.makedirs(store_dir, exist_ok=True)
+        with open(Path(store_dir) / STATS_FILE_NAME, "w") as file:
+            json.dump(self.pooled, file, indent=4)
+        with open(Path(store_dir) / REPORT_FILE_NAME, "w") as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+
+class MultiPartEvaluator:
+    """
+    Evaluates the parts of an encoded dataset with a model that is loaded once. The
+    parts are scored one after another or concurrently by threads sharing the model
+    and the encoded dataset. The stats of each part, their mean and standard
+    deviation as well as the stats of all parts together with bootstrap confidence
+    intervals are reported.
+    """
+
+    def __init__(
+        self,
+        score: Callable[[ReadabilityDataset], Sequence[float]],
+        workers: int = 1,
+        bootstrap_samples: int = DEFAULT_BOOTSTRAP_SAMPLES,
+        confidence: float = DEFAULT_CONFIDENCE,
+        seed: int = DEFAULT_BOOTSTRAP_SEED,
+    ):
+        """
+        Initializes the evaluator.
+        :param score: Scores encoded snippets, e.g. from a model runner.
+        :param workers: The number of parts scored concurrently.
+        :param bootstrap_samples: The number of bootstrap resamples. If 0, no
+            confidence intervals are computed.
+        :param confidence: The confidence level of the intervals.
+        :param seed: The seed of the bootstrap resampling.
+        """
+        self.score = score
+        self.workers = max(1, workers)
+        self.bootstrap_samples = bootstrap_samples
+        self.confidence = confidence
+        self.seed = seed
+
+    def evaluate(self, parts: Sequence[ReadabilityDataset]) -> EvaluationReport:
+        """
+        Evaluates the parts.
+        :param parts: The encoded parts with their scores.
+        :return: The evaluation report.
+        """
+        if not parts:
+            raise ValueError("No parts to evaluate.")
+
+        if self.workers == 1 or len(parts) == 1:
+            results = [self._evaluate_part(idx, part) for idx, part in enumerate(parts)]
+        else:
+            with ThreadPoolExecutor(min(self.workers, len(parts))) as executor:
+                results = list(
+                    executor.map(self._evaluate_part, range(len(parts)), parts)
+                )
+
+        y_true = np.concatenate([result.y_true for result in results])
+        y_pred = np.concatenate([result.y_pred for result in results])
+        pooled = ConfusionMatrix.from_labels(y_true, y_pred).to_stats()
+        intervals = {}
+        if self.bootstrap_samples > 0:
+            intervals = bootstrap_intervals(
+                y_true, y_pred, self.bootstrap_samples, self.confidence, self.seed
+            )
+
+        report = EvaluationReport(
+            parts=results,
+            pooled=pooled,
+            mean={
+                metric: float(np.mean([part.stats[metric] for part in results]))
+                for metric in METRICS
+            },
+            std={
+                metric: float(np.std([part.stats[metric] for part in results]))
+                for metric in METRICS
+            },
+            intervals=intervals,
+            bootstrap_samples=self.bootstrap_samples,
+            confidence=self.confidence,
+        )
+        self._log_report(report)
+        return report
+
+    def _evaluate_part(self, idx: int, part: ReadabilityDataset) -> PartResult:
+        """
+        Scores a part and computes its stats.
+        :param idx: The index of the part.
+        :param part: The encoded part with the scores.
+        :return: The result of the part.
+        """
+        logging.info(f"Evaluating part {idx + 1} ({len(part)} snippets)...")
+        scores = np.asarray(self.score(part), dtype=np.float32).reshape(-1)
+        y_true = np.asarray(
+            [float(sample["score"]) > DEFAULT_THRESHOLD for sample in part]
+        )
+        y_pred = scores > DEFAULT_THRESHOLD
+        counts = ConfusionMatrix.from_labels(y_true, y_pred)
+        result = PartResult(idx, counts, counts.to_stats(), y_true, y_pred)
+        logging.info(f"Part {idx + 1}: {_format_stats(result.stats)}")
+        return result
+
+    @staticmethod
+    def _log_report(report: EvaluationReport) -> None:
+        """
+        Logs the aggregated stats of a report.
+        :param report: The report.
+        :return: None
+        """
+        logging.info(f"All parts: {_format_stats(report.pooled)}")
+        for metric in METRICS:
+            message = (
+                f"{metric}: {report.pooled[metric]:.4f} "
+                f"(mean over parts {report.mean[metric]:.4f} "
+                f"+- {report.std[metric]:.4f})"
+            )
+            if metric in report.intervals:
+                lower, upper = report.intervals[metric]
+                message += f", {report.confidence:.0%} CI [{lower:.4f}, {upper:.4f}]"
+            logging.info(message)
+
+
+def _format_stats(stats: dict[str, float]) -> str:
+    """
+    Formats stats for logging.
+    :param stats: The metrics by name.
+    :return: The formatted stats.
+    """
+    return ", ".join(f"{metric} {value:.4f}" for metric, value in stats.items())
@@ -0,0 +1,138 @@
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from src.readability_classifier.utils.defaults import (
+    DEFAULT_BOOTSTRAP_SAMPLES,
+    DEFAULT_CONFIDENCE,
+)
+from src.readability_classifier.utils.utils import (
+    calculate_f1_score,
+    calculate_mcc,
+    calculate_precision,
+    calculate_recall,
+)
+
+METRICS = ("acc", "precision", "recall", "auc", "f1", "mcc")
+DEFAULT_THRESHOLD = 0.5  # Scores and labels above are readable
+DEFAULT_BOOTSTRAP_SEED = 42
+MAX_RESAMPLED_VALUES = 10_000_000  # Bounds the memory of a batch of resamples
+
+
+@dataclass
+class ConfusionMatrix:
+    """
+    Data class for a binary confusion matrix, which can be updated batch by batch.
+    """
+
+    tp: int = 0
+    tn: int = 0
+    fp: int = 0
+    fn: int = 0
+
+    @classmethod
+    def from_labels(cls, y_true: np.ndarray, y_pred: np.ndarray) -> "ConfusionMatrix":
+        """
+        Counts the binary labels.
+        :param y_true: The true labels (True = readable).
+        :param y_pred: The predicted labels (True = readable).
+        :return: The confusion matrix.
+        """
+        confusion_matrix = cls()
+        confusion_matrix.update(y_true, y_pred)
+        return confusion_matrix
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        """
+        Adds the binary labels of a batch to the confusion matrix.
+        :param y_true: The true labels (True = readable).
+        :param y_pred: The predicted labels (True = readable).
+        :return: None
+        """
+        y_true = np.asarray(y_true, dtype=bool)
+        y_pred = np.asarray(y_pred, dtype=bool)
+        self.tp += int(np.count_nonzero(y_true & y_pred))
+        self.tn += int(np.count_nonzero(~y_true & ~y_pred))
+        self.fp += int(np.count_nonzero(~y_true & y_pred))
+        self.fn += int(np.count_nonzero(y_true & ~y_pred))
+
+    def to_stats(self) -> dict[str, float]:
+        """
+        Calculates the evaluation metrics. The auc is the area under the roc curve of
+        the binary predictions, i.e. the mean of the true positive and true negative
+        rate.
+        :return: The metrics by name (see METRICS).
+        """
+        total = self.tp + self.tn + self.fp + self.fn
+        precision = calculate_precision(tp=self.tp, fp=self.fp)
+        recall = calculate_recall(tp=self.tp, fn=self.fn)
+        specificity = self.tn / (self.tn + self.fp) if self.tn + self.fp > 0 else 0
+        return {
+            "acc": (self.tp + self.tn) / total if total > 0 else 0,
+            "precision": precision,
+            "recall": recall,
+            "auc": (recall + specificity) / 2,
+            "f1": calculate_f1_score(precision=precision, recall=recall),
+            "mcc": calculate_mcc(tp=self.tp, tn=self.tn, fp=self.fp, fn=self.fn),
+        }
+
+    def to_dict(self) -> dict[str, int]:
+        """
+        Convert to dict.
+        :return: The counts by name.
+        """
+        return asdict(self)
+
+
+def bootstrap_intervals(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    samples: int = DEFAULT_BOOTSTRAP_SAMPLES,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int = DEFAULT_BOOTSTRAP_SEED,
+) -> dict[str, tuple[float, float]]:
+    """
+    Computes percentile bootstrap confidence intervals of the metrics. The snippets
+    are resampled with replacement, the confusion counts of a batch of resamples are
+    computed at once.
+    :param y_true: The true labels (True = readable).
+    :param y_pred: The predicted labels (True = readable).
+    :param samples: The number of bootstrap resamples.
+    :param confidence: The confidence level, e.g. 0.95.
+    :param seed: The seed of the resampling.
+    :return: The lower and upper bound by metric name.
+    """
+    y_true = np.asarray(y_true, dtype=bool)
+    y_pred = np.asarray(y_pred, dtype=bool)
+    if len(y_true) == 0:
+        raise ValueError("Cannot bootstrap an empty evaluation.")
+
+    rng = np.random.default_rng(seed)
+    batch_size = max(1, MAX_RESAMPLED_VALUES // len(y_true))
+    values = {metric: [] for metric in METRICS}
+    for start in range(0, samples, batch_size):
+        indices = rng.integers(
+            0, len(y_true), size=(min(batch_size, samples - start), len(y_true))
+        )
+        truth = y_true[indices]
+        pred = y_pred[indices]
+        counts = zip(
+            np.count_nonzero(truth & pred, axis=1),
+            np.count_nonzero(~truth & ~pred, axis=1),
+            np.count_nonzero(~truth & pred, axis=1),
+            np.count_nonzero(truth & ~pred, axis=1),
+            strict=True,
+        )
+        for tp, tn, fp, fn in counts:
+            stats = ConfusionMatrix(int(tp), int(tn), int(fp), int(fn)).to_stats()
+            for metric in METRICS:
+                values[metric].append(stats[metric])
+
+    alpha = (1 - confidence) / 2 * 100
+    return {
+        metric: (
+            float(np.percentile(values[metric], alpha)),
+            float(np.percentile(values[metric], 100 - alpha)),
+        )
+        for metric in METRICS
+    }
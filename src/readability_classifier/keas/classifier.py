@@ -1,23 +1,31 @@
 import logging
 import random
 from pathlib import Path
+from tempfile import TemporaryDirectory
 
 import keras
 import numpy as np
-from keras.src.callbacks import ModelCheckpoint
+from keras.src.callbacks import EarlyStopping, ModelCheckpoint
 from keras.src.saving import custom_object_scope
 
 from src.readability_classifier.encoders.dataset_utils import (
     Fold,
     ReadabilityDataset,
+    k_fold_indices,
     split_k_fold,
 )
 from src.readability_classifier.keas.history_processing import HistoryList
 from src.readability_classifier.keas.model import BertEmbedding
+from src.readability_classifier.utils.fold_scheduler import (
+    FoldScheduler,
+    load_memmap_dataset,
+    save_memmap_dataset,
+)
 
 # Define parameters
 STATS_FILE_NAME = "stats.json"
 DEFAULT_STORE_DIR = "output"
+DEFAULT_BATCH_SIZE = 42
 
 
 def convert_to_towards_inputs(encoded_data: ReadabilityDataset) -> list[dict]:
@@ -61,6 +69,40 @@ def convert_to_towards_inputs_without_score(
     ]
 
 
+def _train_fold(
+    model_path: Path,
+    data_dir: Path,
+    train_index: np.ndarray,
+    val_index: np.ndarray,
+    fold_index: int,
+    parameters: dict,
+) -> tuple[dict, int]:
+    """
+    Trains a fold in a worker process of the fold scheduler.
+    :param model_path: The path of the initial (compiled) model.
+    :param data_dir: The directory of the memory mapped towards inputs.
+    :param train_index: The indices of the training samples of the fold.
+    :param val_index: The indices of the validation samples of the fold.
+    :param fold_index: The fold index.
+    :param parameters: The keyword arguments to create the classifier with.
+    :return: The history dict of the fold and its validation frequency.
+    """
+    arrays = load_memmap_dataset(data_dir)
+
+    def to_dataset(indices: np.ndarray) -> ReadabilityDataset:
+        return ReadabilityDataset(
+            [{key: array[i] for key, array in arrays.items()} for i in indices]
+        )
+
+    model = keras.models.load_model(
+        model_path, custom_objects={"BertEmbedding": BertEmbedding}
+    )
+    classifier = Classifier(model=model, **parameters)
+    fold = Fold(train_set=to_dataset(train_index), val_set=to_dataset(val_index))
+    history = classifier.train_fold(fold, fold_index)
+    return history.history, history.validation_freq
+
+
 class Classifier:
     """
     A source code readability classifier.
@@ -73,8 +115,12 @@ class Classifier:
         k_fold: int = 10,
         epochs: int = 20,
         model_path: Path = None,
-        batch_size: int = 42,
+        batch_size: int = DEFAULT_BATCH_SIZE,
         store_dir: str = DEFAULT_STORE_DIR,
+        patience: int | None = None,
+        min_delta: float = 0.0,
+        validate_every: int = 1,
+        fold_workers: int = 1,
     ):
         """
         Initializes the classifier.
@@ -84,6 +130,14 @@ class Classifier:
         :param epochs: The number of epochs.
         :param batch_size: The batch size.
         :param store_dir: The store directory.
+        :param patience: The number of validations without improvement of the
+            validation loss after which the training of a fold is stopped early. If
+            None, all epochs are trained.
+        :param min_delta: The minimum decrease of the validation loss that counts as
+            an improvement.
+        :param validate_every: Validate the model every n epochs.
+        :param fold_workers: The number of processes training folds in parallel. If 1,
+            the folds are trained one after another in this process.
         """
         self.model = model
         self.initial_weights = model.get_weights()
@@ -93,6 +147,10 @@ class Classifier:
         self.model_path = model_path
         self.batch_size = batch_size
         self.store_dir = store_dir
+        self.patience = patience
+        self.min_delta = min_delta
+        self.validate_every = max(1, validate_every)
+        self.fold_workers = fold_workers
 
     def train(self) -> HistoryList:
         """
@@ -123,6 +181,10 @@ class Classifier:
         )
 
         history = HistoryList([])
+        if self.fold_workers > 1 and self.k_fold > 0:
+            history.fold_histories = self._train_folds_parallel(towards_inputs)
+            return history
+
         folds = split_k_fold(ReadabilityDataset(towards_inputs), k_fold=self.k_fold)
         for fold_index, fold in enumerate(folds):
             logging.info(f"Starting fold {fold_index + 1}/{self.k_fold}")
@@ -131,6 +193,49 @@ class Classifier:
 
         return history
 
+    def _train_folds_parallel(
+        self, towards_inputs: list[dict]
+    ) -> list[keras.callbacks.History]:
+        """
+        Trains the folds in parallel worker processes. The towards inputs are shared
+        with the workers via memory mapped files and every worker starts from the
+        stored initial model.
+        :param towards_inputs: The towards inputs.
+        :return: The history of each fold.
+        """
+        parameters = {
+            "k_fold": self.k_fold,
+            "epochs": self.epochs,
+            "batch_size": self.batch_size,
+            "store_dir": self.store_dir,
+            "patience": self.patience,
+            "min_delta": self.min_delta,
+            "validate_every": self.validate_every,
+        }
+
+        with TemporaryDirectory() as tmp_dir:
+            data_dir = Path(tmp_dir) / "data"
+            save_memmap_dataset(towards_inputs, data_dir)
+
+            model_path = Path(tmp_dir) / "initial_model.keras"
+            self.model.set_weights(self.initial_weights)
+            self.model.save(model_path)
+
+            folds = k_fold_indices(len(towards_inputs), self.k_fold)
+            fold_args = [
+                (model_path, data_dir, train_index, val_index, idx + 1, parameters)
+                for idx, (train_index, val_index) in enumerate(folds)
+            ]
+            results = FoldScheduler(self.fold_workers).run(_train_fold, fold_args)
+
+        fold_histories = []
+        for history_dict, validation_freq in results:
+            fold_history = keras.callbacks.History()
+            fold_history.history = history_dict
+            fold_history.validation_freq = validation_freq
+            fold_histories.append(fold_history)
+        return fold_histories
+
     def train_fold(self, fold: Fold, fold_index: int = -1) -> keras.callbacks.History:
         """
         Train the model for a fold.
@@ -148,9 +253,19 @@ class Classifier:
             store_path, monitor="val_acc", verbose=1, save_best_only=True, mode="max"
         )
         callbacks = [checkpoint]
+        if self.patience is not None:
+            callbacks.append(
+                EarlyStopping(
+                    monitor="val_loss",
+                    patience=self.patience,
+                    min_delta=self.min_delta,
+                    mode="min",
+                    verbose=1,
+                )
+            )
 
         # Train the model
-        return model.fit(
+        history = model.fit(
             x=self._dataset_to_input(fold.train_set),
             y=self._dataset_to_label(fold.train_set),
             epochs=self.epochs,
@@ -161,8 +276,13 @@ class Classifier:
                 self._dataset_to_input(fold.val_set),
                 self._dataset_to_label(fold.val_set),
             ),
+            validation_freq=self.validate_every,
         )
 
+        # Needed to match the training and validation metrics of the history
+        history.validation_freq = self.validate_every
+        return history
+
     def predict(self):
         """
         Predict readability of snippets
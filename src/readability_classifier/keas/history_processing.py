@@ -299,6 +299,12 @@ class HistoryProcessor:
         history_dict = fold_history.history
         train_loss = [float(x) for x in get_from_dict(history_dict, "loss")]
         train_acc = [float(x) for x in get_from_dict(history_dict, "acc")]
+
+        # Validation metrics are only recorded every validation_freq epochs
+        validation_freq = getattr(fold_history, "validation_freq", 1)
+        train_loss = train_loss[validation_freq - 1 :: validation_freq]
+        train_acc = train_acc[validation_freq - 1 :: validation_freq]
+
         val_loss = [float(x) for x in get_from_dict(history_dict, "val_loss")]
         val_acc = [float(x) for x in get_from_dict(history_dict, "val_acc")]
         val_false_negatives = [
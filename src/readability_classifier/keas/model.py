@@ -190,9 +190,14 @@ def create_visual_model(learning_rate: float = DEFAULT_LEARNING_RATE) -> keras.M
     return model
 
 
-def create_towards_model(learning_rate: float = DEFAULT_LEARNING_RATE) -> keras.Model:
+def create_towards_model(
+    learning_rate: float = DEFAULT_LEARNING_RATE, accumulation_steps: int = 1
+) -> keras.Model:
     """
     Create the VST model.
+    :param learning_rate: The learning rate of the model.
+    :param accumulation_steps: The number of batches whose gradients are accumulated
+        before each optimizer step.
     :return: The model.
     """
     structure_input, structure_flatten = create_structural_extractor()
@@ -208,7 +213,13 @@ def create_towards_model(learning_rate: float = DEFAULT_LEARNING_RATE) -> keras.
         classification_output,
     )
 
-    rms = optimizers.RMSprop(learning_rate=learning_rate)
+    # Keras only accepts gradient accumulation for two or more steps
+    rms = optimizers.RMSprop(
+        learning_rate=learning_rate,
+        gradient_accumulation_steps=(
+            accumulation_steps if accumulation_steps > 1 else None
+        ),
+    )
 
     model.compile(
         optimizer=rms,
@@ -272,6 +283,11 @@ class BertEmbedding(keras.layers.Layer):
         )
         self.dropout = keras.layers.Dropout(config.hidden_dropout_rate)
 
+        # Position ids of the longest supported sequence, sliced per call
+        self.position_ids = tf.range(config.max_position_embeddings, dtype=tf.int32)[
+            tf.newaxis, :
+        ]
+
     def build(self, input_shape):
         """
         Build the layer.
@@ -289,7 +305,7 @@ class BertEmbedding(keras.layers.Layer):
         # used for sentence classification
         input_ids, token_type_ids = inputs
         input_ids = tf.cast(input_ids, dtype=tf.int32)
-        position_ids = tf.range(input_ids.shape[1], dtype=tf.int32)[tf.newaxis, :]
+        position_ids = self.position_ids[:, : tf.shape(input_ids)[1]]
         if token_type_ids is None:
             token_type_ids = tf.fill(input_ids.shape.as_list(), 0)
 
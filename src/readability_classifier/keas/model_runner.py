@@ -1,18 +1,27 @@
 import json
 import logging
-import os
 import pickle
+from collections.abc import Callable, Sequence
 from dataclasses import asdict
 from pathlib import Path
 
 import keras.models
+import numpy as np
 
-from src.readability_classifier.encoders.dataset_encoder import decode_score
 from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
-from src.readability_classifier.keas.classifier import Classifier
+from src.readability_classifier.keas.classifier import (
+    DEFAULT_BATCH_SIZE,
+    Classifier,
+    convert_to_towards_inputs_without_score,
+)
 from src.readability_classifier.keas.history_processing import HistoryProcessor
 from src.readability_classifier.keas.model import BertEmbedding, create_towards_model
-from src.readability_classifier.toch.model_runner import ModelRunnerInterface
+from src.readability_classifier.keas.onnx_export import export_towards_to_onnx
+from src.readability_classifier.model_runner import (
+    ModelRunnerInterface,
+    aggregate_predictions,
+)
+from src.readability_classifier.toch.options import ExportMethod
 
 STATS_FILE_NAME = "stats.json"
 
@@ -50,9 +59,19 @@ class KerasModelRunner(ModelRunnerInterface):
         learning_rate = parsed_args.learning_rate
         fine_tune = parsed_args.fine_tune
         layer_names_to_freeze = parsed_args.freeze
+        accumulation_steps = getattr(parsed_args, "accumulation_steps", 1)
+        patience = getattr(parsed_args, "patience", None)
+        min_delta = getattr(parsed_args, "min_delta", 0.0)
+        validate_every = getattr(parsed_args, "validate_every", 1)
+        fold_workers = getattr(parsed_args, "fold_workers", 1)
+
+        if getattr(parsed_args, "mixed_precision", False):
+            logging.warning("Mixed precision is only supported by the torch models.")
 
         # Build the model
-        towards_model = create_towards_model(learning_rate=learning_rate)
+        towards_model = create_towards_model(
+            learning_rate=learning_rate, accumulation_steps=accumulation_steps
+        )
 
         # Load the pretrained model if available
         if fine_tune is not None:
@@ -77,6 +96,10 @@ class KerasModelRunner(ModelRunnerInterface):
             batch_size=batch_size,
             k_fold=num_folds,
             epochs=epochs,
+            patience=patience,
+            min_delta=min_delta,
+            validate_every=validate_every,
+            fold_workers=fold_workers,
         )
 
         # Train the model
@@ -104,6 +127,7 @@ class KerasModelRunner(ModelRunnerInterface):
         :return: The prediction as binary and as float (1 = readable, 0 = not readable).
         """
         model_path = parsed_args.model
+        batch_size = getattr(parsed_args, "batch_size", None)
 
         # TODO: Now requires which model to use -> Add parameter for "PREDICT" and resolve it here
         # Load the model
@@ -114,74 +138,53 @@ class KerasModelRunner(ModelRunnerInterface):
             model=model,
             model_path=model_path,
             encoded_data=encoded_dataset,
-            # TODO: Add an optional batch_size parameter for "PREDICT" and resolve it here
-            #batch_size=batch_size,
+            batch_size=batch_size or DEFAULT_BATCH_SIZE,
         )
 
         # Predict the snippets
         predictions = classifier.predict()
 
-        score_sums: dict[str, float] = {}
-        score_counts: dict[str, int] = {}
-        for i in range(len(predictions)):
-            filename = encoded_dataset[i]['name']
-            prediction = predictions[i].item()
-            directory = os.path.dirname(filename)
-            # Sum and count scores for each directory
-            if score_sums.get(directory) is None:
-                score_sums[directory] = 0.0
-                score_counts[directory] = 0
-            score_sums[directory] += prediction
-            score_counts[directory] += 1
-            prediction = decode_score(prediction)
-            logging.info(f"Readability of file {filename}: {prediction}")
-
-        overall_score_sum = 0
-        for directory, score_sum in score_sums.items():
-            overall_score_sum += score_sum
-            avg = score_sum / score_counts[directory]
-            prediction = decode_score(avg)
-            logging.info(f"Readability of directory {directory}: {prediction}")
-        # Overall average for return value
-        avg = overall_score_sum / len(encoded_dataset)
-        prediction = decode_score(avg)
-        logging.info(f"Readability of whole input: {prediction}")
-        return prediction
-
-    def run_evaluate(self, parsed_args, encoded_data: ReadabilityDataset):
+        return aggregate_predictions(encoded_dataset, predictions)
+
+    def run_export(self, parsed_args):
         """
-        Runs the evaluation of the readability classifier.
+        Exports a trained readability classifier to ONNX.
         :param parsed_args: Parsed arguments.
-        :param encoded_data: The encoded dataset.
         :return: None
         """
         model_path = parsed_args.load
-        batch_size = parsed_args.batch_size
-        store_dir = parsed_args.save
+        output_path = parsed_args.output
+        method = parsed_args.method
+
+        if method != ExportMethod.ONNX:
+            raise ValueError(f"Keras models can not be exported with {method}.")
+        export_towards_to_onnx(model_path, output_path)
+
+    def _load_scorer(
+        self, parsed_args
+    ) -> Callable[[ReadabilityDataset], Sequence[float]]:
+        """
+        Loads the model to evaluate once.
+        :param parsed_args: Parsed arguments.
+        :return: The function scoring encoded snippets.
+        """
+        model_path = parsed_args.load
+        batch_size = getattr(parsed_args, "batch_size", None) or DEFAULT_BATCH_SIZE
 
         # Load the model
         model = keras.models.load_model(
             model_path, custom_objects={"BertEmbedding": BertEmbedding}
         )
 
-        # Create the classifier
-        classifier = Classifier(
-            model=model,
-            encoded_data=encoded_data,
-            batch_size=batch_size,
-        )
-
-        # Evaluate the model
-        metrics = classifier.evaluate()
-
-        # Store the history as pkl
-        store_path = Path(store_dir) / "metrics.pkl"
-        with open(store_path, "wb") as file:
-            pickle.dump(metrics, file)
-
-        processed_history = HistoryProcessor().evaluate_metrics(metrics)
+        def score(encoded_data: ReadabilityDataset) -> np.ndarray:
+            towards_inputs = ReadabilityDataset(
+                convert_to_towards_inputs_without_score(encoded_data)
+            )
+            predictions = model.predict(
+                x=Classifier._dataset_to_input(towards_inputs),
+                batch_size=batch_size,
+                verbose=0,
+            )
+            return predictions.reshape(-1)
 
-        # Store the stats
-        store_path = Path(store_dir) / STATS_FILE_NAME
-        with open(store_path, "w") as file:
-            json.dump(asdict(processed_history), file, indent=4)
+        return score
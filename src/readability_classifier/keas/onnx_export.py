@@ -0,0 +1,44 @@
+import logging
+from pathlib import Path
+
+import tensorflow as tf
+from keras.src.saving import custom_object_scope
+
+from src.readability_classifier.keas.model import BertEmbedding, create_towards_model
+from src.readability_classifier.utils.config import DEFAULT_ONNX_OPSET
+
+
+def export_towards_to_onnx(
+    weights_path: Path, output_path: Path, opset: int = DEFAULT_ONNX_OPSET
+) -> None:
+    """
+    Exports the trained keras towards model to ONNX with tf2onnx. The model is traced
+    as tf.function, so that the conversion does not depend on the keras version. The
+    ONNX inputs keep the names of the keras inputs and have a dynamic batch dimension.
+    :param weights_path: The path of the trained weights (.keras or .h5).
+    :param output_path: The path of the ONNX model.
+    :param opset: The ONNX opset version.
+    :return: None
+    """
+    import tf2onnx  # Optional dependency, only needed for the export
+
+    model = create_towards_model()
+    with custom_object_scope({"BertEmbedding": BertEmbedding}):
+        model.load_weights(weights_path)
+
+    input_signature = [
+        tf.TensorSpec((None, *model_input.shape[1:]), tf.float32, name=model_input.name)
+        for model_input in model.inputs
+    ]
+
+    @tf.function(input_signature=input_signature)
+    def serve(*inputs):
+        return {"score": model(list(inputs), training=False)}
+
+    tf2onnx.convert.from_function(
+        serve,
+        input_signature=input_signature,
+        opset=opset,
+        output_path=str(output_path),
+    )
+    logging.info(f"Model exported to ONNX at {output_path}")
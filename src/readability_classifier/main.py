@@ -1,26 +1,54 @@
+import asyncio
 import logging
 import os
 import random
 import sys
-from argparse import ArgumentParser
+from argparse import ArgumentParser, BooleanOptionalAction
+from collections.abc import Iterable
+from contextlib import ExitStack
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from src.readability_classifier.encoders.dataset_encoder import (
-    DatasetEncoder,
+from src.readability_classifier.scoring.aggregation import (
+    DEFAULT_THRESHOLD,
+    PathTree,
+    write_rollups,
 )
-from src.readability_classifier.encoders.dataset_utils import (
-    load_encoded_dataset,
-    load_raw_dataset,
-    store_encoded_dataset,
+from src.readability_classifier.scoring.extraction import DEFAULT_PARSE_WORKERS
+from src.readability_classifier.scoring.files import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PATTERNS,
+    find_source_files,
+    read_snippets,
 )
-from src.readability_classifier.keas.model_runner import KerasModelRunner
-from src.readability_classifier.toch.model_buider import Model
-from src.readability_classifier.toch.model_runner import (
-    ModelRunnerInterface,
-    TorchModelRunner,
+from src.readability_classifier.serving.async_server import serve_async
+from src.readability_classifier.serving.batcher import (
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_WAIT_MS,
+    MicroBatchScheduler,
 )
+from src.readability_classifier.serving.server import DEFAULT_HOST, DEFAULT_PORT, serve
+from src.readability_classifier.toch.options import (
+    DEFAULT_CALIBRATION_BATCHES,
+    ExportMethod,
+    Model,
+    QuantizationMode,
+)
+from src.readability_classifier.utils.defaults import (
+    DEFAULT_BOOTSTRAP_SAMPLES,
+    DEFAULT_CONFIDENCE,
+    DEFAULT_KEEP_CHECKPOINTS,
+    DEFAULT_NUM_WORKERS,
+    DEFAULT_PREFETCH_FACTOR,
+    DEFAULT_RENDER_CONCURRENCY,
+)
+from src.readability_classifier.utils.startup import ImportProfiler
+
+# The backends (keras, torch, onnx) and the encoders are imported by the tasks that
+# need them, as importing them takes longer than a short prediction
+if TYPE_CHECKING:
+    from src.readability_classifier.model_runner import ModelRunnerInterface
 
 DEFAULT_LOG_FILE_NAME = "readability-classifier"
 DEFAULT_LOG_FILE = f"{DEFAULT_LOG_FILE_NAME}.log"
@@ -89,6 +117,9 @@ class Tasks(Enum):
     TRAIN = "TRAIN"
     EVALUATE = "EVALUATE"
     PREDICT = "PREDICT"
+    EXPORT = "EXPORT"
+    QUANTIZE = "QUANTIZE"
+    SERVE = "SERVE"
 
     @classmethod
     def _missing_(cls, value: object) -> Any:
@@ -104,6 +135,14 @@ def _set_up_arg_parser() -> ArgumentParser:
     :return_:   Returns the parser for extracting the arguments.
     """
     arg_parser = ArgumentParser()
+    arg_parser.add_argument(
+        "--profile-startup",
+        required=False,
+        default=False,
+        action="store_true",
+        help="Whether to log the time spent importing modules (e.g. the backends) "
+        "and the slowest imports.",
+    )
     sub_parser = arg_parser.add_subparsers(dest="command", required=True)
 
     # Parser for the encoding task
@@ -186,13 +225,61 @@ def _set_up_arg_parser() -> ArgumentParser:
         default=10,
         help="The number of folds for k-fold cross-validation.",
     )
+    train_parser.add_argument(
+        "--fold-workers",
+        required=False,
+        type=int,
+        default=1,
+        help="The number of processes training folds in parallel. The cpu cores are "
+        "divided among them.",
+    )
     train_parser.add_argument(
         "--batch-size",
         "-b",
         required=False,
         type=int,
         default=8,
-        help="The batch size for training.",
+        help="The (micro-)batch size for training. With gradient accumulation, the "
+        "effective batch size is the batch size times the accumulation steps.",
+    )
+    train_parser.add_argument(
+        "--accumulation-steps",
+        required=False,
+        type=int,
+        default=1,
+        help="The number of batches whose gradients are accumulated before each "
+        "optimizer step.",
+    )
+    train_parser.add_argument(
+        "--num-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_NUM_WORKERS,
+        help="The number of worker processes loading the batches (torch only). "
+        "If 0, the batches are loaded in the main process.",
+    )
+    train_parser.add_argument(
+        "--prefetch-factor",
+        required=False,
+        type=int,
+        default=DEFAULT_PREFETCH_FACTOR,
+        help="The number of batches loaded in advance by each worker (torch only).",
+    )
+    train_parser.add_argument(
+        "--pin-memory",
+        required=False,
+        action=BooleanOptionalAction,
+        default=None,
+        help="Whether to copy the batches into pinned memory (torch only). By "
+        "default, memory is pinned whenever cuda is available.",
+    )
+    train_parser.add_argument(
+        "--persistent-workers",
+        required=False,
+        action=BooleanOptionalAction,
+        default=True,
+        help="Whether to keep the workers loading the batches alive between epochs "
+        "(torch only).",
     )
     train_parser.add_argument(
         "--epochs",
@@ -202,6 +289,28 @@ def _set_up_arg_parser() -> ArgumentParser:
         default=20,
         help="The number of epochs for training.",
     )
+    train_parser.add_argument(
+        "--patience",
+        required=False,
+        type=int,
+        default=None,
+        help="Stop the training early after this number of validations without "
+        "improvement of the validation loss. If not specified, all epochs are trained.",
+    )
+    train_parser.add_argument(
+        "--min-delta",
+        required=False,
+        type=float,
+        default=0.0,
+        help="The minimum decrease of the validation loss that counts as improvement.",
+    )
+    train_parser.add_argument(
+        "--validate-every",
+        required=False,
+        type=int,
+        default=1,
+        help="Validate the model every n epochs.",
+    )
     train_parser.add_argument(
         "--learning-rate",
         "-r",
@@ -210,6 +319,22 @@ def _set_up_arg_parser() -> ArgumentParser:
         default=0.0015,
         help="The learning rate for training.",
     )
+    train_parser.add_argument(
+        "--mixed-precision",
+        required=False,
+        default=False,
+        action="store_true",
+        help="Train with automatic mixed precision (torch only): float16 on cuda and "
+        "bfloat16 on the cpu.",
+    )
+    train_parser.add_argument(
+        "--keep-checkpoints",
+        required=False,
+        type=int,
+        default=DEFAULT_KEEP_CHECKPOINTS,
+        help="The number of most recent epoch checkpoints kept besides the best model "
+        "(torch only). A negative value keeps all checkpoints.",
+    )
     train_parser.add_argument(
         "--fine-tune",
         required=False,
@@ -234,7 +359,8 @@ def _set_up_arg_parser() -> ArgumentParser:
         "-l",
         required=True,
         type=Path,
-        help="Path to the model to load for evaluation.",
+        help="Path to the model to load for evaluation. Models with the suffix .onnx "
+        "are run with onnxruntime.",
     )
     evaluate_parser.add_argument(
         "--input",
@@ -274,6 +400,37 @@ def _set_up_arg_parser() -> ArgumentParser:
         default=8,
         help="The batch size for evaluation.",
     )
+    evaluate_parser.add_argument(
+        "--num-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_NUM_WORKERS,
+        help="The number of worker processes loading the batches (torch only). "
+        "If 0, the batches are loaded in the main process.",
+    )
+    evaluate_parser.add_argument(
+        "--prefetch-factor",
+        required=False,
+        type=int,
+        default=DEFAULT_PREFETCH_FACTOR,
+        help="The number of batches loaded in advance by each worker (torch only).",
+    )
+    evaluate_parser.add_argument(
+        "--pin-memory",
+        required=False,
+        action=BooleanOptionalAction,
+        default=None,
+        help="Whether to copy the batches into pinned memory (torch only). By "
+        "default, memory is pinned whenever cuda is available.",
+    )
+    evaluate_parser.add_argument(
+        "--persistent-workers",
+        required=False,
+        action=BooleanOptionalAction,
+        default=True,
+        help="Whether to keep the workers loading the batches alive between epochs "
+        "(torch only).",
+    )
     evaluate_parser.add_argument(
         "--parts",
         "-p",
@@ -289,11 +446,54 @@ def _set_up_arg_parser() -> ArgumentParser:
         action="store_true",
         help="Whether the model should be evaluated on a single part only.",
     )
+    evaluate_parser.add_argument(
+        "--eval-workers",
+        required=False,
+        type=int,
+        default=1,
+        help="The number of parts evaluated concurrently with the same model.",
+    )
+    evaluate_parser.add_argument(
+        "--bootstrap-samples",
+        required=False,
+        type=int,
+        default=DEFAULT_BOOTSTRAP_SAMPLES,
+        help="The number of bootstrap resamples of the confidence intervals of the "
+        "metrics. If 0, no confidence intervals are computed.",
+    )
+    evaluate_parser.add_argument(
+        "--confidence",
+        required=False,
+        type=float,
+        default=DEFAULT_CONFIDENCE,
+        help="The confidence level of the confidence intervals.",
+    )
+    evaluate_parser.add_argument(
+        "--intra-op-threads",
+        required=False,
+        type=int,
+        default=0,
+        help="The threads used within an operator (ONNX only). If 0, the number of "
+        "physical cores is used.",
+    )
+    evaluate_parser.add_argument(
+        "--inter-op-threads",
+        required=False,
+        type=int,
+        default=0,
+        help="The threads running independent operators in parallel (ONNX only). "
+        "If 0 or 1, the operators are run sequentially.",
+    )
 
     # Parser for the prediction task
     predict_parser = sub_parser.add_parser(str(Tasks.PREDICT))
     predict_parser.add_argument(
-        "--model", "-m", required=True, type=Path, help="Path to the model."
+        "--model",
+        "-m",
+        required=True,
+        type=Path,
+        help="Path to the model. Models with the suffix .onnx are run with "
+        "onnxruntime.",
     )
     predict_parser.add_argument(
         "--input",
@@ -303,6 +503,309 @@ def _set_up_arg_parser() -> ArgumentParser:
         type=Path,
         help="One or more paths to snippets or folders with multiple snippets.",
     )
+    predict_parser.add_argument(
+        "--recursive",
+        "-r",
+        required=False,
+        action="store_true",
+        help="Whether to search the subdirectories of the folders.",
+    )
+    predict_parser.add_argument(
+        "--glob",
+        "-g",
+        required=False,
+        nargs="+",
+        type=str,
+        default=list(DEFAULT_PATTERNS),
+        help="Glob patterns of the files to predict in the folders, matched against "
+        "the file name and the path relative to the folder.",
+    )
+    predict_parser.add_argument(
+        "--output",
+        "-o",
+        required=False,
+        type=Path,
+        default=None,
+        help="Path of a .jsonl or .csv file. If specified, the files are streamed "
+        "through encoding and prediction in chunks and the scores of the files and "
+        "directories are written incrementally.",
+    )
+    predict_parser.add_argument(
+        "--chunk-size",
+        required=False,
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="The number of files (or methods) encoded and predicted at once (with "
+        "--output or --methods).",
+    )
+    predict_parser.add_argument(
+        "--methods",
+        required=False,
+        action="store_true",
+        help="Whether to extract the methods of the (whole) Java files and predict "
+        "them instead of the files. The scores are rolled up per class, file and "
+        "directory and streamed like with --output.",
+    )
+    predict_parser.add_argument(
+        "--parse-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_PARSE_WORKERS,
+        help="The number of processes extracting the methods (with --methods).",
+    )
+    predict_parser.add_argument(
+        "--index",
+        required=False,
+        type=Path,
+        default=None,
+        help="Path of a SQLite score index. The encodings and the scores of the "
+        "model are stored by the content of the snippets, so unchanged snippets are "
+        "not encoded and predicted again. Implies streaming like with --output.",
+    )
+    predict_parser.add_argument(
+        "--invalidate-index",
+        required=False,
+        action="store_true",
+        help="Whether to remove the scores of other models from the index.",
+    )
+    predict_parser.add_argument(
+        "--report",
+        required=False,
+        type=Path,
+        default=None,
+        help="Path of a .jsonl or .csv file for the rollups of the whole input and "
+        "every directory level (mean, mean weighted by lines of code, percentiles "
+        "and share below the threshold). Implies streaming like with --output.",
+    )
+    predict_parser.add_argument(
+        "--threshold",
+        required=False,
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Files scored below the threshold count as unreadable in the report.",
+    )
+    predict_parser.add_argument(
+        "--batch-size",
+        "-b",
+        required=False,
+        type=int,
+        default=None,
+        help="The batch size for prediction. If not specified, the default batch "
+        "size of the backend is used.",
+    )
+    predict_parser.add_argument(
+        "--intra-op-threads",
+        required=False,
+        type=int,
+        default=0,
+        help="The threads used within an operator (ONNX only). If 0, the number of "
+        "physical cores is used.",
+    )
+    predict_parser.add_argument(
+        "--inter-op-threads",
+        required=False,
+        type=int,
+        default=0,
+        help="The threads running independent operators in parallel (ONNX only). "
+        "If 0 or 1, the operators are run sequentially.",
+    )
+
+    # Parser for the export task (keras models to ONNX, torch models with any method)
+    export_parser = sub_parser.add_parser(str(Tasks.EXPORT))
+    export_parser.add_argument(
+        "--model",
+        "-m",
+        required=False,
+        type=Model,
+        help="The type of the model to export.",
+        default=Model.TOWARDS,
+    )
+    export_parser.add_argument(
+        "--load",
+        "-l",
+        required=True,
+        type=Path,
+        help="Path to the trained model to export.",
+    )
+    export_parser.add_argument(
+        "--input",
+        "-i",
+        required=False,
+        type=Path,
+        help="Path to an encoded dataset providing the example inputs (torch only).",
+    )
+    export_parser.add_argument(
+        "--output",
+        "-o",
+        required=True,
+        type=Path,
+        help="Path of the exported model. The input names and the device, which the "
+        "model runs on, are stored next to it.",
+    )
+    export_parser.add_argument(
+        "--method",
+        required=False,
+        type=ExportMethod,
+        choices=list(ExportMethod),
+        default=ExportMethod.TRACE,
+        help="Whether to export as TorchScript (trace), with torch.export or as "
+        "ONNX. Keras models can only be exported as ONNX.",
+    )
+    export_parser.add_argument(
+        "--batch-size",
+        "-b",
+        required=False,
+        type=int,
+        default=8,
+        help="The batch size of the example inputs.",
+    )
+    export_parser.add_argument(
+        "--benchmark",
+        required=False,
+        default=False,
+        action="store_true",
+        help="Compare the latency of the eager and the exported model and store "
+        "the results next to the exported model.",
+    )
+
+    # Parser for the quantization task (torch only)
+    quantize_parser = sub_parser.add_parser(str(Tasks.QUANTIZE))
+    quantize_parser.add_argument(
+        "--model",
+        "-m",
+        required=False,
+        type=Model,
+        help="The type of the model to quantize.",
+        default=Model.TOWARDS,
+    )
+    quantize_parser.add_argument(
+        "--load",
+        "-l",
+        required=True,
+        type=Path,
+        help="Path to the trained model to quantize.",
+    )
+    quantize_parser.add_argument(
+        "--input",
+        "-i",
+        required=True,
+        type=Path,
+        help="Path to the encoded dataset used for calibration and evaluation.",
+    )
+    quantize_parser.add_argument(
+        "--output",
+        "-o",
+        required=True,
+        type=Path,
+        help="Path of the quantized model (TorchScript). The comparison with the "
+        "float model is stored next to it.",
+    )
+    quantize_parser.add_argument(
+        "--mode",
+        required=False,
+        type=QuantizationMode,
+        choices=list(QuantizationMode),
+        default=QuantizationMode.DYNAMIC,
+        help="Quantize the linear and lstm layers dynamically (dynamic) or "
+        "additionally the conv layers statically (static).",
+    )
+    quantize_parser.add_argument(
+        "--calibration-batches",
+        required=False,
+        type=int,
+        default=DEFAULT_CALIBRATION_BATCHES,
+        help="The number of batches used to calibrate the static quantization.",
+    )
+    quantize_parser.add_argument(
+        "--batch-size",
+        "-b",
+        required=False,
+        type=int,
+        default=8,
+        help="The batch size for calibration and evaluation.",
+    )
+    quantize_parser.add_argument(
+        "--num-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_NUM_WORKERS,
+        help="The number of worker processes loading the batches. If 0, the batches "
+        "are loaded in the main process.",
+    )
+
+    # Parser for the prediction server
+    serve_parser = sub_parser.add_parser(str(Tasks.SERVE))
+    serve_parser.add_argument(
+        "--model",
+        "-m",
+        required=True,
+        type=Path,
+        help="Path to the model. Models with the suffix .onnx are run with "
+        "onnxruntime.",
+    )
+    serve_parser.add_argument(
+        "--host",
+        required=False,
+        type=str,
+        default=DEFAULT_HOST,
+        help="The host to listen on.",
+    )
+    serve_parser.add_argument(
+        "--port",
+        "-p",
+        required=False,
+        type=int,
+        default=DEFAULT_PORT,
+        help="The port to listen on.",
+    )
+    serve_parser.add_argument(
+        "--socket",
+        required=False,
+        type=Path,
+        default=None,
+        help="Path of a unix socket to listen on instead of the host and port.",
+    )
+    serve_parser.add_argument(
+        "--batch-size",
+        "-b",
+        required=False,
+        type=int,
+        default=None,
+        help="The batch size for prediction. If not specified, the default batch "
+        "size of the backend is used.",
+    )
+    serve_parser.add_argument(
+        "--max-batch-size",
+        required=False,
+        type=int,
+        default=DEFAULT_MAX_BATCH_SIZE,
+        help="The maximum number of snippets of concurrent requests predicted "
+        "together. If 1, each request is predicted on its own.",
+    )
+    serve_parser.add_argument(
+        "--max-wait-ms",
+        required=False,
+        type=float,
+        default=DEFAULT_MAX_WAIT_MS,
+        help="The maximum time in milliseconds a request waits for concurrent "
+        "requests to fill the batch.",
+    )
+    serve_parser.add_argument(
+        "--async",
+        dest="use_async",
+        required=False,
+        action="store_true",
+        help="Whether to serve with asyncio instead of a thread per request. The "
+        "images are rendered by awaited subprocesses and the snippets of concurrent "
+        "requests are encoded concurrently. The micro-batching options are ignored.",
+    )
+    serve_parser.add_argument(
+        "--render-concurrency",
+        required=False,
+        type=int,
+        default=DEFAULT_RENDER_CONCURRENCY,
+        help="The maximum number of concurrent render processes (with --async).",
+    )
 
     return arg_parser
 
@@ -313,6 +816,12 @@ def _run_encode(parsed_args) -> None:
     :param parsed_args: Parsed arguments.
     :return: None
     """
+    from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
+    from src.readability_classifier.encoders.dataset_utils import (
+        load_raw_dataset,
+        store_encoded_dataset,
+    )
+
     # Get the parsed arguments
     data_dir = parsed_args.input
     intermediate_dir = parsed_args.intermediate
@@ -328,13 +837,20 @@ def _run_encode(parsed_args) -> None:
         store_encoded_dataset(encoded_data, intermediate_dir)
 
 
-def _run_train(parsed_args, model_runner: ModelRunnerInterface) -> None:
+def _run_train(parsed_args, model_runner: "ModelRunnerInterface") -> None:
     """
     Runs the training of the readability classifier.
     :param parsed_args: Parsed arguments.
     :param model_runner: The model runner.
     :return: None
     """
+    from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
+    from src.readability_classifier.encoders.dataset_utils import (
+        load_encoded_dataset,
+        load_raw_dataset,
+        store_encoded_dataset,
+    )
+
     # Get the parsed arguments
     data_dir = parsed_args.input
     encoded = parsed_args.encoded
@@ -363,35 +879,38 @@ def _run_train(parsed_args, model_runner: ModelRunnerInterface) -> None:
     model_runner.run_train(parsed_args, encoded_data)
 
 
-def _run_predict(parsed_args, model_runner: ModelRunnerInterface) -> tuple[str, float]:
+def _run_predict(
+    parsed_args, model_runner: "ModelRunnerInterface" = None
+) -> tuple[str, float]:
     """
     Runs the prediction of the readability classifier.
     :param parsed_args: Parsed arguments.
+    :param model_runner: The model runner. If None, it is created unless the files
+        are streamed, which loads the model without a model runner.
     :return: None
     """
-    data_args: list[Path] = parsed_args.input
+    output = getattr(parsed_args, "output", None)
+    streaming = (
+        output is not None
+        or getattr(parsed_args, "methods", False)
+        or getattr(parsed_args, "index", None) is not None
+        or getattr(parsed_args, "report", None) is not None
+    )
+    files = find_source_files(
+        parsed_args.input,
+        getattr(parsed_args, "glob", None) or DEFAULT_PATTERNS,
+        getattr(parsed_args, "recursive", False),
+    )
 
-    files = []
-    for data_arg in data_args:
-        # Load the snippet
-        if os.path.isfile(data_arg):
-            files.append(data_arg)
-        else:
-            if os.path.isdir(data_arg):
-                for name in os.listdir(data_arg):
-                    f = os.path.join(data_arg, name)
-                    if os.path.isfile(f) and f.endswith(".java"):
-                        files.append(f)
-                if len(files) == 0:
-                    raise FileNotFoundError(f"No java files in {data_arg} found.")
-            else:
-                raise FileNotFoundError(f"{data_arg} does not exist.")
-    data_inputs: list[dict] = []
-    for f in files:
-        with open(f) as file:
-            file_contents = file.read()
-            logging.info("Loaded Snippet: \n %s", file_contents)
-            data_inputs.append({"name": f, "code_snippet": file_contents})
+    # Stream large inputs through the model
+    if streaming:
+        return _run_predict_streaming(parsed_args, files, output)
+
+    from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
+
+    if model_runner is None:
+        model_runner = _create_model_runner(Tasks.PREDICT, parsed_args)
+    data_inputs = list(read_snippets(files))
 
     # Encode the snippet
     logging.info("Encoding Snippets...")
@@ -402,12 +921,132 @@ def _run_predict(parsed_args, model_runner: ModelRunnerInterface) -> tuple[str,
     return model_runner.run_predict(parsed_args, encoded_snippets)
 
 
-def _run_evaluate(parsed_args, model_runner: ModelRunnerInterface) -> None:
+def _run_predict_streaming(
+    parsed_args, files: Iterable[str], output: Path = None
+) -> tuple[str, float]:
+    """
+    Predicts the files (or their methods) in chunks and writes the scores of the
+    methods, classes, files and directories to the output file while they are
+    predicted.
+    :param parsed_args: Parsed arguments.
+    :param files: The paths of the files.
+    :param output: The path of the .jsonl or .csv file. If None, the scores are only
+        logged.
+    :return: The prediction of all files as binary and as float.
+    """
+    from src.readability_classifier.scoring.index import ScoreIndex, model_fingerprint
+    from src.readability_classifier.scoring.report import ScoreAggregator, ScoreWriter
+    from src.readability_classifier.scoring.stream import score_files, score_methods
+    from src.readability_classifier.serving.predictor import load_scorer
+
+    score = load_scorer(
+        parsed_args.model,
+        keras=KERAS,
+        batch_size=getattr(parsed_args, "batch_size", None),
+        intra_op_threads=getattr(parsed_args, "intra_op_threads", 0),
+        inter_op_threads=getattr(parsed_args, "inter_op_threads", 0),
+    )
+    chunk_size = getattr(parsed_args, "chunk_size", DEFAULT_CHUNK_SIZE)
+    methods = getattr(parsed_args, "methods", False)
+    workers = getattr(parsed_args, "parse_workers", DEFAULT_PARSE_WORKERS)
+    index_path = getattr(parsed_args, "index", None)
+    report = getattr(parsed_args, "report", None)
+
+    with ExitStack() as stack:
+        writer = None
+        if output is not None:
+            writer = stack.enter_context(ScoreWriter(output))
+        index = None
+        if index_path is not None:
+            model = model_fingerprint(parsed_args.model)
+            index = stack.enter_context(ScoreIndex(index_path, model))
+            if getattr(parsed_args, "invalidate_index", False):
+                index.invalidate()
+
+        tree = PathTree() if report is not None else None
+        aggregator = ScoreAggregator(writer, tree)
+        if methods:
+            prediction = score_methods(
+                files, score, aggregator, chunk_size, workers, index=index
+            )
+        else:
+            prediction = score_files(files, score, aggregator, chunk_size, index=index)
+
+        if index is not None:
+            index.log_stats()
+    if output is not None:
+        logging.info(f"Scores written to {output}")
+    if report is not None:
+        threshold = getattr(parsed_args, "threshold", DEFAULT_THRESHOLD)
+        write_rollups(tree.rollup(threshold), report)
+        logging.info(f"Report written to {report}")
+    return prediction
+
+
+def _run_serve(parsed_args) -> None:
+    """
+    Runs the prediction server until it is interrupted.
+    :param parsed_args: Parsed arguments.
+    :return: None
+    """
+    if parsed_args.use_async:
+        _run_serve_async(parsed_args)
+        return
+
+    from src.readability_classifier.serving.predictor import SnippetPredictor
+
+    model_path = parsed_args.model
+    batch_size = parsed_args.batch_size
+    max_batch_size = parsed_args.max_batch_size
+    max_wait_ms = parsed_args.max_wait_ms
+
+    # Load the model and the encoders once
+    predictor = SnippetPredictor(model_path, keras=KERAS, batch_size=batch_size)
+    if max_batch_size <= 1:
+        serve(predictor, parsed_args.host, parsed_args.port, parsed_args.socket)
+        return
+
+    # Predict concurrent requests together
+    with MicroBatchScheduler(predictor, max_batch_size, max_wait_ms) as scheduler:
+        serve(scheduler, parsed_args.host, parsed_args.port, parsed_args.socket)
+
+
+def _run_serve_async(parsed_args) -> None:
+    """
+    Runs the asyncio prediction server until it is interrupted.
+    :param parsed_args: Parsed arguments.
+    :return: None
+    """
+    from src.readability_classifier.serving.async_pipeline import AsyncSnippetPredictor
+
+    with AsyncSnippetPredictor(
+        parsed_args.model,
+        keras=KERAS,
+        batch_size=parsed_args.batch_size,
+        render_concurrency=parsed_args.render_concurrency,
+    ) as predictor:
+        try:
+            asyncio.run(
+                serve_async(
+                    predictor, parsed_args.host, parsed_args.port, parsed_args.socket
+                )
+            )
+        except KeyboardInterrupt:
+            logging.info("Server stopped")
+
+
+def _run_evaluate(parsed_args, model_runner: "ModelRunnerInterface") -> None:
     """
     Runs the evaluation of the readability classifier.
     :param parsed_args: Parsed arguments.
     :return: None
     """
+    from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
+    from src.readability_classifier.encoders.dataset_utils import (
+        load_encoded_dataset,
+        load_raw_dataset,
+    )
+
     data_dir = parsed_args.input
     encoded = parsed_args.encoded
     parts = parsed_args.parts
@@ -425,11 +1064,66 @@ def _run_evaluate(parsed_args, model_runner: ModelRunnerInterface) -> None:
 
     if single:
         logging.info(f"Running a single evaluation on {1 / parts}% of the dataset...")
-        model_runner.run_evaluate(parsed_args, encoded_data[0])
+        encoded_data = encoded_data[:1]
     else:
-        for i, part in enumerate(encoded_data):
-            logging.info(f"Running evaluation for part {i + 1}/{parts}...")
-            model_runner.run_evaluate(parsed_args, part)
+        logging.info(f"Running the evaluation for {parts} parts...")
+
+    # Load the model once and evaluate all parts with it
+    model_runner.run_evaluate_parts(parsed_args, encoded_data)
+
+
+def _create_model_runner(task: Tasks, parsed_args) -> "ModelRunnerInterface":
+    """
+    Imports the backend of the task and creates its model runner.
+    :param task: The task.
+    :param parsed_args: Parsed arguments.
+    :return: The model runner.
+    """
+    if task in (Tasks.PREDICT, Tasks.EVALUATE):
+        from src.readability_classifier.onx.predictor import is_onnx_model
+
+        model_path = parsed_args.model if task == Tasks.PREDICT else parsed_args.load
+        if is_onnx_model(model_path):
+            from src.readability_classifier.onx.model_runner import OnnxModelRunner
+
+            return OnnxModelRunner()
+
+    # Only ONNX export is supported for keras models
+    torch_only = task == Tasks.QUANTIZE or (
+        task == Tasks.EXPORT and parsed_args.method != ExportMethod.ONNX
+    )
+    if KERAS and not torch_only:
+        from src.readability_classifier.keas.model_runner import KerasModelRunner
+
+        return KerasModelRunner()
+
+    from src.readability_classifier.toch.model_runner import TorchModelRunner
+
+    return TorchModelRunner()
+
+
+def _run_task(task: Tasks, parsed_args) -> None:
+    """
+    Runs a task. The model runner is only created for the tasks using it.
+    :param task: The task.
+    :param parsed_args: Parsed arguments.
+    :return: None
+    """
+    match task:
+        case Tasks.ENCODE:
+            _run_encode(parsed_args)
+        case Tasks.TRAIN:
+            _run_train(parsed_args, _create_model_runner(task, parsed_args))
+        case Tasks.PREDICT:
+            _run_predict(parsed_args)
+        case Tasks.EVALUATE:
+            _run_evaluate(parsed_args, _create_model_runner(task, parsed_args))
+        case Tasks.EXPORT:
+            _create_model_runner(task, parsed_args).run_export(parsed_args)
+        case Tasks.QUANTIZE:
+            _create_model_runner(task, parsed_args).run_quantize(parsed_args)
+        case Tasks.SERVE:
+            _run_serve(parsed_args)
 
 
 def main(args: list[str]) -> int:
@@ -461,19 +1155,17 @@ def main(args: list[str]) -> int:
     # Set the seed
     random.seed(SEED)
 
-    # Set up the model runner
-    model_runner = KerasModelRunner() if KERAS else TorchModelRunner()
+    # Execute the task, importing only its backend
+    if not parsed_args.profile_startup:
+        _run_task(task, parsed_args)
+        return 0
 
-    # Execute the task
-    match task:
-        case Tasks.ENCODE:
-            _run_encode(parsed_args)
-        case Tasks.TRAIN:
-            _run_train(parsed_args, model_runner)
-        case Tasks.PREDICT:
-            _run_predict(parsed_args, model_runner)
-        case Tasks.EVALUATE:
-            _run_evaluate(parsed_args, model_runner)
+    profiler = ImportProfiler()
+    try:
+        with profiler:
+            _run_task(task, parsed_args)
+    finally:
+        profiler.log_report()
     return 0
 
 
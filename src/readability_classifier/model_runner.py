@@ -0,0 +1,145 @@
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+
+import numpy as np
+
+from src.readability_classifier.encoders.dataset_encoder import decode_score
+from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+from src.readability_classifier.evaluation.engine import (
+    EvaluationReport,
+    MultiPartEvaluator,
+)
+from src.readability_classifier.scoring.aggregation import PathTree
+from src.readability_classifier.utils.defaults import (
+    DEFAULT_BOOTSTRAP_SAMPLES,
+    DEFAULT_CONFIDENCE,
+)
+
+
+class ModelRunnerInterface(ABC):
+    """
+    Interface for model runners.
+    """
+
+    def run_train(self, parsed_args, encoded_data: ReadabilityDataset):
+        """
+        Runs the training of the readability classifier.
+        :param parsed_args: Parsed arguments.
+        :param encoded_data: The encoded dataset.
+        :return: None
+        """
+        k_fold = parsed_args.k_fold
+        if k_fold == 0:
+            self._run_without_cross_validation(parsed_args, encoded_data)
+        else:
+            self._run_with_cross_validation(parsed_args, encoded_data)
+
+    @abstractmethod
+    def _run_without_cross_validation(
+        self, parsed_args, encoded_data: ReadabilityDataset
+    ):
+        """
+        Runs the training of the readability classifier without cross-validation.
+        :param parsed_args: Parsed arguments.
+        :param encoded_data: The encoded dataset.
+        :return: None
+        """
+        pass
+
+    @abstractmethod
+    def _run_with_cross_validation(self, parsed_args, encoded_data: ReadabilityDataset):
+        """
+        Runs the training of the readability classifier with cross-validation.
+        :param parsed_args: Parsed arguments.
+        :param encoded_data: The encoded dataset.
+        :return: None
+        """
+        pass
+
+    @abstractmethod
+    def run_predict(self, parsed_args, encoded_data: ReadabilityDataset) -> any:
+        """
+        Runs the prediction of the readability classifier.
+        :param parsed_args: Parsed arguments.
+        :param encoded_data: A single encoded data point.
+        :return: None
+        """
+        pass
+
+    def run_evaluate(
+        self, parsed_args, encoded_data: ReadabilityDataset
+    ) -> EvaluationReport:
+        """
+        Runs the evaluation of the readability classifier.
+        :param parsed_args: Parsed arguments.
+        :param encoded_data: The encoded dataset.
+        :return: The evaluation report.
+        """
+        return self.run_evaluate_parts(parsed_args, [encoded_data])
+
+    def run_evaluate_parts(
+        self, parsed_args, parts: list[ReadabilityDataset]
+    ) -> EvaluationReport:
+        """
+        Runs the evaluation of the readability classifier on multiple parts of a
+        dataset. The model is loaded once for all parts. The stats of the parts and
+        of all parts together are stored in the save directory, if specified.
+        :param parsed_args: Parsed arguments.
+        :param parts: The encoded parts of the dataset.
+        :return: The evaluation report.
+        """
+        store_dir = getattr(parsed_args, "save", None)
+
+        evaluator = MultiPartEvaluator(
+            self._load_scorer(parsed_args),
+            workers=getattr(parsed_args, "eval_workers", 1),
+            bootstrap_samples=getattr(
+                parsed_args, "bootstrap_samples", DEFAULT_BOOTSTRAP_SAMPLES
+            ),
+            confidence=getattr(parsed_args, "confidence", DEFAULT_CONFIDENCE),
+        )
+        report = evaluator.evaluate(parts)
+
+        if store_dir:
+            report.store(store_dir)
+        return report
+
+    @abstractmethod
+    def _load_scorer(
+        self, parsed_args
+    ) -> Callable[[ReadabilityDataset], Sequence[float]]:
+        """
+        Loads the model to evaluate once.
+        :param parsed_args: Parsed arguments.
+        :return: The function scoring encoded snippets.
+        """
+        pass
+
+
+def aggregate_predictions(
+    encoded_dataset: ReadabilityDataset, predictions: np.ndarray
+) -> tuple[str, float]:
+    """
+    Logs the predicted readability of each file, of each directory level and of the
+    whole input.
+    :param encoded_dataset: The encoded snippets with their file names.
+    :param predictions: The predicted scores in the order of the dataset.
+    :return: The prediction of the whole input as binary and as float.
+    """
+    tree = PathTree()
+    for i in range(len(predictions)):
+        filename = encoded_dataset[i]["name"]
+        prediction = float(np.asarray(predictions[i]).item())
+        tree.add(filename, prediction)
+        logging.info(f"Readability of file {filename}: {decode_score(prediction)}")
+
+    whole_input, *directories = tree.rollup()
+    for rollup in directories:
+        logging.info(
+            f"Readability of directory {rollup.path}: {decode_score(rollup.mean)}"
+        )
+
+    prediction = decode_score(whole_input.mean)
+    logging.info(f"Readability of whole input: {prediction}")
+    return prediction
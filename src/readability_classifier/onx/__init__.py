@@ -0,0 +1 @@
+# Do not change the name of "onx" to "onnx" as this would break import statements.
@@ -0,0 +1,71 @@
+from collections.abc import Callable, Sequence
+
+from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+from src.readability_classifier.model_runner import (
+    ModelRunnerInterface,
+    aggregate_predictions,
+)
+from src.readability_classifier.onx.predictor import DEFAULT_BATCH_SIZE, OnnxPredictor
+
+
+class OnnxModelRunner(ModelRunnerInterface):
+    """
+    An ONNX model runner. Runs the prediction and evaluation of a readability
+    classifier exported to ONNX (from keras or torch) with onnxruntime. Training is not
+    supported.
+    """
+
+    def _run_without_cross_validation(
+        self, parsed_args, encoded_data: ReadabilityDataset
+    ):
+        """
+        Rejects the training, ONNX models can not be trained.
+        :param parsed_args: Parsed arguments.
+        :param encoded_data: The encoded dataset.
+        :return: None
+        """
+        raise ValueError("ONNX models can not be trained.")
+
+    def _run_with_cross_validation(self, parsed_args, encoded_data: ReadabilityDataset):
+        """
+        Rejects the training, ONNX models can not be trained.
+        :param parsed_args: Parsed arguments.
+        :param encoded_data: The encoded dataset.
+        :return: None
+        """
+        raise ValueError("ONNX models can not be trained.")
+
+    def run_predict(
+        self, parsed_args, encoded_dataset: ReadabilityDataset
+    ) -> tuple[str, float]:
+        """
+        Runs the prediction of the readability classifier.
+        :param parsed_args: Parsed arguments.
+        :param encoded_dataset: A dataset of encoded data points.
+        :return: The prediction as binary and as float (1 = readable, 0 = not readable).
+        """
+        model_path = parsed_args.model
+        intra_op_threads = getattr(parsed_args, "intra_op_threads", 0)
+        inter_op_threads = getattr(parsed_args, "inter_op_threads", 0)
+        batch_size = getattr(parsed_args, "batch_size", None) or DEFAULT_BATCH_SIZE
+
+        predictor = OnnxPredictor(model_path, intra_op_threads, inter_op_threads)
+        predictions = predictor.predict(encoded_dataset, batch_size)
+
+        return aggregate_predictions(encoded_dataset, predictions)
+
+    def _load_scorer(
+        self, parsed_args
+    ) -> Callable[[ReadabilityDataset], Sequence[float]]:
+        """
+        Loads the model to evaluate once.
+        :param parsed_args: Parsed arguments.
+        :return: The function scoring encoded snippets.
+        """
+        model_path = parsed_args.load
+        intra_op_threads = getattr(parsed_args, "intra_op_threads", 0)
+        inter_op_threads = getattr(parsed_args, "inter_op_threads", 0)
+        batch_size = getattr(parsed_args, "batch_size", None) or DEFAULT_BATCH_SIZE
+
+        predictor = OnnxPredictor(model_path, intra_op_threads, inter_op_threads)
+        return lambda encoded: predictor.predict(encoded, batch_size)
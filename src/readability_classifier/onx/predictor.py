@@ -0,0 +1,132 @@
+import logging
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from src.readability_classifier.utils.fold_scheduler import flatten
+
+ONNX_SUFFIX = ".onnx"
+DEFAULT_BATCH_SIZE = 32
+ONNX_TYPES = {
+    "tensor(float)": np.float32,
+    "tensor(float16)": np.float16,
+    "tensor(double)": np.float64,
+    "tensor(int32)": np.int32,
+    "tensor(int64)": np.int64,
+}
+
+
+def _segment_ids(sample: dict) -> np.ndarray:
+    """
+    Returns the segment ids of a sample for the keras model. Samples encoded without
+    own segment ids use the position ids instead (as in keas.classifier).
+    :param sample: The encoded sample.
+    :return: The segment ids.
+    """
+    bert = sample["bert"]
+    if "segment_ids" in bert:
+        return np.asarray(bert["segment_ids"])
+    return np.asarray(bert["position_ids"])
+
+
+# The inputs of the keras towards model (exported with tf2onnx) by name
+KERAS_INPUTS: dict[str, Callable[[dict], np.ndarray]] = {
+    "struc_input": lambda sample: np.asarray(sample["matrix"]),
+    "seman_input_token": lambda sample: np.asarray(sample["bert"]["input_ids"]),
+    "seman_input_segment": _segment_ids,
+    "vis_input": lambda sample: np.transpose(np.asarray(sample["image"]), (1, 2, 0)),
+}
+
+
+def is_onnx_model(path: Path) -> bool:
+    """
+    Checks whether the path is an ONNX model.
+    :param path: The path of the model.
+    :return: True if it is an ONNX model.
+    """
+    return Path(path).suffix == ONNX_SUFFIX
+
+
+def sample_input(sample: dict, name: str) -> np.ndarray:
+    """
+    Returns the value of an ONNX model input for an encoded sample. Inputs of the
+    keras model are converted like in keas.classifier, inputs of exported torch models
+    are named after the flat fields of the sample (e.g. "bert.input_ids").
+    :param sample: The encoded sample.
+    :param name: The name of the model input.
+    :return: The value of the input.
+    """
+    if name in KERAS_INPUTS:
+        return KERAS_INPUTS[name](sample)
+    return np.asarray(flatten(sample)[name])
+
+
+class OnnxPredictor:
+    """
+    Predicts the readability of encoded snippets with an ONNX model on the cpu. Neither
+    torch nor tensorflow is needed to run the model.
+    """
+
+    def __init__(
+        self, path: Path, intra_op_threads: int = 0, inter_op_threads: int = 0
+    ):
+        """
+        Creates the inference session with all graph optimizations enabled.
+        :param path: The path of the ONNX model.
+        :param intra_op_threads: The threads used within an operator. If 0, the
+            number of physical cores is used.
+        :param inter_op_threads: The threads running independent operators in
+            parallel. If 0 or 1, the operators are run sequentially.
+        """
+        import onnxruntime as ort  # Optional dependency, only needed for inference
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        options.execution_mode = (
+            ort.ExecutionMode.ORT_PARALLEL
+            if inter_op_threads > 1
+            else ort.ExecutionMode.ORT_SEQUENTIAL
+        )
+
+        self.session = ort.InferenceSession(
+            str(path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.inputs = [
+            (model_input.name, ONNX_TYPES[model_input.type])
+            for model_input in self.session.get_inputs()
+        ]
+        logging.info(f"ONNX model loaded from {path}")
+
+    def predict_batch(self, samples: Sequence[dict]) -> np.ndarray:
+        """
+        Predicts the readability of a batch of encoded snippets.
+        :param samples: The encoded snippets.
+        :return: The predicted scores.
+        """
+        feed = {
+            name: np.stack([sample_input(sample, name) for sample in samples]).astype(
+                dtype, copy=False
+            )
+            for name, dtype in self.inputs
+        }
+        return self.session.run(None, feed)[0].reshape(-1)
+
+    def predict(
+        self, dataset: Sequence[dict], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> np.ndarray:
+        """
+        Predicts the readability of the encoded snippets.
+        :param dataset: The encoded snippets.
+        :param batch_size: The batch size.
+        :return: The predicted scores in the order of the dataset.
+        """
+        scores = np.empty(len(dataset), dtype=np.float32)
+        for start in range(0, len(dataset), batch_size):
+            end = min(start + batch_size, len(dataset))
+            scores[start:end] = self.predict_batch(
+                [dataset[i] for i in range(start, end)]
+            )
+        return scores
@@ -0,0 +1,190 @@
+import csv
+import heapq
+import json
+import os
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path, PurePath
+from typing import NamedTuple
+
+DEFAULT_THRESHOLD = 0.5  # Scores below are unreadable
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def percentile(sorted_scores: list[float], q: float) -> float:
+    """
+    Computes a percentile with linear interpolation between the closest ranks (like
+    numpy.percentile).
+    :param sorted_scores: The sorted scores.
+    :param q: The percentile between 0 and 100.
+    :return: The percentile.
+    """
+    position = (len(sorted_scores) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_scores) - 1)
+    fraction = position - lower
+    return sorted_scores[lower] * (1 - fraction) + sorted_scores[upper] * fraction
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """
+    Data class for the aggregated scores of all files below a directory.
+    """
+
+    path: str  # Empty for the whole input
+    depth: int
+    files: int
+    lines: int
+    mean: float
+    weighted_mean: float  # Weighted by the lines of code of the files
+    below_threshold: float  # Share of files scored below the threshold
+    percentiles: dict[int, float]
+
+    def to_dict(self) -> dict:
+        """
+        Convert to a flat dict with a key per percentile, e.g. "p50".
+        :return: The rollup as dict.
+        """
+        rollup = {
+            "path": self.path,
+            "depth": self.depth,
+            "files": self.files,
+            "lines": self.lines,
+            "mean": self.mean,
+            "weighted_mean": self.weighted_mean,
+            "below_threshold": self.below_threshold,
+        }
+        rollup.update({f"p{q}": value for q, value in self.percentiles.items()})
+        return rollup
+
+
+class _Node:
+    """
+    A directory of the path tree with the scores and lines of its files.
+    """
+
+    __slots__ = ("children", "scores", "lines")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.scores: list[float] = []
+        self.lines: list[int] = []
+
+
+class _Subtree(NamedTuple):
+    """
+    The sorted scores and the sums of the files below a node.
+    """
+
+    scores: list[float]
+    lines: int
+    weighted_sum: float
+
+
+class PathTree:
+    """
+    A prefix tree over the paths of scored files. The rollups of all directory
+    levels are computed in one post-order pass, in which the sorted scores of the
+    children are merged into the sorted scores of their parent. The scores of the
+    children are released once they are merged, so that at most two copies of the
+    scores of all files are held at a time.
+    """
+
+    def __init__(self):
+        """
+        Initializes the empty tree.
+        """
+        self.root = _Node()
+        self.files = 0
+
+    def add(self, path: str, score: float, lines: int = 1) -> None:
+        """
+        Adds the score of a file.
+        :param path: The path of the file.
+        :param score: The predicted score.
+        :param lines: The lines of code of the file.
+        :return: None
+        """
+        node = self.root
+        for part in PurePath(os.path.normpath(path)).parent.parts:
+            node = node.children.setdefault(part, _Node())
+        node.scores.append(score)
+        node.lines.append(max(1, lines))
+        self.files += 1
+
+    def rollup(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        percentiles: Iterable[int] = DEFAULT_PERCENTILES,
+    ) -> list[Rollup]:
+        """
+        Computes the rollups of the whole input and of every directory.
+        :param threshold: Files scored below the threshold count as unreadable.
+        :param percentiles: The percentiles to compute.
+        :return: The rollups in pre-order, i.e. each directory before its
+            subdirectories.
+        """
+        if self.files == 0:
+            raise ValueError("No files were scored.")
+        percentiles = tuple(percentiles)
+        rollups: list[tuple[tuple[str, ...], Rollup]] = []
+
+        def visit(node: _Node, parts: tuple[str, ...]) -> _Subtree:
+            """
+            Rolls up a node after its children.
+            :param node: The node.
+            :param parts: The path of the node.
+            :return: The summary of the subtree.
+            """
+            subtrees = [
+                visit(child, (*parts, name)) for name, child in node.children.items()
+            ]
+            scores = list(
+                heapq.merge(sorted(node.scores), *(tree.scores for tree in subtrees))
+            )
+            for tree in subtrees:
+                tree.scores.clear()
+            lines = sum(node.lines) + sum(tree.lines for tree in subtrees)
+            weighted_sum = sum(
+                score * weight
+                for score, weight in zip(node.scores, node.lines, strict=True)
+            ) + sum(tree.weighted_sum for tree in subtrees)
+
+            if scores:
+                rollup = Rollup(
+                    path=str(PurePath(*parts)) if parts else "",
+                    depth=len(parts),
+                    files=len(scores),
+                    lines=lines,
+                    mean=sum(scores) / len(scores),
+                    weighted_mean=weighted_sum / lines,
+                    below_threshold=bisect_left(scores, threshold) / len(scores),
+                    percentiles={q: percentile(scores, q) for q in percentiles},
+                )
+                rollups.append((parts, rollup))
+            return _Subtree(scores, lines, weighted_sum)
+
+        visit(self.root, ())
+        rollups.sort(key=lambda item: item[0])
+        return [rollup for _, rollup in rollups]
+
+
+def write_rollups(rollups: list[Rollup], output: Path) -> None:
+    """
+    Writes the rollups as JSON lines or CSV, depending on the suffix of the output.
+    :param rollups: The rollups.
+    :param output: The path of the .jsonl or .csv file.
+    :return: None
+    """
+    output = Path(output)
+    os.makedirs(output.parent, exist_ok=True)
+    rows = [rollup.to_dict() for rollup in rollups]
+    with open(output, "w", encoding="utf-8", newline="") as f:
+        if output.suffix.lower() == ".csv":
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
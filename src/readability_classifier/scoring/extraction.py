@@ -0,0 +1,280 @@
+import logging
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from pygments.lexers import JavaLexer
+from pygments.token import Comment, Keyword, Name, Punctuation, Text, Whitespace
+
+from src.readability_classifier.scoring.files import chunked
+
+TYPE_KEYWORDS = ("class", "interface", "enum", "record")
+DEFAULT_PARSE_WORKERS = os.cpu_count() or 1
+FILES_PER_WORKER = 16  # Files submitted per worker at once, bounds the memory
+INITIALIZER_PREFIXES = (None, "static", ";", "{", "}")  # Tokens before initializers
+
+
+@dataclass(frozen=True)
+class MethodSnippet:
+    """
+    Data class for a method (or constructor) extracted from a Java file. The code
+    starts with the line of the first annotation or modifier and keeps the
+    indentation of the file, like the snippets of the datasets.
+    """
+
+    path: str
+    class_name: str  # Nested classes are separated by dots
+    method: str
+    start_line: int  # 1-based, inclusive
+    end_line: int
+    code: str
+
+    @property
+    def qualified_name(self) -> str:
+        """
+        The name of the method including its class.
+        """
+        return f"{self.class_name}.{self.method}" if self.class_name else self.method
+
+
+def _snippet_start(code: str, offset: int) -> int:
+    """
+    Returns the offset a snippet starts at, i.e. the start of the line with the given
+    offset to keep the indentation, or the offset if other code precedes it there.
+    :param code: The code.
+    :param offset: The offset of the first token of the snippet.
+    :return: The offset of the snippet start.
+    """
+    line_start = code.rfind("\n", 0, offset) + 1
+    return line_start if not code[line_start:offset].strip() else offset
+
+
+class _MemberParser:
+    """
+    Finds the methods and constructors in the pygments tokens of Java code by
+    matching braces. Each open brace is classified as a type, method or initializer
+    body (which end a member) or as another block, e.g. of an annotation argument,
+    an array initializer or a lambda.
+    """
+
+    def __init__(self, code: str, path: str):
+        """
+        Initializes the parser.
+        :param code: The Java code.
+        :param path: The path of the file.
+        """
+        self.code = code
+        self.path = path
+        self.methods: list[MethodSnippet] = []
+        self.braces: list[str] = []  # Kinds of the open braces
+        self.types: list[tuple[str, int]] = []  # Name and brace depth of type bodies
+        self.parens = 0
+        self.expect_type_name = False
+        self.pending_type = None
+        self.pending_method = None
+        self.constructor = None  # Type name that is a constructor if "(" follows
+        self.member_start = None  # Offset of the first token of the current member
+        self.open_method = None  # Name, class, start offset and body depth
+        self.previous = None  # The previous token
+
+    def parse(self) -> list[MethodSnippet]:
+        """
+        Parses the code.
+        :return: The methods in the order of the code.
+        """
+        for offset, token, value in JavaLexer().get_tokens_unprocessed(self.code):
+            if token in Whitespace or (token in Text and not value.strip()):
+                continue
+            if token in Comment:
+                continue
+            self._token(offset, token, value)
+            self.previous = value
+        return self.methods
+
+    def _in_type_body(self) -> bool:
+        """
+        Checks whether the current brace depth is the body of a type.
+        :return: True if it is.
+        """
+        return bool(self.types) and len(self.braces) == self.types[-1][1]
+
+    def _token(self, offset: int, token, value: str) -> None:
+        """
+        Processes a token.
+        :param offset: The offset of the token.
+        :param token: The token type.
+        :param value: The text of the token.
+        :return: None
+        """
+        member_scope = not self.braces or self._in_type_body()
+        if member_scope and self.member_start is None:
+            self.member_start = offset
+        constructor, self.constructor = self.constructor, None
+
+        if token not in Punctuation:
+            self._declaration(token, value, member_scope)
+            return
+        if constructor is not None and value in ("(", "{"):
+            self.pending_method = constructor
+
+        if value == "(":
+            self.parens += 1
+        elif value == ")":
+            self.parens = max(0, self.parens - 1)
+        elif value == "{":
+            self._open(offset, member_scope)
+        elif value == "}":
+            self._close(offset)
+        elif value == ";" and member_scope:
+            self.member_start = None
+            self.pending_method = None
+
+    def _declaration(self, token, value: str, member_scope: bool) -> None:
+        """
+        Processes a token that may declare a type, method or constructor.
+        :param token: The token type.
+        :param value: The text of the token.
+        :param member_scope: Whether the token is in the scope of members.
+        :return: None
+        """
+        if self.expect_type_name and token in Name:
+            self.pending_type = value
+            self.expect_type_name = False
+        elif token in Keyword and value in TYPE_KEYWORDS and member_scope:
+            self.expect_type_name = True
+        elif token in Name.Function and member_scope and self.pending_method is None:
+            self.pending_method = value
+        elif (
+            token in Name
+            and self._in_type_body()
+            and self.pending_method is None
+            and self.previous != "new"
+            and value == self.types[-1][0].rsplit(".", 1)[-1]
+        ):
+            # Constructors without modifiers are not tagged as functions
+            self.constructor = value
+
+    def _open(self, offset: int, member_scope: bool) -> None:
+        """
+        Processes an open brace.
+        :param offset: The offset of the brace.
+        :param member_scope: Whether the brace is in the scope of members.
+        :return: None
+        """
+        kind = "block"
+        if member_scope and self.parens == 0:
+            if self.pending_type is not None:
+                kind = "type"
+            elif self.pending_method is not None:
+                kind = "method"
+            elif self.previous in INITIALIZER_PREFIXES:
+                kind = "initializer"
+
+        if kind == "type":
+            outer = self.types[-1][0] + "." if self.types else ""
+            self.types.append((outer + self.pending_type, len(self.braces) + 1))
+            self.member_start = None
+        elif kind == "method":
+            class_name = self.types[-1][0] if self._in_type_body() else ""
+            start = self.member_start if self.member_start is not None else offset
+            depth = len(self.braces) + 1
+            self.open_method = (self.pending_method, class_name, start, depth)
+        if member_scope and self.parens == 0:
+            self.pending_type = None
+            self.pending_method = None
+        self.braces.append(kind)
+
+    def _close(self, offset: int) -> None:
+        """
+        Processes a closing brace and extracts the method it ends, if any.
+        :param offset: The offset of the brace.
+        :return: None
+        """
+        depth = len(self.braces)
+        kind = self.braces.pop() if self.braces else "block"
+        if self.open_method is not None and depth == self.open_method[3]:
+            name, class_name, start, _ = self.open_method
+            start = _snippet_start(self.code, start)
+            self.methods.append(
+                MethodSnippet(
+                    path=self.path,
+                    class_name=class_name,
+                    method=name,
+                    start_line=self.code.count("\n", 0, start) + 1,
+                    end_line=self.code.count("\n", 0, offset) + 1,
+                    code=self.code[start : offset + 1],
+                )
+            )
+            self.open_method = None
+        if self.types and depth == self.types[-1][1]:
+            self.types.pop()
+        if kind != "block":
+            self.member_start = None
+
+
+def count_lines_of_code(code: str) -> int:
+    """
+    Counts the lines of code of Java code, i.e. the lines with a token that is
+    neither whitespace nor a comment.
+    :param code: The Java code.
+    :return: The number of lines of code.
+    """
+    lines = set()
+    line = 0
+    for _, token, value in JavaLexer().get_tokens_unprocessed(code):
+        newlines = value.count("\n")
+        if token not in Comment and token not in Whitespace and value.strip():
+            lines.update(range(line, line + newlines + 1))
+        line += newlines
+    return len(lines)
+
+
+def extract_methods(code: str, path: str = "") -> list[MethodSnippet]:
+    """
+    Extracts the methods and constructors with a body from Java code, e.g. a file or
+    a snippet of methods without class. The code is lexed once with pygments,
+    declarations are found by matching the braces of the type bodies. Methods of
+    local and anonymous classes are part of their enclosing method.
+    :param code: The Java code of a file.
+    :param path: The path of the file.
+    :return: The methods in the order of the file.
+    """
+    return _MemberParser(code, path).parse()
+
+
+def extract_file(path: str) -> list[MethodSnippet]:
+    """
+    Reads a Java file and extracts its methods. Undecodable characters are replaced.
+    :param path: The path of the file.
+    :return: The methods in the order of the file.
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        code = f.read()
+    methods = extract_methods(code, path)
+    if not methods:
+        logging.debug(f"No methods found in {path}")
+    return methods
+
+
+def extract_files(
+    files: Iterable[str], workers: int = DEFAULT_PARSE_WORKERS
+) -> Iterator[MethodSnippet]:
+    """
+    Lazily extracts the methods of the files, parsing the files in parallel worker
+    processes. The methods are returned in the order of the files and only a bounded
+    number of files is parsed ahead.
+    :param files: The paths of the files.
+    :param workers: The number of worker processes. If 0 or 1, the files are parsed
+        in the current process.
+    :return: The methods.
+    """
+    if workers <= 1:
+        for path in files:
+            yield from extract_file(path)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        for paths in chunked(files, workers * FILES_PER_WORKER):
+            for methods in executor.map(extract_file, paths, chunksize=4):
+                yield from methods
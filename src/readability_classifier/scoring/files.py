@@ -0,0 +1,93 @@
+import logging
+import os
+from collections.abc import Iterable, Iterator
+from fnmatch import fnmatch
+from itertools import islice
+from pathlib import Path
+
+DEFAULT_PATTERNS = ("*.java",)
+DEFAULT_CHUNK_SIZE = 256  # Files encoded and predicted at once
+
+
+def _matches(name: str, patterns: Iterable[str]) -> bool:
+    """
+    Checks whether a file name or relative path matches any of the glob patterns.
+    :param name: The file name or relative path.
+    :param patterns: The glob patterns.
+    :return: True if it matches.
+    """
+    return any(fnmatch(name, pattern) for pattern in patterns)
+
+
+def _walk(directory: Path, patterns: tuple[str, ...], recursive: bool) -> Iterator[str]:
+    """
+    Lists the files of a directory matching the patterns in a stable order. The files
+    of a directory are listed before the files of its subdirectories.
+    :param directory: The directory.
+    :param patterns: The glob patterns matched against the file name and the path
+        relative to the directory.
+    :param recursive: Whether to include the subdirectories.
+    :return: The paths of the files.
+    """
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        if not recursive:
+            dirs.clear()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, directory).replace(os.sep, "/")
+            if _matches(name, patterns) or _matches(relative, patterns):
+                yield path
+
+
+def find_source_files(
+    paths: Iterable[Path],
+    patterns: Iterable[str] = DEFAULT_PATTERNS,
+    recursive: bool = False,
+) -> Iterator[str]:
+    """
+    Lazily lists the source files to predict. Files are used as they are, directories
+    are searched for files matching the glob patterns.
+    :param paths: The paths of files or directories.
+    :param patterns: The glob patterns, e.g. "*.java" or "src/main/**/*.java".
+    :param recursive: Whether to search the subdirectories of the directories.
+    :return: The paths of the files.
+    """
+    patterns = tuple(patterns)
+    for path in paths:
+        if os.path.isfile(path):
+            yield str(path)
+        elif os.path.isdir(path):
+            found = False
+            for file in _walk(Path(path), patterns, recursive):
+                found = True
+                yield file
+            if not found:
+                raise FileNotFoundError(f"No files matching {patterns} in {path}.")
+        else:
+            raise FileNotFoundError(f"{path} does not exist.")
+
+
+def read_snippets(files: Iterable[str]) -> Iterator[dict]:
+    """
+    Lazily loads the code snippets of the files. Undecodable characters are replaced.
+    :param files: The paths of the files.
+    :return: The snippets with their file names.
+    """
+    for file in files:
+        with open(file, encoding="utf-8", errors="replace") as f:
+            code_snippet = f.read()
+        logging.debug("Loaded Snippet: \n %s", code_snippet)
+        yield {"name": file, "code_snippet": code_snippet}
+
+
+def chunked(items: Iterable, size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list]:
+    """
+    Splits the items into lists of at most the given size.
+    :param items: The items.
+    :param size: The size of the lists.
+    :return: The lists.
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, max(1, size))):
+        yield chunk
@@ -0,0 +1,217 @@
+import hashlib
+import io
+import logging
+import os
+import sqlite3
+import zlib
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import torch
+
+from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+
+ENCODING_VERSION = "1"  # Increment if the encoding of the DatasetEncoder changes
+FEATURE_KEYS = ("matrix", "bert", "image")
+MAX_QUERY_KEYS = 500  # Stays below the variable limit of SQLite
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    snippet TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scores (
+    model TEXT NOT NULL,
+    snippet TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (model, snippet)
+);
+"""
+
+
+def snippet_key(code_snippet: str) -> str:
+    """
+    Computes the key of a code snippet from its content and the encoding version.
+    :param code_snippet: The code snippet.
+    :return: The sha1 hex digest.
+    """
+    digest = hashlib.sha1(ENCODING_VERSION.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(code_snippet.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def model_fingerprint(model_path: Path) -> str:
+    """
+    Computes a hash of the content of a model file or of all files of a model
+    directory, so that scores of a retrained checkpoint are not reused.
+    :param model_path: The path of the model.
+    :return: The sha1 hex digest.
+    """
+    model_path = Path(model_path)
+    files = (
+        sorted(path for path in model_path.rglob("*") if path.is_file())
+        if model_path.is_dir()
+        else [model_path]
+    )
+    digest = hashlib.sha1()
+    for path in files:
+        digest.update(str(path.relative_to(model_path)).encode("utf-8"))
+        with open(path, "rb") as f:
+            while block := f.read(1 << 20):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _serialize(sample: dict) -> bytes:
+    """
+    Serializes the encoded features of a sample.
+    :param sample: The encoded sample.
+    :return: The compressed bytes.
+    """
+    buffer = io.BytesIO()
+    torch.save({key: sample[key] for key in FEATURE_KEYS}, buffer)
+    return zlib.compress(buffer.getvalue())
+
+
+def _deserialize(data: bytes) -> dict:
+    """
+    Deserializes the encoded features of a sample.
+    :param data: The compressed bytes.
+    :return: The encoded sample.
+    """
+    return torch.load(io.BytesIO(zlib.decompress(data)), weights_only=True)
+
+
+class ScoreIndex:
+    """
+    A persistent index of encoded snippets and their scores in SQLite. The encoded
+    features are looked up by the content of a snippet, the scores additionally by
+    the fingerprint of the model, so a changed model only needs inference and no
+    encoding. The index supports a single writing process.
+    """
+
+    def __init__(self, path: Path, model: str):
+        """
+        Opens (or creates) the index.
+        :param path: The path of the SQLite database.
+        :param model: The fingerprint of the model (see model_fingerprint).
+        """
+        self.path = Path(path)
+        self.model = model
+        self.cached_scores = 0
+        self.cached_features = 0
+        self.encoded = 0
+
+        os.makedirs(self.path.parent, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "ScoreIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def invalidate(self) -> int:
+        """
+        Removes the scores of all other models.
+        :return: The number of removed scores.
+        """
+        with self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM scores WHERE model != ?", (self.model,)
+            )
+        logging.info(f"Removed {cursor.rowcount} scores of other models from the index")
+        return cursor.rowcount
+
+    def get_or_score(
+        self,
+        samples: Sequence[dict],
+        encode: Callable[[list[dict]], ReadabilityDataset],
+        score: Callable[[ReadabilityDataset], Sequence[float]],
+    ) -> list[float]:
+        """
+        Returns the scores of the snippets. Only snippets without score are scored
+        and only snippets without features are encoded, the results are stored.
+        :param samples: The unencoded snippets with their names.
+        :param encode: Encodes snippets, e.g. DatasetEncoder.encode_dataset.
+        :param score: Scores encoded snippets, e.g. from load_scorer.
+        :return: The scores in the order of the snippets.
+        """
+        keys = [snippet_key(sample["code_snippet"]) for sample in samples]
+        scores = self._select(
+            "SELECT snippet, score FROM scores WHERE model = ? AND snippet IN ({})",
+            keys,
+            (self.model,),
+        )
+        self.cached_scores += sum(key in scores for key in keys)
+
+        # First occurrence of each snippet without score
+        missing: dict[str, dict] = {}
+        for key, sample in zip(keys, samples, strict=True):
+            if key not in scores and key not in missing:
+                missing[key] = sample
+        if not missing:
+            return [scores[key] for key in keys]
+
+        stored = self._select(
+            "SELECT snippet, data FROM features WHERE snippet IN ({})", list(missing)
+        )
+        features = {key: _deserialize(data) for key, data in stored.items()}
+        self.cached_features += len(features)
+        unencoded = [key for key in missing if key not in features]
+        if unencoded:
+            encoded = encode([dict(missing[key]) for key in unencoded])
+            for idx, key in enumerate(unencoded):
+                features[key] = {name: encoded[idx][name] for name in FEATURE_KEYS}
+            self.encoded += len(unencoded)
+
+        new_scores = score(ReadabilityDataset([features[key] for key in missing]))
+        for key, new_score in zip(missing, new_scores, strict=True):
+            scores[key] = float(new_score)
+
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO features VALUES (?, ?)",
+                [(key, _serialize(features[key])) for key in unencoded],
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO scores VALUES (?, ?, ?)",
+                [(self.model, key, scores[key]) for key in missing],
+            )
+        return [scores[key] for key in keys]
+
+    def log_stats(self) -> None:
+        """
+        Logs how many snippets were served from the index.
+        :return: None
+        """
+        logging.info(
+            f"Score index: {self.cached_scores} cached scores, {self.cached_features} "
+            f"cached encodings, {self.encoded} encoded snippets"
+        )
+
+    def close(self) -> None:
+        """
+        Closes the database.
+        :return: None
+        """
+        self._connection.close()
+
+    def _select(self, query: str, keys: list[str], params: tuple = ()) -> dict:
+        """
+        Runs a query selecting the snippet keys and a value in chunks of keys.
+        :param query: The query with a placeholder {} for the list of keys.
+        :param keys: The snippet keys.
+        :param params: The parameters of the query before the keys.
+        :return: The values by snippet key.
+        """
+        values = {}
+        for start in range(0, len(keys), MAX_QUERY_KEYS):
+            chunk = keys[start : start + MAX_QUERY_KEYS]
+            placeholders = ", ".join("?" * len(chunk))
+            values.update(
+                self._connection.execute(query.format(placeholders), (*params, *chunk))
+            )
+        return values
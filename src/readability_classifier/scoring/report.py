@@ -0,0 +1,324 @@
+import csv
+import json
+import logging
+import os
+from collections.abc import Iterable
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, fields
+from enum import Enum
+from pathlib import Path
+from typing import TextIO
+
+from src.readability_classifier.encoders.dataset_encoder import decode_score
+from src.readability_classifier.scoring.aggregation import PathTree
+from src.readability_classifier.scoring.extraction import (
+    MethodSnippet,
+    count_lines_of_code,
+)
+
+
+class ScoreKind(Enum):
+    """
+    Enum for the kinds of score records.
+    """
+
+    METHOD = "method"
+    CLASS = "class"  # Mean of the methods of the class in a file
+    FILE = "file"  # Mean of the methods of the file, if methods are scored
+    DIRECTORY = "directory"  # Mean of the files directly in the directory
+    TOTAL = "total"  # Mean of all files
+
+    def __str__(self) -> str:
+        return self.value
+
+
+@dataclass(frozen=True)
+class ScoreRecord:
+    """
+    Data class for the score of a method or file, or the aggregated score of multiple
+    files. Methods and classes are identified by their path and name.
+    """
+
+    kind: str
+    path: str
+    name: str  # Class or qualified method name
+    start_line: int  # Span of a method, else 0
+    end_line: int
+    files: int
+    methods: int  # Number of scored methods, 0 if files are scored
+    score: float
+    readable: bool
+
+
+class ScoreWriter:
+    """
+    Writes score records incrementally as JSON lines or CSV, depending on the suffix
+    of the output file. Each record is flushed, so the output can be followed while
+    a large repository is scored.
+    """
+
+    def __init__(self, output: Path):
+        """
+        Opens the output file.
+        :param output: The path of the .jsonl or .csv file.
+        """
+        self.output = Path(output)
+        self.csv = self.output.suffix.lower() == ".csv"
+        os.makedirs(self.output.parent, exist_ok=True)
+
+        # The file is closed if the header cannot be written
+        with ExitStack() as stack:
+            self._file: TextIO = stack.enter_context(
+                open(self.output, "w", encoding="utf-8", newline="")
+            )
+            if self.csv:
+                self._csv_writer = csv.DictWriter(
+                    self._file, fieldnames=[field.name for field in fields(ScoreRecord)]
+                )
+                self._csv_writer.writeheader()
+            stack.pop_all()
+
+    def __enter__(self) -> "ScoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write(self, record: ScoreRecord) -> None:
+        """
+        Writes a record.
+        :param record: The record.
+        :return: None
+        """
+        if self.csv:
+            self._csv_writer.writerow(asdict(record))
+        else:
+            self._file.write(json.dumps(asdict(record)) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Closes the output file.
+        :return: None
+        """
+        self._file.close()
+
+
+class ScoreAggregator:
+    """
+    Aggregates the scores of files (or of their methods) per class, file, directory
+    and overall while they are streamed. The files of a directory and the methods of
+    a file are expected to be scored one after another (as listed by
+    find_source_files and extract_files), so only the running file and directory are
+    kept in memory and their records are emitted as soon as the next one starts.
+    For rollups over all directory levels, the files are also added to a path tree.
+    """
+
+    def __init__(self, writer: ScoreWriter = None, tree: PathTree = None):
+        """
+        Initializes the aggregator.
+        :param writer: The writer of the records. If None, they are only logged.
+        :param tree: The path tree receiving the files. If None, no tree is built.
+        """
+        self.writer = writer
+        self.tree = tree
+        self.total = _Mean()
+        self._directory: str | None = None
+        self._directory_mean = _Mean()
+        self._file: str | None = None
+        self._file_mean = _Mean()
+        self._file_lines = 0
+        self._class_means: dict[str, _Mean] = {}
+
+    def add(self, name: str, score: float, lines: int = 1) -> None:
+        """
+        Adds the score of a file.
+        :param name: The path of the file.
+        :param score: The predicted score.
+        :param lines: The lines of code of the file.
+        :return: None
+        """
+        self._add_file(name, score, 0, lines)
+
+    def add_all(
+        self, names: Iterable[str], scores: Iterable[float], lines: Iterable[int]
+    ) -> None:
+        """
+        Adds the scores of multiple files.
+        :param names: The paths of the files.
+        :param scores: The predicted scores in the order of the files.
+        :param lines: The lines of code of the files.
+        :return: None
+        """
+        for name, score, file_lines in zip(names, scores, lines, strict=True):
+            self.add(name, float(score), file_lines)
+
+    def add_method(self, method: MethodSnippet, score: float) -> None:
+        """
+        Adds the score of a method. The file is added with the mean score of its
+        methods as soon as the methods of the next file are added.
+        :param method: The method.
+        :param score: The predicted score.
+        :return: None
+        """
+        if method.path != self._file:
+            self._flush_file()
+            self._file = method.path
+
+        self._emit(
+            ScoreKind.METHOD,
+            method.path,
+            score,
+            name=method.qualified_name,
+            start_line=method.start_line,
+            end_line=method.end_line,
+            methods=1,
+        )
+        self._class_means.setdefault(method.class_name, _Mean()).add(score)
+        self._file_mean.add(score)
+        self._file_lines += count_lines_of_code(method.code)
+
+    def finish(self) -> tuple[str, float]:
+        """
+        Emits the records of the last file, the last directory and of all files.
+        :return: The prediction of all files as binary and as float.
+        """
+        self._flush_file()
+        if self.total.count == 0:
+            raise ValueError("No files were scored.")
+        self._flush_directory()
+        self._emit(
+            ScoreKind.TOTAL,
+            "",
+            self.total.mean,
+            files=self.total.count,
+            methods=self.total.methods,
+        )
+        return decode_score(self.total.mean)
+
+    def _add_file(self, name: str, score: float, methods: int, lines: int) -> None:
+        """
+        Adds the (mean) score of a file to its directory, the total and the tree.
+        :param name: The path of the file.
+        :param score: The (mean) score of the file.
+        :param methods: The number of scored methods of the file.
+        :param lines: The lines of code of the file (or of its methods).
+        :return: None
+        """
+        directory = os.path.dirname(name)
+        if directory != self._directory:
+            self._flush_directory()
+            self._directory = directory
+
+        self._emit(ScoreKind.FILE, name, score, methods=methods)
+        self._directory_mean.add(score, methods)
+        self.total.add(score, methods)
+        if self.tree is not None:
+            self.tree.add(name, score, lines)
+
+    def _flush_file(self) -> None:
+        """
+        Emits the records of the classes of the running file and adds the file, if
+        any methods were scored.
+        :return: None
+        """
+        if self._file_mean.count > 0:
+            for class_name, mean in self._class_means.items():
+                if class_name:
+                    self._emit(
+                        ScoreKind.CLASS,
+                        self._file,
+                        mean.mean,
+                        name=class_name,
+                        methods=mean.count,
+                    )
+            self._add_file(
+                self._file,
+                self._file_mean.mean,
+                self._file_mean.count,
+                self._file_lines,
+            )
+        self._file_mean = _Mean()
+        self._file_lines = 0
+        self._class_means = {}
+
+    def _flush_directory(self) -> None:
+        """
+        Emits the record of the running directory, if any.
+        :return: None
+        """
+        if self._directory_mean.count > 0:
+            self._emit(
+                ScoreKind.DIRECTORY,
+                self._directory,
+                self._directory_mean.mean,
+                files=self._directory_mean.count,
+                methods=self._directory_mean.methods,
+            )
+        self._directory_mean = _Mean()
+
+    def _emit(
+        self,
+        kind: ScoreKind,
+        path: str,
+        score: float,
+        name: str = "",
+        start_line: int = 0,
+        end_line: int = 0,
+        files: int = 1,
+        methods: int = 0,
+    ) -> None:
+        """
+        Logs and writes a record.
+        :param kind: The kind of the record.
+        :param path: The path of the file or directory.
+        :param score: The (mean) score.
+        :param name: The class or qualified method name.
+        :param start_line: The first line of a method.
+        :param end_line: The last line of a method.
+        :param files: The number of aggregated files.
+        :param methods: The number of aggregated methods.
+        :return: None
+        """
+        label = {
+            ScoreKind.METHOD: f"method {path}:{start_line} {name}",
+            ScoreKind.CLASS: f"class {path} {name}",
+            ScoreKind.FILE: f"file {path}",
+            ScoreKind.DIRECTORY: f"directory {path}",
+            ScoreKind.TOTAL: "whole input",
+        }[kind]
+        logging.info(f"Readability of {label}: {decode_score(score)}")
+        if self.writer is not None:
+            self.writer.write(
+                ScoreRecord(
+                    kind=str(kind),
+                    path=path,
+                    name=name,
+                    start_line=start_line,
+                    end_line=end_line,
+                    files=files,
+                    methods=methods,
+                    score=score,
+                    readable=score > 0.5,
+                )
+            )
+
+
+class _Mean:
+    """
+    The running mean of scores, counting the methods behind the scores.
+    """
+
+    def __init__(self):
+        self.sum = 0.0
+        self.count = 0
+        self.methods = 0
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count
+
+    def add(self, score: float, methods: int = 0) -> None:
+        self.sum += score
+        self.count += 1
+        self.methods += methods
@@ -0,0 +1,94 @@
+from collections.abc import Callable, Iterable, Sequence
+
+from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
+from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+from src.readability_classifier.scoring.extraction import (
+    DEFAULT_PARSE_WORKERS,
+    count_lines_of_code,
+    extract_files,
+)
+from src.readability_classifier.scoring.files import (
+    DEFAULT_CHUNK_SIZE,
+    chunked,
+    read_snippets,
+)
+from src.readability_classifier.scoring.index import ScoreIndex
+from src.readability_classifier.scoring.report import ScoreAggregator
+
+Scorer = Callable[[ReadabilityDataset], Sequence[float]]
+
+
+def _score_chunk(
+    samples: list[dict], score: Scorer, encoder: DatasetEncoder, index: ScoreIndex
+) -> Sequence[float]:
+    """
+    Scores a chunk of snippets, serving unchanged snippets from the index if any.
+    :param samples: The unencoded snippets with their names.
+    :param score: The function scoring encoded snippets.
+    :param encoder: The encoder.
+    :param index: The score index or None.
+    :return: The scores in the order of the snippets.
+    """
+    if index is None:
+        return score(encoder.encode_dataset(samples))
+    return index.get_or_score(samples, encoder.encode_dataset, score)
+
+
+def score_files(
+    files: Iterable[str],
+    score: Scorer,
+    aggregator: ScoreAggregator,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoder: DatasetEncoder = None,
+    index: ScoreIndex = None,
+) -> tuple[str, float]:
+    """
+    Streams the files through encoding and prediction in chunks, so that only one
+    chunk of snippets and encodings is held in memory at a time.
+    :param files: The paths of the files, e.g. from find_source_files.
+    :param score: The function scoring encoded snippets, e.g. from load_scorer.
+    :param aggregator: The aggregator receiving the scores.
+    :param chunk_size: The number of files encoded and predicted at once.
+    :param encoder: The encoder. If None, a DatasetEncoder is created.
+    :param index: The index of known scores. If None, all files are scored.
+    :return: The prediction of all files as binary and as float.
+    """
+    encoder = encoder or DatasetEncoder()
+    for chunk in chunked(read_snippets(files), chunk_size):
+        names = [sample["name"] for sample in chunk]
+        lines = [count_lines_of_code(sample["code_snippet"]) for sample in chunk]
+        aggregator.add_all(names, _score_chunk(chunk, score, encoder, index), lines)
+    return aggregator.finish()
+
+
+def score_methods(
+    files: Iterable[str],
+    score: Scorer,
+    aggregator: ScoreAggregator,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = DEFAULT_PARSE_WORKERS,
+    encoder: DatasetEncoder = None,
+    index: ScoreIndex = None,
+) -> tuple[str, float]:
+    """
+    Extracts the methods of the files in parallel and streams them through encoding
+    and prediction in chunks. The scores are rolled up per class, file and directory
+    by the aggregator.
+    :param files: The paths of the Java files, e.g. from find_source_files.
+    :param score: The function scoring encoded snippets, e.g. from load_scorer.
+    :param aggregator: The aggregator receiving the scores.
+    :param chunk_size: The number of methods encoded and predicted at once.
+    :param workers: The number of processes parsing the files.
+    :param encoder: The encoder. If None, a DatasetEncoder is created.
+    :param index: The index of known scores. If None, all methods are scored.
+    :return: The prediction of all files as binary and as float.
+    """
+    encoder = encoder or DatasetEncoder()
+    for methods in chunked(extract_files(files, workers), chunk_size):
+        samples = [
+            {"name": method.path, "code_snippet": method.code} for method in methods
+        ]
+        scores = _score_chunk(samples, score, encoder, index)
+        for method, method_score in zip(methods, scores, strict=True):
+            aggregator.add_method(method, float(method_score))
+    return aggregator.finish()
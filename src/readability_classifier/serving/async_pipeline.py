@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import os
+from asyncio.subprocess import DEVNULL, PIPE
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from torch import Tensor
+
+from src.readability_classifier.encoders.bert_encoder import _split_identifiers
+from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
+from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+from src.readability_classifier.encoders.image_encoder import (
+    DEFAULT_CSS,
+    _open_image_as_tensor,
+    code_to_styled_html,
+    postprocess_image,
+    render_command,
+)
+from src.readability_classifier.serving.predictor import load_scorer
+from src.readability_classifier.utils.defaults import DEFAULT_RENDER_CONCURRENCY
+
+
+class AsyncEncodingPipeline:
+    """
+    Encodes code snippets like the DatasetEncoder without blocking the event loop.
+    The images are rendered by wkhtmltoimage subprocesses that are awaited, while the
+    matrix and bert encoding as well as the highlighting and blur removal run in the
+    executor. The encoders are shared by all requests, as they keep no state between
+    calls.
+    """
+
+    def __init__(
+        self,
+        render_concurrency: int = DEFAULT_RENDER_CONCURRENCY,
+        executor: Executor = None,
+        width: int = 128,
+        height: int = 128,
+        css: str = DEFAULT_CSS,
+    ):
+        """
+        Initializes the pipeline.
+        :param render_concurrency: The maximum number of concurrent render processes.
+        :param executor: The executor of the cpu bound steps. If None, the default
+            executor of the event loop is used.
+        :param width: The width of the images.
+        :param height: The height of the images.
+        :param css: The css to use for styling the code.
+        """
+        self.encoder = DatasetEncoder()
+        self.executor = executor
+        self.width = width
+        self.height = height
+        self.css = css
+        self._render_slots = asyncio.Semaphore(max(1, render_concurrency))
+
+    async def encode(self, code_snippets: list[str]) -> ReadabilityDataset:
+        """
+        Encodes the code snippets as matrices, bert and images.
+        :param code_snippets: The code snippets.
+        :return: The encoded dataset.
+        """
+        loop = asyncio.get_running_loop()
+        unencoded_dataset = [{"code_snippet": snippet} for snippet in code_snippets]
+
+        # The bert encoder splits the identifiers of the samples in place, so it
+        # gets copies and the images are rendered from the split code like before
+        matrix_dataset = loop.run_in_executor(
+            self.executor,
+            self.encoder.matrix_encoder.encode_dataset,
+            unencoded_dataset,
+        )
+        bert_dataset = loop.run_in_executor(
+            self.executor,
+            self.encoder.bert_encoder.encode_dataset,
+            [dict(sample) for sample in unencoded_dataset],
+        )
+
+        with TemporaryDirectory(ignore_cleanup_errors=True) as out_dir:
+            images = asyncio.gather(
+                *(
+                    self._render(snippet, os.path.join(out_dir, f"{idx}.png"))
+                    for idx, snippet in enumerate(code_snippets)
+                )
+            )
+            matrix_dataset, bert_dataset, images = await asyncio.gather(
+                matrix_dataset, bert_dataset, images
+            )
+
+        image_dataset = ReadabilityDataset([{"image": image} for image in images])
+        return self.encoder.combine_encodings(
+            unencoded_dataset, matrix_dataset, bert_dataset, image_dataset
+        )
+
+    async def _render(self, code_snippet: str, output: str) -> Tensor:
+        """
+        Renders a code snippet as image and loads it as tensor.
+        :param code_snippet: The code snippet.
+        :param output: The path to save the image.
+        :return: The image as tensor.
+        """
+        loop = asyncio.get_running_loop()
+        html = await loop.run_in_executor(self.executor, self._highlight, code_snippet)
+
+        async with self._render_slots:
+            process = await asyncio.create_subprocess_exec(
+                *render_command(output, self.width, self.height),
+                stdin=PIPE,
+                stdout=DEVNULL,
+                stderr=PIPE,
+            )
+            _, stderr = await process.communicate(html.encode("utf-8"))
+
+        if process.returncode != 0:
+            raise OSError(
+                f"wkhtmltoimage exited with code {process.returncode}: "
+                f"{stderr.decode('utf-8', errors='replace')}"
+            )
+
+        return await loop.run_in_executor(self.executor, self._load_image, output)
+
+    def _highlight(self, code_snippet: str) -> str:
+        """
+        Highlights a code snippet as html, with the identifiers split like for bert.
+        :param code_snippet: The code snippet.
+        :return: The html with the css inlined.
+        """
+        return code_to_styled_html(_split_identifiers(code_snippet), self.css)
+
+    def _load_image(self, output: str) -> Tensor:
+        """
+        Removes the blur from a rendered image and loads it as tensor.
+        :param output: The path of the image.
+        :return: The image as tensor.
+        """
+        postprocess_image(output, self.css, self.width, self.height)
+        return _open_image_as_tensor(output, width=self.width, height=self.height)
+
+
+class AsyncSnippetPredictor:
+    """
+    Predicts the readability of raw code snippets on an asyncio event loop. The
+    snippets of concurrent requests are encoded concurrently, the model runs on a
+    single inference thread, as it is not thread-safe.
+    """
+
+    def __init__(
+        self,
+        model_path: Path,
+        keras: bool = True,
+        batch_size: int = None,
+        render_concurrency: int = DEFAULT_RENDER_CONCURRENCY,
+        encode_workers: int = None,
+    ):
+        """
+        Loads the model and the encoders.
+        :param model_path: The path of the model.
+        :param keras: Whether the model is a keras model (else a torch model).
+        :param batch_size: The batch size. If None, the default of the backend.
+        :param render_concurrency: The maximum number of concurrent render processes.
+        :param encode_workers: The number of encoding threads. If None, the default
+            of the ThreadPoolExecutor is used.
+        """
+        self.model_path = Path(model_path)
+        self._encode_executor = ThreadPoolExecutor(
+            encode_workers, thread_name_prefix="encode"
+        )
+        self._inference_executor = ThreadPoolExecutor(1, thread_name_prefix="inference")
+        self.pipeline = AsyncEncodingPipeline(
+            render_concurrency, executor=self._encode_executor
+        )
+        self._score = load_scorer(model_path, keras, batch_size)
+        logging.info(f"Async predictor ready with model {model_path}")
+
+    def __enter__(self) -> "AsyncSnippetPredictor":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    async def predict(self, code_snippets: list[str]) -> list[float]:
+        """
+        Predicts the readability of the code snippets as one batch.
+        :param code_snippets: The code snippets.
+        :return: The readability scores in the order of the snippets.
+        """
+        if not code_snippets:
+            return []
+
+        encoded = await self.pipeline.encode(code_snippets)
+        scores = await asyncio.get_running_loop().run_in_executor(
+            self._inference_executor, self._score, encoded
+        )
+        return [float(score) for score in scores]
+
+    def close(self) -> None:
+        """
+        Shuts the executors down.
+        :return: None
+        """
+        self._encode_executor.shutdown(cancel_futures=True)
+        self._inference_executor.shutdown(cancel_futures=True)
@@ -0,0 +1,262 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import Protocol
+
+from src.readability_classifier.serving.server import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    HEALTH_PATH,
+    MAX_REQUEST_BYTES,
+    PREDICT_PATH,
+    RequestError,
+    parse_snippets,
+    prediction_result,
+)
+
+MAX_HEADER_BYTES = 64 * 1024  # Larger request lines and headers are rejected
+
+
+class AsyncPredictor(Protocol):
+    """
+    Predicts the readability of raw code snippets without blocking the event loop,
+    e.g. an AsyncSnippetPredictor.
+    """
+
+    async def predict(self, code_snippets: list[str]) -> list[float]:
+        ...
+
+
+class AsyncPredictionServer:
+    """
+    A prediction server running on an asyncio event loop. It provides the same
+    endpoints as the threaded server, but a request only occupies a coroutine while
+    it waits for its prediction, so many requests can be in flight at once.
+    Connections are kept alive for HTTP/1.1 clients.
+    """
+
+    def __init__(self, predictor: AsyncPredictor):
+        """
+        Initializes the shared state.
+        :param predictor: The predictor.
+        """
+        self.predictor = predictor
+        self.start_time = time.monotonic()
+        self.num_requests = 0
+        self.num_snippets = 0
+        self.in_flight = 0  # Snippets currently being predicted
+
+    def health(self) -> dict:
+        """
+        Returns the status of the server.
+        :return: The status, uptime and number of served and pending snippets.
+        """
+        return {
+            "status": "ok",
+            "uptime": time.monotonic() - self.start_time,
+            "requests": self.num_requests,
+            "snippets": self.num_snippets,
+            "in_flight": self.in_flight,
+        }
+
+    async def respond(
+        self, method: str, path: str, body: bytes
+    ) -> tuple[HTTPStatus, dict]:
+        """
+        Handles a request:
+        GET /health returns the status of the server.
+        POST /predict returns the readability scores of the snippets in the body.
+        :param method: The method of the request.
+        :param path: The path of the request.
+        :param body: The body of the request.
+        :return: The status and content of the response.
+        """
+        if method == "GET":
+            if path != HEALTH_PATH:
+                return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+            return HTTPStatus.OK, self.health()
+        if method != "POST":
+            return HTTPStatus.NOT_IMPLEMENTED, {"error": f"Unsupported method {method}"}
+        if path != PREDICT_PATH:
+            return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+
+        try:
+            snippets = parse_snippets(body)
+        except (RequestError, UnicodeDecodeError) as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+
+        self.in_flight += len(snippets)
+        try:
+            scores = await self.predictor.predict(snippets)
+        except Exception as e:
+            logging.exception("Prediction failed")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+        finally:
+            self.in_flight -= len(snippets)
+
+        self.num_requests += 1
+        self.num_snippets += len(snippets)
+        return HTTPStatus.OK, prediction_result(scores)
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serves the requests of a connection until the client closes it or asks to.
+        :param reader: The reader of the connection.
+        :param writer: The writer of the connection.
+        :return: None
+        """
+        try:
+            keep_alive = True
+            while keep_alive:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = await self._handle_request(request_line, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # ValueError: A line exceeds the limit of the reader
+            logging.debug("Connection closed")
+        finally:
+            writer.close()
+
+    async def _handle_request(
+        self,
+        request_line: bytes,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> bool:
+        """
+        Reads a request, handles it and writes the response.
+        :param request_line: The first line of the request.
+        :param reader: The reader of the connection.
+        :param writer: The writer of the connection.
+        :return: Whether the connection is kept alive.
+        """
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3:
+            await _write_json(writer, HTTPStatus.BAD_REQUEST, {"error": "Bad request"})
+            return False
+        method, path, version = parts
+
+        # Read the headers
+        headers = {}
+        size = len(request_line)
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            size += len(line)
+            if size > MAX_HEADER_BYTES:
+                await _write_json(
+                    writer,
+                    HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                    {"error": "Headers too large"},
+                )
+                return False
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = version == "HTTP/1.1" and connection != "close"
+        keep_alive = keep_alive or connection == "keep-alive"
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            await _write_json(
+                writer, HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"}
+            )
+            return False
+        if length > MAX_REQUEST_BYTES:
+            await _write_json(
+                writer,
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                {"error": "Request too large"},
+            )
+            return False
+
+        body = await reader.readexactly(length)
+        status, content = await self.respond(method, path, body)
+        logging.debug(f'"{method} {path} {version}" {status.value}')
+        await _write_json(writer, status, content, keep_alive)
+        return keep_alive
+
+
+async def _write_json(
+    writer: asyncio.StreamWriter,
+    status: HTTPStatus,
+    content: dict,
+    keep_alive: bool = False,
+) -> None:
+    """
+    Writes a json response.
+    :param writer: The writer of the connection.
+    :param status: The status of the response.
+    :param content: The content of the response.
+    :param keep_alive: Whether the connection is kept alive.
+    :return: None
+    """
+    body = json.dumps(content).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+async def start_async_server(
+    predictor: AsyncPredictor,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Path = None,
+) -> asyncio.Server:
+    """
+    Starts the asyncio prediction server. A stale socket file is removed first.
+    :param predictor: The predictor.
+    :param host: The host to listen on.
+    :param port: The port to listen on (0 for any free port).
+    :param socket_path: The unix socket to listen on instead of the tcp port.
+    :return: The started server.
+    """
+    server = AsyncPredictionServer(predictor)
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return await asyncio.start_unix_server(
+            server.handle_connection, path=str(socket_path)
+        )
+    return await asyncio.start_server(server.handle_connection, host, port)
+
+
+async def serve_async(
+    predictor: AsyncPredictor,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Path = None,
+) -> None:
+    """
+    Serves predictions on the running event loop until it is cancelled.
+    :param predictor: The predictor.
+    :param host: The host to listen on.
+    :param port: The port to listen on.
+    :param socket_path: The unix socket to listen on instead of the tcp port.
+    :return: None
+    """
+    server = await start_async_server(predictor, host, port, socket_path)
+    async with server:
+        port = server.sockets[0].getsockname()[1] if socket_path is None else None
+        address = socket_path or f"http://{host}:{port}"
+        logging.info(f"Serving predictions asynchronously on {address}")
+        try:
+            await server.serve_forever()
+        finally:
+            if socket_path is not None and os.path.exists(socket_path):
+                os.remove(socket_path)
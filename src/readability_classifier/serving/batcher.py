@@ -0,0 +1,204 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+
+from src.readability_classifier.serving.server import Predictor
+
+DEFAULT_MAX_BATCH_SIZE = 32  # Snippets per forward pass
+DEFAULT_MAX_WAIT_MS = 5.0  # Time the first request of a batch waits for others
+
+
+@dataclass
+class BatchingMetrics:
+    """
+    Data class for the metrics of the micro-batch scheduler.
+    """
+
+    queue_depth: int = 0  # Snippets currently waiting
+    max_queue_depth: int = 0
+    requests: int = 0
+    batches: int = 0
+    snippets: int = 0
+    max_batch_size: int = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        """
+        The mean number of snippets per batch.
+        """
+        return self.snippets / self.batches if self.batches > 0 else 0.0
+
+    @property
+    def fill_ratio(self) -> float:
+        """
+        The mean fill ratio of the batches.
+        """
+        return self.mean_batch_size / self.max_batch_size
+
+    def to_dict(self) -> dict:
+        """
+        Convert to a dict including the derived metrics.
+        :return: The metrics.
+        """
+        return {
+            **asdict(self),
+            "mean_batch_size": self.mean_batch_size,
+            "fill_ratio": self.fill_ratio,
+        }
+
+
+@dataclass
+class _Request:
+    """
+    The snippets of a pending request, the future of their scores and the time
+    (time.monotonic) the request was submitted at.
+    """
+
+    snippets: list[str]
+    future: Future
+    submitted: float
+
+
+class MicroBatchScheduler:
+    """
+    Collects the snippets of concurrent prediction requests into batches, so that
+    single snippet requests share one encoding and forward pass. A batch is run as
+    soon as it holds max_batch_size snippets or its first request waited max_wait_ms.
+    Requests are never split, a request larger than max_batch_size forms its own
+    batch. The scheduler is itself a predictor and can be used by the server.
+    """
+
+    def __init__(
+        self,
+        predictor: Predictor,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ):
+        """
+        Starts the scheduler thread.
+        :param predictor: The predictor running the batches.
+        :param max_batch_size: The maximum number of snippets of a batch.
+        :param max_wait_ms: The maximum time a request waits for other requests.
+        """
+        self.predictor = predictor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._pending: deque[_Request] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._metrics = BatchingMetrics(max_batch_size=self.max_batch_size)
+
+        self._thread = threading.Thread(
+            target=self._run, name="micro-batch-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "MicroBatchScheduler":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def metrics(self) -> dict:
+        """
+        A snapshot of the batching metrics.
+        """
+        with self._condition:
+            return self._metrics.to_dict()
+
+    def submit(self, code_snippets: list[str]) -> Future:
+        """
+        Queues the snippets of a request.
+        :param code_snippets: The code snippets.
+        :return: The future of the readability scores in the order of the snippets.
+        """
+        request = _Request(list(code_snippets), Future(), time.monotonic())
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The scheduler is closed.")
+            self._pending.append(request)
+            self._metrics.requests += 1
+            self._metrics.queue_depth += len(request.snippets)
+            self._metrics.max_queue_depth = max(
+                self._metrics.max_queue_depth, self._metrics.queue_depth
+            )
+            self._condition.notify()
+        return request.future
+
+    def predict(self, code_snippets: list[str]) -> list[float]:
+        """
+        Predicts the readability of the snippets together with concurrent requests.
+        :param code_snippets: The code snippets.
+        :return: The readability scores in the order of the snippets.
+        """
+        if not code_snippets:
+            return []
+        return self.submit(code_snippets).result()
+
+    def close(self) -> None:
+        """
+        Runs the pending requests and stops the scheduler thread.
+        :return: None
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _next_batch(self) -> list[_Request]:
+        """
+        Waits for the next batch of requests.
+        :return: The requests of the batch or an empty list if the scheduler is closed.
+        """
+        with self._condition:
+            while not self._pending and not self._closed:
+                self._condition.wait()
+            if not self._pending:
+                return []
+
+            # Wait for further requests until the batch is full or the first request
+            # waited max_wait, including the time it queued behind the previous batch
+            batch = [self._pending.popleft()]
+            deadline = batch[0].submitted + self.max_wait
+            size = len(batch[0].snippets)
+            while size < self.max_batch_size:
+                if self._pending:
+                    if size + len(self._pending[0].snippets) > self.max_batch_size:
+                        break
+                    batch.append(self._pending.popleft())
+                    size += len(batch[-1].snippets)
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    break
+                self._condition.wait(remaining)
+
+            self._metrics.queue_depth -= size
+            self._metrics.batches += 1
+            self._metrics.snippets += size
+            return batch
+
+    def _run(self) -> None:
+        """
+        Runs the batches and fans the scores out to the requests.
+        :return: None
+        """
+        while batch := self._next_batch():
+            snippets = [snippet for request in batch for snippet in request.snippets]
+            try:
+                scores = self.predictor.predict(snippets)
+            except Exception as e:
+                logging.exception(f"Prediction of a batch of {len(snippets)} failed")
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            offset = 0
+            for request in batch:
+                end = offset + len(request.snippets)
+                request.future.set_result(list(scores[offset:end]))
+                offset = end
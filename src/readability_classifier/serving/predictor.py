@@ -0,0 +1,140 @@
+import logging
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
+from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+from src.readability_classifier.onx.predictor import (
+    DEFAULT_BATCH_SIZE as ONNX_BATCH_SIZE,
+)
+from src.readability_classifier.onx.predictor import OnnxPredictor, is_onnx_model
+from src.readability_classifier.utils.defaults import DEFAULT_MODEL_BATCH_SIZE
+
+Scorer = Callable[[ReadabilityDataset], np.ndarray]
+
+
+def _load_keras_scorer(model_path: Path, batch_size: int = None) -> Scorer:
+    """
+    Builds the keras towards model and loads its weights once. Keras is only imported
+    here, so that ONNX models are served without tensorflow.
+    :param model_path: The path of the weights.
+    :param batch_size: The batch size. If None, the default of the keras backend.
+    :return: The function scoring encoded snippets.
+    """
+    from keras.src.saving import custom_object_scope
+
+    from src.readability_classifier.keas.classifier import (
+        DEFAULT_BATCH_SIZE,
+        Classifier,
+        convert_to_towards_inputs_without_score,
+    )
+    from src.readability_classifier.keas.model import (
+        BertEmbedding,
+        create_towards_model,
+    )
+
+    batch_size = batch_size or DEFAULT_BATCH_SIZE
+    model = create_towards_model()
+    with custom_object_scope({"BertEmbedding": BertEmbedding}):
+        model.load_weights(model_path)
+
+    def score(encoded: ReadabilityDataset) -> np.ndarray:
+        towards_inputs = ReadabilityDataset(
+            convert_to_towards_inputs_without_score(encoded)
+        )
+        predictions = model.predict(
+            x=Classifier._dataset_to_input(towards_inputs),
+            batch_size=batch_size,
+            verbose=0,
+        )
+        return predictions.reshape(-1)
+
+    return score
+
+
+def _load_torch_scorer(model_path: Path, batch_size: int = None) -> Scorer:
+    """
+    Loads the (exported) torch towards model once. The torch models are only
+    imported here, so that ONNX models are served without them.
+    :param model_path: The path of the model.
+    :param batch_size: The batch size. If None, the default of the torch backend.
+    :return: The function scoring encoded snippets.
+    """
+    from src.readability_classifier.toch.export import (
+        ExportedPredictor,
+        is_exported_model,
+    )
+    from src.readability_classifier.toch.towards_classifier import TowardsClassifier
+
+    batch_size = batch_size or DEFAULT_MODEL_BATCH_SIZE
+    if is_exported_model(model_path):
+        predictor = ExportedPredictor(model_path)
+        return lambda encoded: predictor.predict(encoded, batch_size)
+
+    classifier = TowardsClassifier(model_path=model_path)
+    return lambda encoded: classifier.predict_encoded(encoded, batch_size)
+
+
+def load_scorer(
+    model_path: Path,
+    keras: bool = True,
+    batch_size: int = None,
+    intra_op_threads: int = 0,
+    inter_op_threads: int = 0,
+) -> Scorer:
+    """
+    Loads the model once and returns a function scoring encoded snippets. ONNX models
+    are run with onnxruntime, other models with the keras or the torch backend.
+    :param model_path: The path of the model.
+    :param keras: Whether the model is a keras model (else a torch model).
+    :param batch_size: The batch size. If None, the default of the backend.
+    :param intra_op_threads: The threads used within an operator (ONNX only).
+    :param inter_op_threads: The threads running operators in parallel (ONNX only).
+    :return: The function scoring encoded snippets.
+    """
+    if is_onnx_model(model_path):
+        predictor = OnnxPredictor(model_path, intra_op_threads, inter_op_threads)
+        batch_size = batch_size or ONNX_BATCH_SIZE
+        return lambda encoded: predictor.predict(encoded, batch_size)
+    if keras:
+        return _load_keras_scorer(model_path, batch_size)
+    return _load_torch_scorer(model_path, batch_size)
+
+
+class SnippetPredictor:
+    """
+    Predicts the readability of raw code snippets with a model and encoders that are
+    loaded once and kept warm, e.g. by the prediction server. The predictions are
+    serialized, as neither the encoders nor the models are thread-safe.
+    """
+
+    def __init__(self, model_path: Path, keras: bool = True, batch_size: int = None):
+        """
+        Loads the model and the encoders.
+        :param model_path: The path of the model.
+        :param keras: Whether the model is a keras model (else a torch model).
+        :param batch_size: The batch size. If None, the default of the backend.
+        """
+        self.model_path = Path(model_path)
+        self.encoder = DatasetEncoder()
+        self._score = load_scorer(model_path, keras, batch_size)
+        self._lock = threading.Lock()
+        logging.info(f"Predictor ready with model {model_path}")
+
+    def predict(self, code_snippets: list[str]) -> list[float]:
+        """
+        Predicts the readability of the code snippets as one batch.
+        :param code_snippets: The code snippets.
+        :return: The readability scores in the order of the snippets.
+        """
+        if not code_snippets:
+            return []
+
+        with self._lock:
+            encoded = self.encoder.encode_dataset(
+                [{"code_snippet": code_snippet} for code_snippet in code_snippets]
+            )
+            return [float(score) for score in self._score(encoded)]
@@ -0,0 +1,244 @@
+import json
+import logging
+import os
+import socketserver
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Protocol
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_REQUEST_BYTES = 10 * 1024 * 1024  # Larger requests are rejected
+HEALTH_PATH = "/health"
+PREDICT_PATH = "/predict"
+
+
+class Predictor(Protocol):
+    """
+    Predicts the readability of raw code snippets, e.g. a SnippetPredictor.
+    """
+
+    def predict(self, code_snippets: list[str]) -> list[float]:
+        ...
+
+
+class RequestError(Exception):
+    """
+    Exception is thrown whenever a request is invalid.
+    """
+
+
+def parse_snippets(body: bytes) -> list[str]:
+    """
+    Parses the snippets of a prediction request. The body is either a json object
+    with a list of "snippets" or a single "snippet", or the plain Java code of one
+    snippet.
+    :param body: The request body.
+    :return: The code snippets.
+    """
+    text = body.decode("utf-8")
+    try:
+        content = json.loads(text)
+    except json.JSONDecodeError:
+        return [text]
+
+    if isinstance(content, dict) and isinstance(content.get("snippet"), str):
+        return [content["snippet"]]
+    if isinstance(content, dict) and isinstance(content.get("snippets"), list):
+        snippets = content["snippets"]
+        if all(isinstance(snippet, str) for snippet in snippets):
+            return snippets
+    raise RequestError('Expected {"snippet": str} or {"snippets": [str, ...]}.')
+
+
+def prediction_result(scores: list[float]) -> dict:
+    """
+    Returns the response content of a prediction request.
+    :param scores: The readability scores.
+    :return: The scores and whether each snippet is readable.
+    """
+    return {
+        "scores": scores,
+        "readable": [score > 0.5 for score in scores],
+    }
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """
+    Handles the requests of the prediction server:
+    GET /health returns the status of the server.
+    POST /predict returns the readability scores of the snippets in the body.
+    """
+
+    server: "PredictionServerMixin"
+
+    def do_GET(self) -> None:
+        """
+        Handles a GET request.
+        :return: None
+        """
+        if self.path != HEALTH_PATH:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+        health = {
+            "status": "ok",
+            "uptime": time.monotonic() - self.server.start_time,
+            "requests": self.server.num_requests,
+            "snippets": self.server.num_snippets,
+        }
+
+        # Metrics of the predictor, e.g. of the micro-batch scheduler
+        metrics = getattr(self.server.predictor, "metrics", None)
+        if metrics is not None:
+            health["batching"] = metrics
+        self._send_json(HTTPStatus.OK, health)
+
+    def do_POST(self) -> None:
+        """
+        Handles a POST request.
+        :return: None
+        """
+        if self.path != PREDICT_PATH:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        if length > MAX_REQUEST_BYTES:
+            self._send_json(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request too large"}
+            )
+            return
+
+        try:
+            snippets = parse_snippets(self.rfile.read(length))
+        except (RequestError, UnicodeDecodeError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+
+        try:
+            scores = self.server.predictor.predict(snippets)
+        except Exception as e:
+            logging.exception("Prediction failed")
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+            return
+
+        self.server.count_request(len(snippets))
+        self._send_json(HTTPStatus.OK, prediction_result(scores))
+
+    def _send_json(self, status: HTTPStatus, content: dict) -> None:
+        """
+        Sends a json response.
+        :param status: The status of the response.
+        :param content: The content of the response.
+        :return: None
+        """
+        body = json.dumps(content).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """
+        Logs the requests with the logging module instead of stderr. The client
+        address is omitted, as it is empty for unix sockets.
+        """
+        logging.debug(format % args)
+
+
+class PredictionServerMixin:
+    """
+    Holds the warm predictor and the stats shared by the request handlers.
+    """
+
+    def init_prediction(self, predictor: Predictor) -> None:
+        """
+        Initializes the shared state.
+        :param predictor: The predictor.
+        :return: None
+        """
+        self.predictor = predictor
+        self.start_time = time.monotonic()
+        self.num_requests = 0
+        self.num_snippets = 0
+        self._stats_lock = threading.Lock()
+
+    def count_request(self, num_snippets: int) -> None:
+        """
+        Counts a successful prediction request.
+        :param num_snippets: The number of snippets of the request.
+        :return: None
+        """
+        with self._stats_lock:
+            self.num_requests += 1
+            self.num_snippets += num_snippets
+
+
+class TcpPredictionServer(PredictionServerMixin, ThreadingHTTPServer):
+    """
+    A prediction server listening on a tcp port.
+    """
+
+
+class UnixPredictionServer(
+    PredictionServerMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    """
+    A prediction server listening on a unix socket.
+    """
+
+    daemon_threads = True
+
+
+def create_server(
+    predictor: Predictor,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Path = None,
+) -> TcpPredictionServer | UnixPredictionServer:
+    """
+    Creates the prediction server. A stale socket file is removed first.
+    :param predictor: The predictor.
+    :param host: The host to listen on.
+    :param port: The port to listen on (0 for any free port).
+    :param socket_path: The unix socket to listen on instead of the tcp port.
+    :return: The server.
+    """
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixPredictionServer(str(socket_path), PredictionHandler)
+    else:
+        server = TcpPredictionServer((host, port), PredictionHandler)
+    server.init_prediction(predictor)
+    return server
+
+
+def serve(
+    predictor: Predictor,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Path = None,
+) -> None:
+    """
+    Serves predictions until the process is interrupted.
+    :param predictor: The predictor.
+    :param host: The host to listen on.
+    :param port: The port to listen on.
+    :param socket_path: The unix socket to listen on instead of the tcp port.
+    :return: None
+    """
+    with create_server(predictor, host, port, socket_path) as server:
+        address = socket_path or f"http://{host}:{server.server_address[1]}"
+        logging.info(f"Serving predictions on {address}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logging.info("Server stopped")
+        finally:
+            if socket_path is not None and os.path.exists(socket_path):
+                os.remove(socket_path)
@@ -5,28 +5,41 @@ from abc import ABC, abstractmethod
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from time import time
 
 import numpy as np
 import torch
-from sklearn.metrics import (
-    accuracy_score,
-    f1_score,
-    matthews_corrcoef,
-    precision_score,
-    recall_score,
-    roc_auc_score,
-)
 from torch import Tensor, nn
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, Dataset
 
 from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
 from src.readability_classifier.encoders.dataset_utils import (
+    MemoryMappedDataset,
+    PackedBert,
     ReadabilityDataset,
     dataset_to_dataloader,
+    k_fold_indices,
     split_k_fold,
 )
-from src.readability_classifier.utils.config import DEFAULT_MODEL_BATCH_SIZE, ModelInput
+from src.readability_classifier.evaluation.metrics import ConfusionMatrix
+from src.readability_classifier.toch.checkpoint_writer import (
+    CheckpointWriter,
+    atomic_save,
+)
+from src.readability_classifier.toch.prefetcher import BatchPrefetcher
+from src.readability_classifier.utils.config import (
+    DEFAULT_KEEP_CHECKPOINTS,
+    DEFAULT_MODEL_BATCH_SIZE,
+    DEFAULT_NUM_WORKERS,
+    DEFAULT_PREFETCH_FACTOR,
+    ModelInput,
+)
+from src.readability_classifier.utils.fold_scheduler import (
+    FoldScheduler,
+    load_memmap_dataset,
+    save_memmap_dataset,
+)
 from src.readability_classifier.utils.utils import save_content_to_file
 
 
@@ -38,7 +51,7 @@ class EpochStats:
 
     epoch: int
     train_loss: float
-    test_loss: float
+    test_loss: float | None  # None if the epoch was not validated
 
     def to_json(self) -> str:
         """
@@ -58,6 +71,7 @@ class TrainStats:
     epoch_stats: list[EpochStats]
     start_time: int = int(time())
     end_time: int = int(time())
+    stopped_epoch: int | None = None  # Set if the training was stopped early
 
     def to_json(self) -> str:
         """
@@ -83,6 +97,25 @@ class EvaluationStats:
     auc: float
     mcc: float
 
+    @classmethod
+    def from_confusion_matrix(
+        cls, confusion_matrix: ConfusionMatrix
+    ) -> "EvaluationStats":
+        """
+        Calculates the evaluation stats of a confusion matrix.
+        :param confusion_matrix: The confusion matrix.
+        :return: The evaluation stats.
+        """
+        stats = confusion_matrix.to_stats()
+        return cls(
+            accuracy=stats["acc"],
+            precision=stats["precision"],
+            recall=stats["recall"],
+            f1=stats["f1"],
+            auc=stats["auc"],
+            mcc=stats["mcc"],
+        )
+
     def to_json(self) -> str:
         """
         Convert to json.
@@ -177,6 +210,40 @@ class KFoldStats:
         return json.dumps(asdict(self))
 
 
+def _train_fold(
+    classifier_cls: type["BaseClassifier"],
+    parameters: dict,
+    data_dir: Path,
+    train_index: np.ndarray,
+    val_index: np.ndarray,
+) -> EvaluationStats:
+    """
+    Trains and evaluates a fold in a worker process of the fold scheduler.
+    :param classifier_cls: The class of the classifier.
+    :param parameters: The keyword arguments to create the classifier with.
+    :param data_dir: The directory of the memory mapped training and test data.
+    :param train_index: The indices of the training samples of the fold.
+    :param val_index: The indices of the validation samples of the fold.
+    :return: The evaluation stats of the fold.
+    """
+    train_arrays = load_memmap_dataset(data_dir / "train")
+    test_arrays = load_memmap_dataset(data_dir / "test")
+
+    classifier = classifier_cls(**parameters)
+    classifier.train_loader = classifier.to_dataloader(
+        MemoryMappedDataset(train_arrays, train_index)
+    )
+    classifier.val_loader = classifier.to_dataloader(
+        MemoryMappedDataset(train_arrays, val_index), shuffle=False
+    )
+    classifier.test_loader = classifier.to_dataloader(
+        MemoryMappedDataset(test_arrays), shuffle=False
+    )
+
+    classifier.fit()
+    return classifier.evaluate()
+
+
 class BaseClassifier(ABC):
     def __init__(
         self,
@@ -192,6 +259,16 @@ class BaseClassifier(ABC):
         batch_size: int = DEFAULT_MODEL_BATCH_SIZE,
         num_epochs: int = 20,
         learning_rate: float = 0.0015,
+        num_workers: int = DEFAULT_NUM_WORKERS,
+        prefetch_factor: int = DEFAULT_PREFETCH_FACTOR,
+        pin_memory: bool | None = None,
+        persistent_workers: bool = True,
+        mixed_precision: bool = False,
+        accumulation_steps: int = 1,
+        keep_checkpoints: int | None = DEFAULT_KEEP_CHECKPOINTS,
+        patience: int | None = None,
+        min_delta: float = 0.0,
+        validate_every: int = 1,
     ):
         """
         Initializes the classifier.
@@ -206,6 +283,28 @@ class BaseClassifier(ABC):
         :param batch_size: The batch size.
         :param num_epochs: The number of epochs.
         :param learning_rate: The learning rate.
+        :param num_workers: The number of worker processes of the data loaders created
+            by the classifier, e.g. during k-fold cross validation.
+        :param prefetch_factor: The number of batches loaded in advance by each worker
+            of the data loaders created by the classifier.
+        :param pin_memory: Whether the data loaders created by the classifier copy the
+            batches into pinned memory. If None, memory is pinned whenever cuda is
+            available.
+        :param persistent_workers: Whether the workers of the data loaders created by
+            the classifier are kept alive between epochs.
+        :param mixed_precision: Whether to use automatic mixed precision. Uses float16
+            with gradient scaling on cuda and bfloat16 on the cpu.
+        :param accumulation_steps: The number of batches (micro-batches) whose gradients
+            are accumulated before each optimizer step. The effective batch size is
+            batch_size * accumulation_steps.
+        :param keep_checkpoints: The number of most recent epoch checkpoints to keep
+            during training besides the best model. If None, all are kept.
+        :param patience: The number of validations without improvement after which
+            the training is stopped early. If None, all epochs are trained.
+        :param min_delta: The minimum decrease of the validation loss that counts as
+            an improvement.
+        :param validate_every: Validate the model every n epochs. The last epoch is
+            always validated.
         """
         self.model = model
         self.criterion = criterion
@@ -220,15 +319,35 @@ class BaseClassifier(ABC):
         self.batch_size = batch_size
         self.num_epochs = num_epochs
         self.learning_rate = learning_rate
+        self.num_workers = num_workers
+        self.prefetch_factor = prefetch_factor
+        self.pin_memory = pin_memory
+        self.persistent_workers = persistent_workers
+        self.accumulation_steps = max(1, accumulation_steps)
+        self.keep_checkpoints = keep_checkpoints
+        self.patience = patience
+        self.min_delta = min_delta
+        self.validate_every = max(1, validate_every)
+        self.test_scores = None  # The predicted scores of the last evaluation
+        self._encoder = None  # The encoder of raw snippets, created on first use
 
         # Move model to device
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model.to(self.device)
 
-    def k_fold_cv(self, k: int = 10) -> KFoldStats:
+        # Set up automatic mixed precision
+        self.mixed_precision = mixed_precision
+        self.amp_dtype = torch.float16 if self.device.type == "cuda" else torch.bfloat16
+        self.scaler = torch.cuda.amp.GradScaler(
+            enabled=mixed_precision and self.device.type == "cuda"
+        )
+
+    def k_fold_cv(self, k: int = 10, fold_workers: int = 1) -> KFoldStats:
         """
         Performs k-fold cross validation.
         :param k: The number of folds.
+        :param fold_workers: The number of processes training folds in parallel. If 1,
+            the folds are trained one after another in this process.
         :return: All stats about the k-fold cross validation.
         """
         if self.train_dataset is None:
@@ -237,6 +356,36 @@ class BaseClassifier(ABC):
         if self.test_dataset is None:
             raise ValueError("No test data provided.")
 
+        if fold_workers > 1:
+            fold_stats = self._k_fold_cv_parallel(k, fold_workers)
+        else:
+            fold_stats = self._k_fold_cv_sequential(k)
+
+        # Log the k-fold stats
+        stats = KFoldStats(fold_stats)
+        logging.info(
+            f"Max Accuracy: {stats.max_accuracy:.4f}\n"
+            f"Max Precision: {stats.max_precision:.4f}\n"
+            f"Max Recall: {stats.max_recall:.4f}\n"
+            f"Max F1: {stats.max_f1:.4f}\n"
+            f"Max AUC: {stats.max_auc:.4f}\n"
+            f"Max MCC: {stats.max_mcc:.4f}\n"
+        )
+
+        # Save the k-fold stats
+        save_content_to_file(
+            stats.to_json(),
+            self.store_dir / Path("k_fold_stats.json"),
+        )
+
+        return stats
+
+    def _k_fold_cv_sequential(self, k: int) -> list[EvaluationStats]:
+        """
+        Trains and evaluates the folds one after another.
+        :param k: The number of folds.
+        :return: The evaluation stats of each fold.
+        """
         folds = split_k_fold(self.train_dataset, k_fold=k)
 
         fold_stats = []
@@ -246,19 +395,12 @@ class BaseClassifier(ABC):
             logging.info(f"Fold {idx + 1}/{k}")
 
             # Fit the model
-            train_loader = dataset_to_dataloader(
-                fold.train_set, batch_size=self.batch_size
-            )
-            val_loader = dataset_to_dataloader(fold.val_set, batch_size=self.batch_size)
-            self.train_loader = train_loader
-            self.val_loader = val_loader
+            self.train_loader = self.to_dataloader(fold.train_set)
+            self.val_loader = self.to_dataloader(fold.val_set, shuffle=False)
             _ = self.fit()
 
             # Evaluate the model
-            test_loader = dataset_to_dataloader(
-                self.test_dataset, batch_size=self.batch_size
-            )
-            self.test_loader = test_loader
+            self.test_loader = self.to_dataloader(self.test_dataset, shuffle=False)
             stats = self.evaluate()
             fold_stats.append(stats)
 
@@ -272,24 +414,61 @@ class BaseClassifier(ABC):
             )
             self.optimizer.load_state_dict(self.initial_optimizer_state_dict)
 
-        # Log the k-fold stats
-        stats = KFoldStats(fold_stats)
-        logging.info(
-            f"Max Accuracy: {stats.max_accuracy:.4f}\n"
-            f"Max Precision: {stats.max_precision:.4f}\n"
-            f"Max Recall: {stats.max_recall:.4f}\n"
-            f"Max F1: {stats.max_f1:.4f}\n"
-            f"Max AUC: {stats.max_auc:.4f}\n"
-            f"Max MCC: {stats.max_mcc:.4f}\n"
-        )
+        return fold_stats
 
-        # Save the k-fold stats
-        save_content_to_file(
-            stats.to_json(),
-            self.store_dir / Path("k_fold_stats.json"),
-        )
+    def _k_fold_cv_parallel(self, k: int, fold_workers: int) -> list[EvaluationStats]:
+        """
+        Trains and evaluates the folds in parallel worker processes. The datasets are
+        shared with the workers via memory mapped files. Each fold is trained by a new
+        classifier of the same class, which stores its models in the subdirectory
+        fold_<index> of the store directory.
+        :param k: The number of folds.
+        :param fold_workers: The number of worker processes.
+        :return: The evaluation stats of each fold.
+        """
+        with TemporaryDirectory() as tmp_dir:
+            data_dir = Path(tmp_dir)
+            save_memmap_dataset(self.train_dataset.to_list(), data_dir / "train")
+            save_memmap_dataset(self.test_dataset.to_list(), data_dir / "test")
+
+            fold_args = []
+            folds = k_fold_indices(len(self.train_dataset), k)
+            for idx, (train_index, val_index) in enumerate(folds):
+                fold_dir = self.store_dir / Path(f"fold_{idx + 1}")
+                fold_dir.mkdir(parents=True, exist_ok=True)
+                fold_args.append(
+                    (
+                        self.__class__,
+                        self._fold_parameters(fold_dir),
+                        data_dir,
+                        train_index,
+                        val_index,
+                    )
+                )
 
-        return stats
+            return FoldScheduler(fold_workers).run(_train_fold, fold_args)
+
+    def _fold_parameters(self, store_dir: Path) -> dict:
+        """
+        Returns the parameters to create a classifier for a fold in a worker process.
+        The worker uses no data loading processes of its own.
+        :param store_dir: The store directory of the fold.
+        :return: The keyword arguments of the constructor.
+        """
+        return {
+            "store_dir": store_dir,
+            "batch_size": self.batch_size,
+            "num_epochs": self.num_epochs,
+            "learning_rate": self.learning_rate,
+            "num_workers": 0,
+            "pin_memory": self.pin_memory,
+            "mixed_precision": self.mixed_precision,
+            "accumulation_steps": self.accumulation_steps,
+            "keep_checkpoints": self.keep_checkpoints,
+            "patience": self.patience,
+            "min_delta": self.min_delta,
+            "validate_every": self.validate_every,
+        }
 
     # TODO: Allow alternative initialization via dataset instead of data loader
     def fit(self) -> TrainStats:
@@ -305,33 +484,62 @@ class BaseClassifier(ABC):
 
         train_stats = TrainStats(0, [])
         best_val_set = float("inf")
+        validations_without_improvement = 0
+
+        with CheckpointWriter(
+            self.store_dir / Path("best_model.pt"), keep_last=self.keep_checkpoints
+        ) as checkpoint_writer:
+            for epoch in range(self.num_epochs):
+                train_loss = self._fit_epoch()
+                validate = self._is_validation_epoch(epoch)
+                val_loss = self._val_epoch() if validate else None
+
+                # Update stats
+                epoch_stats = EpochStats(epoch + 1, train_loss, val_loss)
+                train_stats.epoch_stats.append(epoch_stats)
+
+                # Log the loss
+                val_log = (
+                    f"Val   loss: {val_loss:.4f}\n"
+                    f"Val   PPL:  {math.exp(val_loss):7.4f}"
+                    if validate
+                    else "Not validated"
+                )
+                logging.info(
+                    f"Epoch {epoch + 1:02}/{self.num_epochs:02}\n"
+                    f"Train loss: {train_loss:.4f}\n"
+                    f"Train PPL:  {math.exp(train_loss):7.4f}\n"
+                    f"{val_log}"
+                )
 
-        for epoch in range(self.num_epochs):
-            train_loss = self._fit_epoch()
-            val_loss = self._val_epoch()
-
-            # Update stats
-            epoch_stats = EpochStats(epoch + 1, train_loss, val_loss)
-            train_stats.epoch_stats.append(epoch_stats)
-
-            # Log the loss
-            logging.info(
-                f"Epoch {epoch + 1:02}/{self.num_epochs:02}\n"
-                f"Train loss: {train_loss:.4f}\n"
-                f"Train PPL:  {math.exp(train_loss):7.4f}\n"
-                f"Val   loss: {val_loss:.4f}\n"
-                f"Val   PPL:  {math.exp(val_loss):7.4f}"
-            )
-
-            # TODO: Adjust for k-fold
-            # Save the model
-            self.store(epoch=epoch + 1)
+                # Update best model
+                is_best = validate and val_loss < best_val_set - self.min_delta
+                if is_best:
+                    best_val_set = val_loss
+                    train_stats.best_epoch = epoch + 1
+                    validations_without_improvement = 0
+                elif validate:
+                    validations_without_improvement += 1
+
+                # TODO: Adjust for k-fold
+                # Save the model in the background (also as best model if improved)
+                checkpoint_writer.save(
+                    self.model.state_dict(),
+                    self._model_path(epoch=epoch + 1),
+                    best=is_best,
+                )
 
-            # Update best model
-            if val_loss < best_val_set:
-                best_val_set = val_loss
-                train_stats.best_epoch = epoch + 1
-                self.store(path=self.store_dir / Path("best_model.pt"))
+                # Stop early if the validation loss does not improve anymore
+                if (
+                    self.patience is not None
+                    and validations_without_improvement >= self.patience
+                ):
+                    train_stats.stopped_epoch = epoch + 1
+                    logging.info(
+                        f"Early stopping after epoch {epoch + 1}: No improvement "
+                        f"for {validations_without_improvement} validations."
+                    )
+                    break
 
         # Save the training stats
         save_content_to_file(
@@ -342,18 +550,40 @@ class BaseClassifier(ABC):
         logging.info("Training done.")
         return train_stats
 
-    def _fit_batch(self, x_batch: ModelInput, y_batch: Tensor) -> float:
+    def _is_validation_epoch(self, epoch: int) -> bool:
+        """
+        Checks whether the model is validated after the given epoch.
+        :param epoch: The index of the epoch.
+        :return: True if the model is validated every n epochs or it is the last epoch.
+        """
+        return (epoch + 1) % self.validate_every == 0 or epoch + 1 == self.num_epochs
+
+    def _fit_batch(
+        self,
+        x_batch: ModelInput,
+        y_batch: Tensor,
+        loss_scale: float = 1.0,
+        step: bool = True,
+    ) -> float:
         """
-        Performs a single training iteration.
+        Performs a single training iteration on a (micro-)batch. The gradients are
+        accumulated until an optimizer step is performed.
         :param x_batch: The input of the model as batch.
         :param y_batch: The scores of the batch.
+        :param loss_scale: The factor to scale the loss with before the backward pass,
+            i.e. one divided by the number of micro-batches of the optimizer step.
+        :param step: Whether to perform the optimizer step after this batch.
         :return: The loss of the batch.
         """
-        self.optimizer.zero_grad()
-        outputs = self.model(x_batch)
-        loss = self.criterion(outputs, y_batch)
-        loss.backward()
-        self.optimizer.step()
+        with self._autocast():
+            outputs = self.model(x_batch)
+        loss = self.criterion(outputs.float(), y_batch)
+        self.scaler.scale(loss * loss_scale).backward()
+
+        if step:
+            self.scaler.step(self.optimizer)
+            self.scaler.update()
+            self.optimizer.zero_grad()
         return loss.item()
 
     def _fit_epoch(self) -> float:
@@ -362,14 +592,22 @@ class BaseClassifier(ABC):
         :return: The train loss of the epoch.
         """
         self.model.train()
+        self.optimizer.zero_grad()
         train_loss = 0.0
-        for batch in self.train_loader:
+        num_batches = len(self.train_loader)
+        for idx, batch in enumerate(self._prefetch(self.train_loader)):
             x = self._batch_to_input(batch)
             y = self._batch_to_score(batch)
 
+            # The last optimizer step of the epoch may have fewer micro-batches
+            step_start = idx - idx % self.accumulation_steps
+            step_size = min(self.accumulation_steps, num_batches - step_start)
+
             loss = self._fit_batch(
                 x_batch=x,
                 y_batch=y,
+                loss_scale=1 / step_size,
+                step=idx + 1 == step_start + step_size,
             )
             train_loss += loss
         return train_loss / len(self.train_loader)
@@ -382,9 +620,9 @@ class BaseClassifier(ABC):
         self.model.eval()
         val_loss = 0.0
 
-        with torch.no_grad():
+        with torch.inference_mode():
             # Iterate through the test loader to evaluate the model
-            for batch in self.val_loader:
+            for batch in self._prefetch(self.val_loader):
                 x = self._batch_to_input(batch)
                 y = self._batch_to_score(batch)
 
@@ -408,21 +646,38 @@ class BaseClassifier(ABC):
         :param y_batch: The scores of the batch.
         :return: The loss of the batch.
         """
-        outputs = self.model(x_batch)
-        loss = self.criterion(outputs, y_batch)
+        with self._autocast():
+            outputs = self.model(x_batch)
+        loss = self.criterion(outputs.float(), y_batch)
         return loss.item()
 
+    def _autocast(self) -> torch.autocast:
+        """
+        Creates the autocast context for the forward pass. The context does nothing if
+        mixed precision is disabled. The loss is computed outside the context, as the
+        binary cross entropy is unsafe to autocast.
+        :return: The autocast context.
+        """
+        return torch.autocast(
+            device_type=self.device.type,
+            dtype=self.amp_dtype,
+            enabled=self.mixed_precision,
+        )
+
     @classmethod
-    def _extract(cls, batch: dict) -> tuple[Tensor, dict[str, Tensor], Tensor, Tensor]:
+    def _extract(
+        cls, batch: dict
+    ) -> tuple[Tensor, dict[str, Tensor], Tensor, Tensor | None]:
         """
         Extracts all data from the batch.
         :param batch: The batch to extract the data from.
-        :return: The extracted data.
+        :return: The extracted data. The score is None for snippets without score.
         """
         matrix = batch["matrix"]
         bert = batch["bert"]
         image = batch["image"]
-        score = batch["score"].unsqueeze(1)
+        score = batch.get("score")
+        score = score.unsqueeze(1) if isinstance(score, Tensor) else None
         return matrix, bert, image, score
 
     @classmethod
@@ -447,6 +702,59 @@ class BaseClassifier(ABC):
         """
         pass
 
+    def to_dataloader(
+        self,
+        dataset: Dataset,
+        batch_size: int = None,
+        shuffle: bool = True,
+        num_workers: int = None,
+    ) -> DataLoader:
+        """
+        Creates a data loader with the loader options of the classifier.
+        :param dataset: The dataset.
+        :param batch_size: The batch size. If None, the batch size of the classifier.
+        :param shuffle: Whether to shuffle the dataset.
+        :param num_workers: The number of worker processes. If None, the number of
+            workers of the classifier.
+        :return: The data loader.
+        """
+        return dataset_to_dataloader(
+            dataset,
+            batch_size=batch_size or self.batch_size,
+            shuffle=shuffle,
+            num_workers=self.num_workers if num_workers is None else num_workers,
+            prefetch_factor=self.prefetch_factor,
+            pin_memory=self.pin_memory,
+            persistent_workers=self.persistent_workers,
+        )
+
+    def _prefetch(self, loader: DataLoader) -> BatchPrefetcher:
+        """
+        Wraps the data loader so that the next batch is sent to the device while the
+        current batch is computed.
+        :param loader: The data loader.
+        :return: The batches on the device.
+        """
+        return BatchPrefetcher(loader, self._batch_to_device, self.device)
+
+    def _batch_to_device(self, batch: dict) -> dict:
+        """
+        Sends all tensors of a collated batch to the device. Each tensor is copied with
+        a single non-blocking copy and the packed bert ids are split into views of
+        their fields after the transfer.
+        :param batch: The batch collated by collate_readability_batch.
+        :return: The batch on the device.
+        """
+        on_device = {}
+        for key, value in batch.items():
+            if isinstance(value, PackedBert):
+                on_device[key] = value.to(self.device, non_blocking=True).unpack()
+            elif isinstance(value, Tensor):
+                on_device[key] = value.to(self.device, non_blocking=True)
+            else:
+                on_device[key] = value
+        return on_device
+
     def _to_device(self, tensor: Tensor) -> Tensor:
         """
         Sends the tensor to the device.
@@ -455,6 +763,20 @@ class BaseClassifier(ABC):
         """
         return tensor.to(self.device)
 
+    def move_to(self, device: torch.device) -> None:
+        """
+        Moves the classifier and its model to the device. The submodules storing the
+        device they were built on are updated too, so that their inputs, buffers and
+        lazily built layers follow the model.
+        :param device: The device.
+        :return: None
+        """
+        self.device = device
+        self.model.to(device)
+        for module in self.model.modules():
+            if isinstance(vars(module).get("device"), torch.device):
+                module.device = device
+
     def _batch_to_score(self, batch: dict) -> Tensor:
         """
         Converts a batch to the model output (=scores) and sends them to the device.
@@ -473,16 +795,24 @@ class BaseClassifier(ABC):
         :param epoch: The epoch to store the model at.
         :return: None
         """
-        current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        if path is None:
+            path = self._model_path(epoch=epoch)
 
-        if path is None and epoch is None:
-            path = self.store_dir / Path(f"model_{current_time}.pt")
-        elif path is None:
-            path = self.store_dir / Path(f"model_{current_time}_{epoch}.pt")
-
-        torch.save(self.model.state_dict(), path)
+        atomic_save(self.model.state_dict(), path)
         logging.info(f"Model stored at {path}")
 
+    def _model_path(self, epoch: int = None) -> Path:
+        """
+        Returns a timestamped path for storing the model in the store directory.
+        :param epoch: The epoch of the model, if any.
+        :return: The path.
+        """
+        current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+
+        if epoch is None:
+            return self.store_dir / Path(f"model_{current_time}.pt")
+        return self.store_dir / Path(f"model_{current_time}_{epoch}.pt")
+
     def load(self, path: str) -> None:
         """
         Loads the model from the given path.
@@ -492,30 +822,57 @@ class BaseClassifier(ABC):
         self.model.load_state_dict(torch.load(path))
         logging.info(f"Model loaded from {path}")
 
+    def predict_encoded(
+        self, dataset: Dataset, batch_size: int = None, num_workers: int = 0
+    ) -> np.ndarray:
+        """
+        Predicts the readability of encoded snippets.
+        :param dataset: The encoded snippets.
+        :param batch_size: The batch size. If None, the batch size of the classifier.
+        :param num_workers: The number of worker processes loading the batches. If 0,
+            the batches are loaded in the main process.
+        :return: The predicted scores in the order of the dataset.
+        """
+        loader = self.to_dataloader(
+            dataset, batch_size=batch_size, shuffle=False, num_workers=num_workers
+        )
+
+        self.model.eval()
+        scores = np.empty(len(dataset), dtype=np.float32)
+        offset = 0
+        with torch.inference_mode():
+            for batch in self._prefetch(loader):
+                with self._autocast():
+                    y_pred = self.model(self._batch_to_input(batch)).float()
+                batch_scores = y_pred.flatten().cpu().numpy()
+                scores[offset : offset + len(batch_scores)] = batch_scores
+                offset += len(batch_scores)
+        return scores
+
+    def predict_batch(
+        self, code_snippets: list[str], batch_size: int = None
+    ) -> np.ndarray:
+        """
+        Predicts the readability of the given code snippets. The snippets are encoded
+        together by the batch encoders, which are created once per classifier.
+        :param code_snippets: The code snippets to predict the readability of.
+        :param batch_size: The batch size. If None, the batch size of the classifier.
+        :return: The predicted readability scores in the order of the snippets.
+        """
+        if self._encoder is None:
+            self._encoder = DatasetEncoder()
+        encoded = self._encoder.encode_dataset(
+            [{"code_snippet": code_snippet} for code_snippet in code_snippets]
+        )
+        return self.predict_encoded(encoded, batch_size)
+
     def predict(self, code_snippet: str) -> float:
         """
         Predicts the readability of the given code snippet.
         :param code_snippet: The code snippet to predict the readability of.
         :return: The predicted readability.
         """
-        self.model.eval()
-
-        # Encode the code snippet
-        encoder = DatasetEncoder()
-        encoded_text = encoder.encode_text(code_snippet)
-        matrix = encoded_text["matrix"]
-        input_ids = encoded_text["input_ids"]
-        token_type_ids = encoded_text["token_type_ids"]
-        image = encoded_text["image"]
-
-        # Predict the readability
-        with torch.no_grad():
-            matrix = matrix.to(self.device)
-            input_ids = input_ids.to(self.device)
-            token_type_ids = token_type_ids.to(self.device)
-            image = image.to(self.device)
-            prediction = self.model(matrix, input_ids, token_type_ids, image)
-            return prediction.item()
+        return float(self.predict_batch([code_snippet])[0])
 
     def evaluate(self) -> EvaluationStats:
         """
@@ -526,58 +883,49 @@ class BaseClassifier(ABC):
             raise ValueError("No test data provided.")
 
         self.model.eval()
-        y_true = []  # True scores
-        y_pred = []  # Predicted scores
+        self.test_scores = np.empty(len(self.test_loader.dataset), dtype=np.float32)
+        confusion_matrix = ConfusionMatrix()
+        offset = 0
 
-        # Iterate through the test data loader to collect true and predicted labels
-        for batch in self.test_loader:
-            x = self._batch_to_input(batch)
-            y = self._batch_to_score(batch)
+        # Stream the predictions to the cpu and update the confusion matrix per batch
+        with torch.inference_mode():
+            for batch in self._prefetch(self.test_loader):
+                x = self._batch_to_input(batch)
+                y = self._batch_to_score(batch)
 
-            y_true.append(y)
-            y_pred.append(self.model(x))
+                with self._autocast():
+                    y_pred = self.model(x).float()
 
-        # Move the labels to the CPU and concatenate the arrays
-        # For Binary Encoding
-        y_true = np.concatenate([np.array(y.cpu()).flatten() for y in y_true])
-        y_pred = np.concatenate([np.array(y.cpu().detach()).flatten() for y in y_pred])
+                # For Binary Encoding
+                scores = y_pred.flatten().cpu().numpy()
+                y_true = y.flatten().cpu().numpy()
+                self.test_scores[offset : offset + len(scores)] = scores
+                offset += len(scores)
 
-        # For One Hot Encoding
-        # y_true = np.concatenate([np.array(y.cpu()) for y in y_true])
-        # y_pred = np.concatenate([np.array(y.cpu().detach()) for y in y_pred])
+                # For One Hot Encoding
+                # scores = y_pred.cpu().numpy()
+                # y_true = y.cpu().numpy()
 
-        # Binary: Convert the scores to binary labels with a threshold of 0.5
-        y_pred = np.where(y_pred >= 0.5, 1, 0)
-        y_true = np.where(y_true >= 0.5, 1, 0)
+                # Binary: Convert the scores to binary labels with a threshold of 0.5
+                confusion_matrix.update(y_true=y_true >= 0.5, y_pred=scores >= 0.5)
 
-        # One Hot: Convert the scores to binary labels: [1,0] = 1, [0,1] = 0
-        # y_pred = np.argmax(y_pred, axis=1)
-        # y_true = np.argmax(y_true, axis=1)
+                # One Hot: Convert the scores to binary labels: [1,0] = 1, [0,1] = 0
+                # confusion_matrix.update(
+                #     y_true=np.argmax(y_true, axis=1) == 0,
+                #     y_pred=np.argmax(scores, axis=1) == 0,
+                # )
 
         # Calculate evaluation metrics
-        accuracy = accuracy_score(y_true, y_pred)
-        precision = precision_score(y_true, y_pred)
-        recall = recall_score(y_true, y_pred)
-        f1 = f1_score(y_true, y_pred)
-        auc = roc_auc_score(y_true, y_pred)
-        mcc = matthews_corrcoef(y_true, y_pred)
+        stats = EvaluationStats.from_confusion_matrix(confusion_matrix)
 
         # Log the evaluation stats
         logging.info(
-            f"Accuracy: {accuracy:.4f}\n"
-            f"Precision: {precision:.4f}\n"
-            f"Recall: {recall:.4f}\n"
-            f"F1: {f1:.4f}\n"
-            f"AUC: {auc:.4f}\n"
-            f"MCC: {mcc:.4f}"
+            f"Accuracy: {stats.accuracy:.4f}\n"
+            f"Precision: {stats.precision:.4f}\n"
+            f"Recall: {stats.recall:.4f}\n"
+            f"F1: {stats.f1:.4f}\n"
+            f"AUC: {stats.auc:.4f}\n"
+            f"MCC: {stats.mcc:.4f}"
         )
 
-        # Create EvaluationStats object
-        return EvaluationStats(
-            accuracy=accuracy,
-            precision=precision,
-            recall=recall,
-            f1=f1,
-            auc=auc,
-            mcc=mcc,
-        )
+        return stats
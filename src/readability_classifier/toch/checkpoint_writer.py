@@ -0,0 +1,164 @@
+import copy
+import logging
+import os
+import shutil
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import torch
+
+from src.readability_classifier.utils.config import DEFAULT_KEEP_CHECKPOINTS
+
+
+def atomic_save(state_dict: dict, path: Path) -> None:
+    """
+    Saves the state dict to the given path. The state dict is written to a temporary
+    file first, which then replaces the target. Thus, a crash never leaves a partially
+    written file at the path.
+    :param state_dict: The state dict.
+    :param path: The path to store the state dict at.
+    :return: None
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        torch.save(state_dict, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def atomic_copy(src: Path, dst: Path) -> None:
+    """
+    Copies the file at src to dst atomically. A hard link is used if possible, so that
+    the content is not written twice.
+    :param src: The source file.
+    :param dst: The destination file.
+    :return: None
+    """
+    dst = Path(dst)
+    tmp_path = dst.with_name(f".{dst.name}.tmp")
+    try:
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def snapshot_state_dict(state_dict: dict) -> dict:
+    """
+    Copies the state dict to the cpu, so that it can be serialized while the training
+    continues to update the parameters.
+    :param state_dict: The state dict of the model.
+    :return: The copy of the state dict.
+    """
+    return {
+        key: (
+            value.detach().to("cpu", copy=True)
+            if isinstance(value, torch.Tensor)
+            else copy.deepcopy(value)
+        )
+        for key, value in state_dict.items()
+    }
+
+
+class CheckpointWriter:
+    """
+    Writes checkpoints of a model in a background thread. The state dict is copied to
+    the cpu synchronously and serialized off the training thread. Only the last
+    checkpoints and the best checkpoint are kept. The best checkpoint is linked to (or
+    copied from) the epoch checkpoint instead of being serialized again. All writes are
+    atomic.
+    """
+
+    def __init__(
+        self,
+        best_path: Path,
+        keep_last: int | None = DEFAULT_KEEP_CHECKPOINTS,
+    ):
+        """
+        Initializes the checkpoint writer.
+        :param best_path: The path of the best checkpoint.
+        :param keep_last: The number of most recent checkpoints to keep. If None, all
+            checkpoints are kept.
+        """
+        self.best_path = Path(best_path)
+        self.keep_last = keep_last
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="checkpoint-writer"
+        )
+        self._futures: list[Future] = []
+        self._checkpoints: deque[Path] = deque()
+
+    def __enter__(self) -> "CheckpointWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Do not mask the original exception with a failed write
+            self._executor.shutdown(wait=True)
+
+    def save(self, state_dict: dict, path: Path, best: bool = False) -> Future:
+        """
+        Schedules writing a checkpoint.
+        :param state_dict: The state dict of the model.
+        :param path: The path of the checkpoint.
+        :param best: Whether the checkpoint is also the new best checkpoint.
+        :return: The future of the write.
+        """
+        self._raise_failures()
+        snapshot = snapshot_state_dict(state_dict)
+        future = self._executor.submit(self._write, snapshot, Path(path), best)
+        self._futures.append(future)
+        return future
+
+    def close(self) -> None:
+        """
+        Waits until all checkpoints are written.
+        :return: None
+        :raises: The first exception raised while writing a checkpoint.
+        """
+        self._executor.shutdown(wait=True)
+        self._raise_failures()
+
+    def _raise_failures(self) -> None:
+        """
+        Raises the exception of the first failed write, if any.
+        :return: None
+        """
+        pending = []
+        for future in self._futures:
+            if not future.done():
+                pending.append(future)
+            elif future.exception() is not None:
+                raise future.exception()
+        self._futures = pending
+
+    def _write(self, state_dict: dict, path: Path, best: bool) -> None:
+        """
+        Writes the checkpoint, updates the best checkpoint and removes old checkpoints.
+        Runs in the background thread.
+        :param state_dict: The state dict on the cpu.
+        :param path: The path of the checkpoint.
+        :param best: Whether the checkpoint is also the new best checkpoint.
+        :return: None
+        """
+        atomic_save(state_dict, path)
+        logging.info(f"Model stored at {path}")
+
+        if best:
+            atomic_copy(path, self.best_path)
+            logging.info(f"Best model stored at {self.best_path}")
+
+        self._checkpoints.append(path)
+        while self.keep_last is not None and len(self._checkpoints) > self.keep_last:
+            old_path = self._checkpoints.popleft()
+            old_path.unlink(missing_ok=True)
+            logging.info(f"Removed old checkpoint {old_path}")
@@ -0,0 +1,315 @@
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+import torch
+from torch import Tensor, nn
+from torch.utils.data import Dataset
+
+from src.readability_classifier.encoders.dataset_utils import (
+    PackedBert,
+    collate_readability_batch,
+    dataset_to_dataloader,
+)
+from src.readability_classifier.toch.base_classifier import BaseClassifier
+from src.readability_classifier.toch.fc_model import FullyConnectedModel
+from src.readability_classifier.toch.options import ExportMethod
+from src.readability_classifier.utils.config import (
+    DEFAULT_MODEL_BATCH_SIZE,
+    DEFAULT_ONNX_OPSET,
+)
+from src.readability_classifier.utils.fold_scheduler import flatten, unflatten
+
+DEFAULT_BENCHMARK_BATCH_SIZES = (1, 32, 256)
+DEFAULT_BENCHMARK_REPEATS = 10
+META_SUFFIX = ".json"  # Suffix of the file describing an exported model
+
+
+def _input_names(batch: dict) -> list[str]:
+    """
+    Returns the (flat) names of the model input tensors of a batch.
+    :param batch: The batch on the device.
+    :return: The input names, e.g. ["matrix", "bert.input_ids", "image"].
+    """
+    return [
+        name
+        for name, value in flatten(batch).items()
+        if isinstance(value, Tensor) and name != "score"
+    ]
+
+
+class TensorSignatureModel(nn.Module):
+    """
+    Wraps the model of a classifier, so that it takes the input tensors directly
+    instead of a ModelInput dataclass. The tensors are converted with the
+    _batch_to_input method of the classifier.
+    """
+
+    def __init__(self, classifier: BaseClassifier, input_names: list[str]):
+        """
+        Initializes the wrapper.
+        :param classifier: The classifier.
+        :param input_names: The flat names of the input tensors.
+        """
+        super().__init__()
+        self.model = classifier.model
+        self.batch_to_input = classifier._batch_to_input
+        self.input_names = input_names
+
+    def forward(self, *tensors: Tensor) -> Tensor:
+        """
+        Forward pass of the model.
+        :param tensors: The input tensors in the order of the input names.
+        :return: The output of the model.
+        """
+        batch = unflatten(dict(zip(self.input_names, tensors, strict=True)))
+        return self.model(self.batch_to_input(batch))
+
+
+def freeze_input_lengths(model: nn.Module, model_input) -> None:
+    """
+    Runs the model once, so that the classification layers adapt their input length
+    to the features, and freezes the input length afterwards. Needed before a model is
+    traced or quantized, as the lazily replaced layer would not be part of it.
+    :param model: The model in eval mode.
+    :param model_input: An example input of the model.
+    :return: None
+    """
+    with torch.no_grad():
+        model(model_input)
+    for module in model.modules():
+        if isinstance(module, FullyConnectedModel):
+            module.freeze_input_length()
+
+
+def export_model(
+    classifier: BaseClassifier,
+    example_batch: dict,
+    path: Path,
+    method: ExportMethod = ExportMethod.TRACE,
+) -> None:
+    """
+    Exports the model of the classifier as TorchScript, torch.export or ONNX artifact.
+    The input length of the classification layers is frozen first. The input names
+    and the device of the classifier are stored next to the artifact, as the device
+    transfers of the model are recorded into the exported graph.
+    :param classifier: The classifier with the trained model.
+    :param example_batch: A collated example batch (batch size > 1).
+    :param path: The path of the artifact.
+    :param method: The export method.
+    :return: None
+    """
+    model = classifier.model
+    model.eval()
+
+    batch = classifier._batch_to_device(example_batch)
+    freeze_input_lengths(model, classifier._batch_to_input(batch))
+
+    input_names = _input_names(batch)
+    inputs = tuple(flatten(batch)[name] for name in input_names)
+    wrapper = TensorSignatureModel(classifier, input_names).eval()
+
+    with torch.no_grad():
+        if method == ExportMethod.TRACE:
+            torch.jit.save(torch.jit.trace(wrapper, inputs, check_trace=False), path)
+        elif method == ExportMethod.ONNX:
+            torch.onnx.export(
+                wrapper,
+                inputs,
+                path,
+                input_names=input_names,
+                output_names=["score"],
+                dynamic_axes={name: {0: "batch"} for name in [*input_names, "score"]},
+                opset_version=DEFAULT_ONNX_OPSET,
+            )
+        else:
+            batch_dim = torch.export.Dim("batch")
+            # The input tensors are passed as the varargs of the wrapper
+            dynamic_shapes = (tuple({0: batch_dim} for _ in inputs),)
+            # Non-strict, as dynamo can not build the frozen model input dataclasses
+            program = torch.export.export(
+                wrapper, inputs, dynamic_shapes=dynamic_shapes, strict=False
+            )
+            torch.export.save(program, path)
+
+    meta = {
+        "method": str(method),
+        "input_names": input_names,
+        "device": str(classifier.device),
+    }
+    Path(f"{path}{META_SUFFIX}").write_text(json.dumps(meta))
+    logging.info(f"Model exported with {method} to {path}")
+
+
+def is_exported_model(path: Path) -> bool:
+    """
+    Checks whether the path is a model exported by export_model.
+    :param path: The path of the model.
+    :return: True if it is an exported model.
+    """
+    return Path(f"{path}{META_SUFFIX}").is_file()
+
+
+class ExportedPredictor:
+    """
+    Predicts the readability of encoded snippets with an exported model. The model
+    runs on the device it was exported on.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Loads the exported model.
+        :param path: The path of the artifact.
+        """
+        meta = json.loads(Path(f"{path}{META_SUFFIX}").read_text())
+        self.input_names = meta["input_names"]
+        self.device = torch.device(meta["device"])
+        method = ExportMethod(meta["method"])
+
+        if method == ExportMethod.ONNX:
+            raise ValueError(
+                f"{path} is an ONNX model. Run it with the onnx model runner."
+            )
+        if method == ExportMethod.TRACE:
+            self.model = torch.jit.load(path, map_location=self.device)
+        else:
+            self.model = torch.export.load(path).module().to(self.device)
+        logging.info(f"Exported model loaded from {path}")
+
+    def predict_batch(self, batch: dict) -> Tensor:
+        """
+        Predicts the readability of a collated batch.
+        :param batch: The batch with the tensors on the device.
+        :return: The predicted scores.
+        """
+        flat = flatten(batch)
+        with torch.inference_mode():
+            return self.model(*(flat[name] for name in self.input_names))
+
+    def predict(
+        self, dataset: Dataset, batch_size: int = DEFAULT_MODEL_BATCH_SIZE
+    ) -> np.ndarray:
+        """
+        Predicts the readability of the encoded snippets.
+        :param dataset: The encoded snippets.
+        :param batch_size: The batch size.
+        :return: The predicted scores in the order of the dataset.
+        """
+        loader = dataset_to_dataloader(
+            dataset, batch_size=batch_size, shuffle=False, num_workers=0
+        )
+        scores = []
+        for batch in loader:
+            batch = _to_device(batch, self.device)
+            scores.append(self.predict_batch(batch).float().flatten().cpu().numpy())
+        return np.concatenate(scores)
+
+
+def _to_device(batch: dict, device: torch.device) -> dict:
+    """
+    Sends the tensors of a (collated) batch to the device and unpacks the bert ids.
+    :param batch: The batch.
+    :param device: The device.
+    :return: The batch on the device.
+    """
+    batch = dict(batch)
+    if isinstance(batch.get("bert"), PackedBert):
+        batch["bert"] = batch["bert"].to(device).unpack()
+    return unflatten(
+        {
+            name: value.to(device) if isinstance(value, Tensor) else value
+            for name, value in flatten(batch).items()
+        }
+    )
+
+
+@dataclass(frozen=True)
+class LatencyStats:
+    """
+    Data class for the latency of eager and exported inference at a batch size.
+    """
+
+    batch_size: int
+    eager_ms: float
+    exported_ms: float
+
+    @property
+    def speedup(self) -> float:
+        """
+        The speedup of the exported model over the eager model.
+        """
+        return self.eager_ms / self.exported_ms
+
+    def to_json(self) -> str:
+        """
+        Convert to json.
+        :return: Returns the json string.
+        """
+        return json.dumps({**asdict(self), "speedup": self.speedup})
+
+
+def median_latency_ms(run, device: torch.device, repeats: int) -> float:
+    """
+    Measures the median latency of a function after a warm-up run.
+    :param run: The function to measure.
+    :param device: The device the function runs on.
+    :param repeats: The number of measured runs.
+    :return: The median latency in milliseconds.
+    """
+    run()
+    latencies = []
+    for _ in range(repeats):
+        if device.type == "cuda":
+            torch.cuda.synchronize(device)
+        start = time.perf_counter()
+        run()
+        if device.type == "cuda":
+            torch.cuda.synchronize(device)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return float(np.median(latencies))
+
+
+def benchmark_latency(
+    classifier: BaseClassifier,
+    predictor: ExportedPredictor,
+    dataset: Dataset,
+    batch_sizes: tuple[int, ...] = DEFAULT_BENCHMARK_BATCH_SIZES,
+    repeats: int = DEFAULT_BENCHMARK_REPEATS,
+) -> list[LatencyStats]:
+    """
+    Compares the latency of the eager model of the classifier and the exported model.
+    The batches are filled by repeating the samples of the dataset if needed.
+    :param classifier: The classifier with the eager model.
+    :param predictor: The predictor with the exported model.
+    :param dataset: The encoded samples.
+    :param batch_sizes: The batch sizes to measure.
+    :param repeats: The number of measured runs per batch size.
+    :return: The latency stats per batch size.
+    """
+    classifier.model.eval()
+    stats = []
+    for batch_size in batch_sizes:
+        samples = [dataset[i % len(dataset)] for i in range(batch_size)]
+        batch = classifier._batch_to_device(collate_readability_batch(samples))
+
+        def run_eager(batch=batch):
+            with torch.inference_mode():
+                classifier.model(classifier._batch_to_input(batch))
+
+        def run_exported(batch=batch):
+            predictor.predict_batch(batch)
+
+        latency = LatencyStats(
+            batch_size=batch_size,
+            eager_ms=median_latency_ms(run_eager, classifier.device, repeats),
+            exported_ms=median_latency_ms(run_exported, classifier.device, repeats),
+        )
+        logging.info(
+            f"Batch size {batch_size}: eager {latency.eager_ms:.2f} ms, "
+            f"exported {latency.exported_ms:.2f} ms ({latency.speedup:.2f}x)"
+        )
+        stats.append(latency)
+    return stats
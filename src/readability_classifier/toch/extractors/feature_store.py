@@ -0,0 +1,271 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import torch
+from transformers import PreTrainedModel
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, where the store is not locked
+    fcntl = None
+
+FEATURES_FILE = "features.f16"
+KEYS_FILE = "keys.txt"
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+WORKER_DIR_PREFIX = "worker_"  # Stores of processes writing concurrently
+MIN_CAPACITY = 1024  # Rows the features file is grown by at least
+
+_STORES: dict[tuple[Path, str], "BertFeatureStore"] = {}
+_LOCK = threading.Lock()
+
+
+def sample_keys(*ids: torch.Tensor) -> list[str]:
+    """
+    Computes a key for each sample of a batch from its id tensors, e.g. input_ids,
+    token_type_ids and attention_mask.
+    :param ids: The id tensors of shape (batch_size, sequence_length).
+    :return: The sha1 hex digest of each sample.
+    """
+    rows = [tensor.detach().to("cpu", torch.int64).numpy() for tensor in ids]
+    keys = []
+    for idx in range(len(rows[0])):
+        digest = hashlib.sha1()
+        for row in rows:
+            digest.update(row[idx].tobytes())
+        keys.append(digest.hexdigest())
+    return keys
+
+
+def bert_fingerprint(model: PreTrainedModel) -> str:
+    """
+    Computes a fingerprint of a bert model from its config and its token embedding
+    weights, which differ between processes if the embeddings were resized with
+    randomly initialized rows.
+    :param model: The bert model.
+    :return: The sha1 hex digest of the model.
+    """
+    digest = hashlib.sha1(model.config.to_json_string().encode())
+    weights = model.get_input_embeddings().weight.detach().to("cpu")
+    digest.update(weights.contiguous().view(torch.uint8).numpy().tobytes())
+    return digest.hexdigest()
+
+
+def open_feature_store(store_dir: Path, fingerprint: str) -> "BertFeatureStore":
+    """
+    Opens a feature store once per process and shares it with all callers with the
+    same arguments, e.g. the classifiers of all folds.
+    :param store_dir: The directory of the store.
+    :param fingerprint: The fingerprint of the bert model computing the features.
+    :return: The shared feature store.
+    """
+    key = (Path(store_dir).resolve(), fingerprint)
+    with _LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = BertFeatureStore(store_dir, fingerprint)
+            _STORES[key] = store
+        return store
+
+
+class BertFeatureStore:
+    """
+    An append-only store of frozen bert features (last hidden states) on disk. The
+    features are stored as float16 in one memory mapped file and looked up by a hash of
+    the ids of the sample. The store is locked by a single writer; other stores of the
+    same directory, e.g. of parallel fold workers, use a worker subdirectory instead.
+    """
+
+    def __init__(self, store_dir: Path, fingerprint: str):
+        """
+        Initializes the store. An existing store of another model is cleared.
+        :param store_dir: The directory of the store.
+        :param fingerprint: The fingerprint of the bert model computing the features
+            (see bert_fingerprint).
+        """
+        self.fingerprint = fingerprint
+        self.shape = None  # (sequence_length, hidden_size) of a sample
+        self._rows: dict[str, int] = {}
+        self._features = None  # Memory map of the features, grown on demand
+        self._lock_file = None
+        self.store_dir = self._acquire(Path(store_dir))
+        self._load()
+
+    def __len__(self) -> int:
+        """
+        Return the number of stored samples.
+        """
+        return len(self._rows)
+
+    def get_or_compute(
+        self,
+        keys: list[str],
+        compute: Callable[[torch.Tensor], torch.Tensor],
+        device: torch.device,
+    ) -> torch.Tensor:
+        """
+        Returns the features of a batch. The features of unknown samples are computed
+        and stored.
+        :param keys: The keys of the samples (see sample_keys).
+        :param compute: Computes the features of the samples at the given batch
+            indices, shape (num_samples, sequence_length, hidden_size).
+        :param device: The device to return the features on.
+        :return: The features of the batch as float32.
+        """
+        # Batch index of the first occurrence of each unknown key
+        missing = {}
+        for idx, key in enumerate(keys):
+            if key not in self._rows and key not in missing:
+                missing[key] = idx
+
+        if missing:
+            computed = compute(torch.tensor(list(missing.values()), device=device))
+            self._append(list(missing.keys()), computed)
+
+        rows = [self._rows[key] for key in keys]
+        features = np.array(self._features[rows], dtype=np.float32)
+        return torch.from_numpy(features).to(device, non_blocking=True)
+
+    def close(self) -> None:
+        """
+        Closes the memory map and releases the lock of the store.
+        :return: None
+        """
+        if self._features is not None:
+            self._features.flush()
+            self._features = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _acquire(self, store_dir: Path) -> Path:
+        """
+        Locks the store directory or, if another store writes to it, the first
+        unlocked worker subdirectory.
+        :param store_dir: The directory of the store.
+        :return: The locked directory.
+        """
+        directory = store_dir
+        for worker in itertools.count(1):
+            directory.mkdir(parents=True, exist_ok=True)
+            if self._lock(directory):
+                break
+            directory = store_dir / f"{WORKER_DIR_PREFIX}{worker}"
+
+        if directory != store_dir:
+            logging.info(f"Feature store {store_dir} is in use, using {directory}")
+        return directory
+
+    def _lock(self, directory: Path) -> bool:
+        """
+        Locks a directory for this store without blocking.
+        :param directory: The directory.
+        :return: True if the directory is locked, False if another store locked it.
+        """
+        if fcntl is None:
+            return True
+
+        lock_file = open(directory / LOCK_FILE, "a")  # noqa: SIM115 - Held until close
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _load(self) -> None:
+        """
+        Loads the keys of an existing store.
+        :return: None
+        """
+        meta_path = self.store_dir / META_FILE
+        if not meta_path.exists():
+            return
+
+        meta = json.loads(meta_path.read_text())
+        if meta.get("fingerprint") != self.fingerprint:
+            logging.warning(f"Clearing the feature store {self.store_dir} of a model.")
+            for name in (META_FILE, KEYS_FILE, FEATURES_FILE):
+                (self.store_dir / name).unlink(missing_ok=True)
+            return
+
+        self.shape = tuple(meta["shape"])
+        keys_path = self.store_dir / KEYS_FILE
+        features_path = self.store_dir / FEATURES_FILE
+        keys_path.touch()
+        features_path.touch()
+        keys = keys_path.read_text().split()
+
+        # Drop keys or features without counterpart, e.g. after an interrupted append
+        row_bytes = int(np.prod(self.shape)) * np.dtype(np.float16).itemsize
+        num_rows = min(len(keys), features_path.stat().st_size // row_bytes)
+        os.truncate(features_path, num_rows * row_bytes)
+        if len(keys) > num_rows:
+            keys_path.write_text("".join(f"{key}\n" for key in keys[:num_rows]))
+        self._rows = {key: row for row, key in enumerate(keys[:num_rows])}
+        if self._rows:
+            self._reserve(num_rows)
+        logging.info(f"Loaded {len(self)} bert features from {self.store_dir}")
+
+    def _append(self, keys: list[str], features: torch.Tensor) -> None:
+        """
+        Appends the features of new samples to the store.
+        :param keys: The keys of the samples.
+        :param features: The features of the samples.
+        :return: None
+        """
+        if self.shape is None:
+            self.shape = tuple(features.shape[1:])
+            meta = {"fingerprint": self.fingerprint, "shape": list(self.shape)}
+            (self.store_dir / META_FILE).write_text(json.dumps(meta))
+        elif tuple(features.shape[1:]) != self.shape:
+            raise ValueError(
+                f"Features of shape {tuple(features.shape[1:])} do not match the "
+                f"shape {self.shape} of the feature store {self.store_dir}."
+            )
+
+        # The keys are written after the features, so they only refer to stored rows
+        start = len(self._rows)
+        self._reserve(start + len(keys))
+        self._features[start : start + len(keys)] = (
+            features.detach().to("cpu", torch.float16).numpy()
+        )
+        with open(self.store_dir / KEYS_FILE, "a") as file:
+            file.write("".join(f"{key}\n" for key in keys))
+
+        for key in keys:
+            self._rows[key] = len(self._rows)
+
+    def _reserve(self, num_rows: int) -> None:
+        """
+        Memory maps the features file with room for at least the given number of rows.
+        The file is grown geometrically, so that the map is rarely reopened. Rows
+        beyond the stored keys are dropped when the store is loaded.
+        :param num_rows: The number of rows.
+        :return: None
+        """
+        capacity = 0 if self._features is None else len(self._features)
+        if num_rows <= capacity:
+            return
+
+        capacity = max(num_rows, 2 * capacity, MIN_CAPACITY)
+        row_bytes = int(np.prod(self.shape)) * np.dtype(np.float16).itemsize
+        features_path = self.store_dir / FEATURES_FILE
+        if self._features is not None:
+            self._features.flush()
+        features_path.touch()
+        os.truncate(features_path, capacity * row_bytes)
+        self._features = np.memmap(
+            features_path,
+            dtype=np.float16,
+            mode="r+",
+            shape=(capacity, *self.shape),
+        )
@@ -0,0 +1,40 @@
+import torch
+from torch import nn
+
+
+class PositionIdsModule(nn.Module):
+    """
+    A module with a position embedding, whose position ids are sliced from a buffer
+    instead of being created for every batch. The position_embedding is set by the
+    subclass.
+    """
+
+    position_embedding: nn.Embedding
+
+    def register_position_ids(
+        self, max_position_embeddings: int, device: torch.device = None
+    ) -> None:
+        """
+        Registers the (not persisted) buffer of the position ids of the longest
+        supported sequence.
+        :param max_position_embeddings: The number of position embeddings.
+        :param device: The device of the buffer.
+        :return: None
+        """
+        self.register_buffer(
+            "position_ids",
+            torch.arange(max_position_embeddings, device=device)[None],
+            persistent=False,
+        )
+
+    def _position_ids(self, sequence_length: int) -> torch.Tensor:
+        """
+        Returns the position ids of a sequence. Longer sequences than seen before
+        extend the buffer, where the ids wrap around at max_position_embeddings.
+        :param sequence_length: The length of the sequence.
+        :return: The position ids of shape (1, sequence_length).
+        """
+        if sequence_length > self.position_ids.size(1):
+            positions = torch.arange(sequence_length, device=self.position_ids.device)
+            self.position_ids = positions[None] % self.position_embedding.num_embeddings
+        return self.position_ids[:, :sequence_length]
@@ -0,0 +1,171 @@
+import copy
+import logging
+import threading
+
+import torch
+from torch import nn
+from transformers import BertConfig, BertModel
+
+NEW_EMBEDDINGS_SEED = 0  # Seed of the rows added by resizing the token embeddings
+
+_FROZEN_BERT_MODELS: dict[tuple, BertModel] = {}
+_LOCK = threading.Lock()
+
+
+def load_frozen_bert(
+    model_name: str,
+    config: BertConfig = None,
+    vocab_size: int = None,
+    device: torch.device = None,
+) -> BertModel:
+    """
+    Loads a pretrained bert model with frozen weights. The model is loaded once per
+    process (memory mapped from the safetensors checkpoint if available) and shared by
+    all callers with the same arguments, e.g. the classifiers of all folds. The shared
+    model is in eval mode and must not be trained, see FrozenBertModule.
+    :param model_name: The name of the pretrained model.
+    :param config: The config of the model. If None, the pretrained config is used.
+    :param vocab_size: The vocabulary size to resize the token embeddings to. If None,
+        the embeddings are not resized.
+    :param device: The device of the model.
+    :return: The shared bert model.
+    """
+    config_key = None if config is None else config.to_json_string()
+    key = (model_name, config_key, vocab_size, str(device))
+
+    with _LOCK:
+        model = _FROZEN_BERT_MODELS.get(key)
+        if model is None:
+            model = _from_pretrained(model_name, config)
+            if vocab_size is not None:
+                _resize_token_embeddings(model, vocab_size)
+            model.requires_grad_(False)
+            model.eval()
+            if device is not None:
+                model.to(device)
+            _FROZEN_BERT_MODELS[key] = model
+            logging.info(f"Loaded frozen {model_name} for sharing")
+        return model
+
+
+class FrozenBertModule(nn.Module):
+    """
+    Base class of modules using a shared frozen bert model (see load_frozen_bert). The
+    model is attached as a plain attribute instead of a submodule. So it is not part
+    of the state dict, the modules and the parameters of the module, and
+    load_state_dict, train or eval of one module do not change the model shared with
+    the other modules. Moving the module to another device attaches the shared model
+    of that device, and copies of the module share the model instead of cloning it.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the module.
+        """
+        super().__init__()
+        self._frozen_bert_args = {}  # The load_frozen_bert arguments of each model
+
+    def attach_frozen_bert(
+        self,
+        name: str,
+        model_name: str,
+        config: BertConfig = None,
+        vocab_size: int = None,
+        device: torch.device = None,
+    ) -> None:
+        """
+        Attaches the shared frozen bert model with the given arguments (see
+        load_frozen_bert) to the module. The bert weights stored in checkpoints of
+        modules that registered the model as submodule are ignored when loading.
+        :param name: The attribute name of the bert model.
+        :param model_name: The name of the pretrained model.
+        :param config: The config of the model. If None, the pretrained config is used.
+        :param vocab_size: The vocabulary size to resize the token embeddings to.
+        :param device: The device of the model.
+        :return: None
+        """
+        self._frozen_bert_args[name] = (model_name, config, vocab_size)
+        object.__setattr__(
+            self, name, load_frozen_bert(model_name, config, vocab_size, device)
+        )
+
+        def ignore_frozen_weights(state_dict: dict, prefix: str, *args) -> None:
+            frozen_keys = [
+                key for key in state_dict if key.startswith(f"{prefix}{name}.")
+            ]
+            for key in frozen_keys:
+                del state_dict[key]
+
+        self._register_load_state_dict_pre_hook(ignore_frozen_weights)
+
+    def _apply(self, fn, *args, **kwargs):
+        """
+        Applies fn to the tensors of the module, e.g. to move them to another device,
+        and attaches the shared bert models of the device the tensors are moved to.
+        :param fn: The function applied to each tensor.
+        :return: The module.
+        """
+        module = super()._apply(fn, *args, **kwargs)
+        for name, (model_name, config, vocab_size) in self._frozen_bert_args.items():
+            model = getattr(self, name)
+            device = fn(torch.empty(0, device=model.device)).device
+            if device != model.device:
+                shared = load_frozen_bert(model_name, config, vocab_size, device)
+                object.__setattr__(self, name, shared)
+        return module
+
+    def __deepcopy__(self, memo: dict) -> "FrozenBertModule":
+        """
+        Copies the module, except for the shared bert models.
+        :param memo: The objects copied so far.
+        :return: The copy.
+        """
+        for name in self._frozen_bert_args:
+            model = getattr(self, name)
+            memo[id(model)] = model
+
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+        copied.__setstate__(copy.deepcopy(self.__dict__, memo))
+        return copied
+
+
+def _resize_token_embeddings(model: BertModel, vocab_size: int) -> None:
+    """
+    Resizes the token embeddings of the model. The added rows are initialized with a
+    fixed seed, so that they are the same in every process and run.
+    :param model: The bert model.
+    :param vocab_size: The new vocabulary size.
+    :return: None
+    """
+    old_size = model.get_input_embeddings().num_embeddings
+    model.resize_token_embeddings(vocab_size)
+    weight = model.get_input_embeddings().weight
+    if vocab_size > old_size:
+        generator = torch.Generator().manual_seed(NEW_EMBEDDINGS_SEED)
+        rows = torch.normal(
+            0.0,
+            model.config.initializer_range,
+            size=(vocab_size - old_size, weight.size(1)),
+            generator=generator,
+        )
+        with torch.no_grad():
+            weight[old_size:] = rows.to(weight.dtype)
+
+
+def _from_pretrained(model_name: str, config: BertConfig = None) -> BertModel:
+    """
+    Loads the pretrained model, preferring the memory mapped safetensors checkpoint.
+    :param model_name: The name of the pretrained model.
+    :param config: The config of the model or None.
+    :return: The model.
+    """
+    kwargs = {"low_cpu_mem_usage": True}
+    if config is not None:
+        kwargs["config"] = config
+
+    try:
+        return BertModel.from_pretrained(model_name, use_safetensors=True, **kwargs)
+    except OSError:
+        logging.warning(f"No safetensors checkpoint of {model_name} found.")
+        return BertModel.from_pretrained(model_name, **kwargs)
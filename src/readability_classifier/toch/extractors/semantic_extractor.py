@@ -6,6 +6,7 @@ from torch import nn as nn
 from transformers import BertConfig
 
 from src.readability_classifier.toch.base_model import BaseModel
+from src.readability_classifier.toch.extractors.position_ids import PositionIdsModule
 from src.readability_classifier.utils.config import SemanticInput
 from src.readability_classifier.utils.utils import load_yaml_file
 
@@ -51,7 +52,20 @@ class TowardsBertConfig(BertConfig):
         return load_yaml_file(CONFIGS_PATH / f"{cls.__name__.lower()}.yaml")
 
 
-class BertEmbedding(nn.Module):
+def autocast_dtype(device: torch.device) -> torch.dtype | None:
+    """
+    Get the dtype of the autocast context enabled for the device.
+    :param device: The device.
+    :return: The autocast dtype or None if autocast is disabled.
+    """
+    if device.type == "cuda" and torch.is_autocast_enabled():
+        return torch.get_autocast_gpu_dtype()
+    if device.type == "cpu" and torch.is_autocast_cpu_enabled():
+        return torch.get_autocast_cpu_dtype()
+    return None
+
+
+class BertEmbedding(PositionIdsModule):
     """
     A Bert embedding layer similar to the one used in the TowardsBert paper.
     The embedding weights are trained from scratch!
@@ -85,6 +99,9 @@ class BertEmbedding(nn.Module):
         self.position_embedding.to(self.device)
         self.token_type_embedding.to(self.device)
 
+        # Position ids of the longest supported sequence, sliced per call
+        self.register_position_ids(config.max_position_embeddings, self.device)
+
     def embed(
         self, input_ids: torch.Tensor, token_type_ids: torch.Tensor
     ) -> torch.Tensor:
@@ -95,10 +112,7 @@ class BertEmbedding(nn.Module):
         :return:
         """
         batch_size, sequence_length = input_ids.size()
-
-        # Create position ids
-        position_ids = torch.arange(sequence_length, dtype=torch.long).unsqueeze(0)
-        position_ids = position_ids % self.position_embedding.weight.size(0)
+        position_ids = self._position_ids(sequence_length)
 
         # Create token type ids
         if token_type_ids is None:
@@ -109,10 +123,17 @@ class BertEmbedding(nn.Module):
         token_type_ids = token_type_ids.to(self.device)
 
         # Get embeddings
-        position_embeddings = self.position_embedding(position_ids.to(input_ids.device))
+        position_embeddings = self.position_embedding(position_ids)
         token_type_embeddings = self.token_type_embedding(token_type_ids)
         token_embeddings = self.token_embedding(input_ids)
 
+        # Embedding lookups are not autocast, so sum in reduced precision explicitly
+        dtype = autocast_dtype(token_embeddings.device)
+        if dtype is not None:
+            position_embeddings = position_embeddings.to(dtype)
+            token_type_embeddings = token_type_embeddings.to(dtype)
+            token_embeddings = token_embeddings.to(dtype)
+
         # Sum all embeddings and apply layer norm and dropout
         embeddings = token_embeddings + token_type_embeddings + position_embeddings
         embeddings = self.layer_norm(embeddings)
@@ -3,10 +3,11 @@ from pathlib import Path
 
 import torch
 from torch import nn as nn
-from transformers import BertConfig, BertModel
+from transformers import BertConfig
 
 from src.readability_classifier.encoders.bert_encoder import DEFAULT_OWN_SEGMENT_IDS
 from src.readability_classifier.toch.base_model import BaseModel
+from src.readability_classifier.toch.extractors.pretrained import FrozenBertModule
 from src.readability_classifier.utils.config import SemanticInput
 from src.readability_classifier.utils.utils import load_yaml_file
 
@@ -42,7 +43,7 @@ class KrodBertConfig(BertConfig):
         return load_yaml_file(CONFIGS_PATH / f"{cls.__name__.lower()}.yaml")
 
 
-class KrodBertEmbedding(BaseModel):
+class KrodBertEmbedding(BaseModel, FrozenBertModule):
     """
     A Bert embedding layer.
     """
@@ -50,12 +51,15 @@ class KrodBertEmbedding(BaseModel):
     def __init__(self, config: KrodBertConfig) -> None:
         super().__init__()
         self.model_name = "bert-base-cased"
-        self.model = BertModel.from_pretrained(self.model_name, config=config)
-        if DEFAULT_OWN_SEGMENT_IDS:
-            self.model.resize_token_embeddings(config.vocab_size + 1)
 
-        # Send the model to the GPU
-        self.model.to(self.device)
+        # The frozen model is shared by all instances and sent to the GPU once
+        self.attach_frozen_bert(
+            "model",
+            self.model_name,
+            config=config,
+            vocab_size=config.vocab_size + 1 if DEFAULT_OWN_SEGMENT_IDS else None,
+            device=self.device,
+        )
 
     def forward(
         self,
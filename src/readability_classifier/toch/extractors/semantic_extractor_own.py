@@ -3,9 +3,16 @@ from pathlib import Path
 
 import torch
 from torch import nn as nn
-from transformers import BertConfig, BertModel
+from transformers import BertConfig
 
 from src.readability_classifier.toch.base_model import BaseModel
+from src.readability_classifier.toch.extractors.feature_store import (
+    bert_fingerprint,
+    open_feature_store,
+    sample_keys,
+)
+from src.readability_classifier.toch.extractors.position_ids import PositionIdsModule
+from src.readability_classifier.toch.extractors.pretrained import FrozenBertModule
 from src.readability_classifier.utils.config import SemanticInput
 from src.readability_classifier.utils.utils import load_yaml_file
 
@@ -36,6 +43,8 @@ class OwnBertConfig(BertConfig):
         self.attention_dropout_rate = kwargs.get("attention_dropout_rate", 0.1)
         self.max_position_embeddings = kwargs.get("max_position_embeddings", 200)
         self.max_sequence_length = kwargs.get("max_sequence_length", 100)
+        # Directory to cache the frozen bert features in (None = no caching)
+        self.feature_cache_dir = kwargs.get("feature_cache_dir")
 
     @classmethod
     def build_config(cls) -> "OwnBertConfig":
@@ -54,7 +63,7 @@ class OwnBertConfig(BertConfig):
         return load_yaml_file(CONFIGS_PATH / f"{cls.__name__.lower()}.yaml")
 
 
-class OwnBertEmbedding(BaseModel):
+class OwnBertEmbedding(BaseModel, FrozenBertModule, PositionIdsModule):
     """
     A Bert embedding layer similar to the one used in the TowardsBert paper.
     The embedding weights are trained from scratch!
@@ -66,11 +75,11 @@ class OwnBertEmbedding(BaseModel):
         # Specify device
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-        # Load model for token type embedding
+        # Load model for token type embedding (shared by all instances)
         self.model_name = "bert-base-cased"
-        self.model = BertModel.from_pretrained(self.model_name)
-        self.model.to(self.device)
-        self.model.resize_token_embeddings(28996 + 1)
+        self.attach_frozen_bert(
+            "model", self.model_name, vocab_size=28996 + 1, device=self.device
+        )
 
         # Initialize other embeddings
         self.segment_embedding = nn.Embedding(
@@ -96,6 +105,25 @@ class OwnBertEmbedding(BaseModel):
         self.position_embedding.to(self.device)
         self.token_type_embedding.to(self.device)
 
+        # Position ids of the longest supported sequence, sliced per call
+        self.register_position_ids(config.max_position_embeddings, self.device)
+
+        # Cache of the frozen bert features
+        self.feature_store = None
+        if config.feature_cache_dir is not None:
+            self.enable_feature_cache(config.feature_cache_dir)
+
+    def enable_feature_cache(self, store_dir: Path) -> None:
+        """
+        Caches the output of the frozen bert model in a feature store on disk. The
+        features of a sample are computed once (in eval mode) and read from the store
+        afterwards, e.g. in later epochs and folds. The store is keyed by the weights
+        of the bert model, so that features of another model are not reused.
+        :param store_dir: The directory of the feature store.
+        :return: None
+        """
+        self.feature_store = open_feature_store(store_dir, bert_fingerprint(self.model))
+
     def forward(self, x: SemanticInput) -> torch.Tensor:
         """
         Embed the input using Bert.
@@ -109,16 +137,12 @@ class OwnBertEmbedding(BaseModel):
 
         batch_size, sequence_length = input_ids.size()
 
-        # Create position ids
-        # TODO: Move this to encoding process
-        position_ids = torch.arange(sequence_length, dtype=torch.long).unsqueeze(0)
-        position_ids = position_ids % self.position_embedding.weight.size(0)
-        position_ids = position_ids.repeat(batch_size, 1)
-        position_ids = position_ids.to(self.device)
+        # Slice the position ids (no copy per batch)
+        position_ids = self._position_ids(sequence_length).expand(batch_size, -1)
 
         # Get embeddings
         with torch.no_grad():  # Don't train token embeddings
-            token_embeddings = self._model_pass(x)
+            token_embeddings = self._token_embeddings(x)
         segment_embeddings = self.segment_embedding(segment_ids)
         position_embeddings = self.position_embedding(position_ids)
         token_type_embeddings = self.token_type_embedding(token_type_ids)
@@ -145,15 +169,38 @@ class OwnBertEmbedding(BaseModel):
         embeddings = self.layer_norm(embeddings)
         return self.dropout(embeddings)
 
-    def _model_pass(self, x: SemanticInput) -> torch.Tensor:
+    def _token_embeddings(self, x: SemanticInput) -> torch.Tensor:
+        """
+        Get the output of the Bert model, from the feature store if enabled.
+        :param x: The input.
+        :return: The output of the Bert model.
+        """
+        if self.feature_store is None:
+            return self._model_pass(x)
+
+        ids = (x.input_ids, x.token_type_ids, x.attention_mask)
+        keys = sample_keys(*(tensor for tensor in ids if tensor is not None))
+        return self.feature_store.get_or_compute(
+            keys, lambda indices: self._model_pass(x, indices), self.device
+        )
+
+    def _model_pass(
+        self, x: SemanticInput, indices: torch.Tensor = None
+    ) -> torch.Tensor:
         """
         Pass the input through the Bert model.
         :param x: The input.
+        :param indices: The indices of the samples to pass. If None, all samples.
         :return: The output of the Bert model.
         """
         input_ids = x.input_ids
         token_type_ids = x.token_type_ids
         attention_mask = x.attention_mask
+        if indices is not None:
+            input_ids = input_ids[indices]
+            token_type_ids = token_type_ids[indices]
+            if attention_mask is not None:
+                attention_mask = attention_mask[indices]
         outputs = self.model(
             input_ids=input_ids,
             token_type_ids=token_type_ids,
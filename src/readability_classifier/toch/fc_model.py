@@ -23,6 +23,7 @@ class FullyConnectedModel(nn.Module):
         self.relu2 = nn.ReLU()
         self.dense3 = nn.Linear(16, config.output_length)
         self.sigmoid = nn.Sigmoid()
+        self.input_length_frozen = False
 
     def forward(self, x: ViStModelInput) -> torch.Tensor:
         """
@@ -46,6 +47,21 @@ class FullyConnectedModel(nn.Module):
         :param device: The device to put the new layer on.
         :return: The output.
         """
-        if input_length != self.dense1.in_features:
-            self.dense1 = nn.Linear(input_length, 64)
-            self.dense1 = self.dense1.to(device)
+        if input_length == self.dense1.in_features:
+            return
+        if self.input_length_frozen:
+            raise ValueError(
+                f"The input length is frozen at {self.dense1.in_features}, "
+                f"but got {input_length}."
+            )
+        self.dense1 = nn.Linear(input_length, 64)
+        self.dense1 = self.dense1.to(device)
+
+    def freeze_input_length(self) -> None:
+        """
+        Freezes the input length of the classification layers, e.g. before the model is
+        exported. Afterwards, a different input length raises an error instead of
+        replacing the first layer.
+        :return: None
+        """
+        self.input_length_frozen = True
@@ -1,6 +1,4 @@
-from enum import Enum
 from pathlib import Path
-from typing import Any
 
 from torch import nn
 from torch.utils.data import DataLoader
@@ -12,8 +10,14 @@ from src.readability_classifier.toch.models.structural_classifier import (
 )
 from src.readability_classifier.toch.models.vi_st_classifier import ViStClassifier
 from src.readability_classifier.toch.models.visual_classifier import VisualClassifier
+from src.readability_classifier.toch.options import Model
 from src.readability_classifier.toch.towards_classifier import TowardsClassifier
-from src.readability_classifier.utils.config import DEFAULT_MODEL_BATCH_SIZE
+from src.readability_classifier.utils.config import (
+    DEFAULT_KEEP_CHECKPOINTS,
+    DEFAULT_MODEL_BATCH_SIZE,
+    DEFAULT_NUM_WORKERS,
+    DEFAULT_PREFETCH_FACTOR,
+)
 
 
 class ClassifierBuilder:
@@ -28,6 +32,16 @@ class ClassifierBuilder:
     _batch_size: int = DEFAULT_MODEL_BATCH_SIZE
     _num_epochs: int = 20
     _learning_rate: float = 0.0015
+    _num_workers: int = DEFAULT_NUM_WORKERS
+    _prefetch_factor: int = DEFAULT_PREFETCH_FACTOR
+    _pin_memory: bool | None = None
+    _persistent_workers: bool = True
+    _mixed_precision: bool = False
+    _accumulation_steps: int = 1
+    _keep_checkpoints: int | None = DEFAULT_KEEP_CHECKPOINTS
+    _patience: int | None = None
+    _min_delta: float = 0.0
+    _validate_every: int = 1
 
     def set_model(self, model: nn.Module):
         self._model = model
@@ -46,12 +60,47 @@ class ClassifierBuilder:
         self._val_loader = val_loader
 
     def set_parameters(
-        self, store_dir: Path, batch_size: int, num_epochs: int, learning_rate: float
+        self,
+        store_dir: Path,
+        batch_size: int,
+        num_epochs: int,
+        learning_rate: float,
+        num_workers: int = DEFAULT_NUM_WORKERS,
+        mixed_precision: bool = False,
+        accumulation_steps: int = 1,
+        keep_checkpoints: int | None = DEFAULT_KEEP_CHECKPOINTS,
+        patience: int | None = None,
+        min_delta: float = 0.0,
+        validate_every: int = 1,
+        prefetch_factor: int = DEFAULT_PREFETCH_FACTOR,
+        pin_memory: bool | None = None,
+        persistent_workers: bool = True,
     ):
         self._store_dir = store_dir
         self._batch_size = batch_size
         self._num_epochs = num_epochs
         self._learning_rate = learning_rate
+        self.set_loader_options(
+            num_workers, prefetch_factor, pin_memory, persistent_workers
+        )
+        self._mixed_precision = mixed_precision
+        self._accumulation_steps = accumulation_steps
+        self._keep_checkpoints = keep_checkpoints
+        self._patience = patience
+        self._min_delta = min_delta
+        self._validate_every = validate_every
+
+    def set_loader_options(
+        self,
+        num_workers: int = DEFAULT_NUM_WORKERS,
+        prefetch_factor: int = DEFAULT_PREFETCH_FACTOR,
+        pin_memory: bool | None = None,
+        persistent_workers: bool = True,
+    ):
+        self._num_workers = num_workers
+        self._prefetch_factor = prefetch_factor
+        self._pin_memory = pin_memory
+        self._persistent_workers = persistent_workers
 
     def set_evaluation_loader(self, test_loader: DataLoader):
         self._test_loader = test_loader
@@ -63,94 +112,35 @@ class ClassifierBuilder:
         self._batch_size = batch_size
 
     def build(self):
-        if self._model == Model.TOWARDS:
-            return TowardsClassifier(
-                model_path=self._model_path,
-                train_dataset=self._train_dataset,
-                test_dataset=self._test_dataset,
-                train_loader=self._train_loader,
-                val_loader=self._val_loader,
-                test_loader=self._test_loader,
-                store_dir=self._store_dir,
-                batch_size=self._batch_size,
-                num_epochs=self._num_epochs,
-                learning_rate=self._learning_rate,
-            )
-        if self._model == Model.STRUCTURAL:
-            return StructuralClassifier(
-                model_path=self._model_path,
-                train_dataset=self._train_dataset,
-                test_dataset=self._test_dataset,
-                train_loader=self._train_loader,
-                val_loader=self._val_loader,
-                test_loader=self._test_loader,
-                store_dir=self._store_dir,
-                batch_size=self._batch_size,
-                num_epochs=self._num_epochs,
-                learning_rate=self._learning_rate,
-            )
-        if self._model == Model.VISUAL:
-            return VisualClassifier(
-                model_path=self._model_path,
-                train_dataset=self._train_dataset,
-                test_dataset=self._test_dataset,
-                train_loader=self._train_loader,
-                val_loader=self._val_loader,
-                test_loader=self._test_loader,
-                store_dir=self._store_dir,
-                batch_size=self._batch_size,
-                num_epochs=self._num_epochs,
-                learning_rate=self._learning_rate,
-            )
-        if self._model == Model.SEMANTIC:
-            return SemanticClassifier(
-                model_path=self._model_path,
-                train_dataset=self._train_dataset,
-                test_dataset=self._test_dataset,
-                train_loader=self._train_loader,
-                val_loader=self._val_loader,
-                test_loader=self._test_loader,
-                store_dir=self._store_dir,
-                batch_size=self._batch_size,
-                num_epochs=self._num_epochs,
-                learning_rate=self._learning_rate,
-            )
-        if self._model == Model.VIST:
-            return ViStClassifier(
-                model_path=self._model_path,
-                train_dataset=self._train_dataset,
-                test_dataset=self._test_dataset,
-                train_loader=self._train_loader,
-                val_loader=self._val_loader,
-                test_loader=self._test_loader,
-                store_dir=self._store_dir,
-                batch_size=self._batch_size,
-                num_epochs=self._num_epochs,
-                learning_rate=self._learning_rate,
-            )
-        raise ValueError(f"Unknown model {self._model}")
-
-
-class Model(Enum):
-    """
-    Enum for the different models.
-    """
-
-    TOWARDS = "TOWARDS"
-    STRUCTURAL = "STRUCTURAL"
-    VISUAL = "VISUAL"
-    SEMANTIC = "SEMANTIC"
-    VIST = "VIST"
-
-    @classmethod
-    def _missing_(cls, value: object) -> Any:
-        raise ModelNotSupportedException(f"{value} is not a supported model.")
-
-    def __str__(self) -> str:
-        return self.value
-
-
-class ModelNotSupportedException(Exception):
-    """
-    Exception is thrown whenever a model is not supported.
-    """
+        classifiers = {
+            Model.TOWARDS: TowardsClassifier,
+            Model.STRUCTURAL: StructuralClassifier,
+            Model.VISUAL: VisualClassifier,
+            Model.SEMANTIC: SemanticClassifier,
+            Model.VIST: ViStClassifier,
+        }
+        if self._model not in classifiers:
+            raise ValueError(f"Unknown model {self._model}")
+
+        return classifiers[self._model](
+            model_path=self._model_path,
+            train_dataset=self._train_dataset,
+            test_dataset=self._test_dataset,
+            train_loader=self._train_loader,
+            val_loader=self._val_loader,
+            test_loader=self._test_loader,
+            store_dir=self._store_dir,
+            batch_size=self._batch_size,
+            num_epochs=self._num_epochs,
+            learning_rate=self._learning_rate,
+            num_workers=self._num_workers,
+            prefetch_factor=self._prefetch_factor,
+            pin_memory=self._pin_memory,
+            persistent_workers=self._persistent_workers,
+            mixed_precision=self._mixed_precision,
+            accumulation_steps=self._accumulation_steps,
+            keep_checkpoints=self._keep_checkpoints,
+            patience=self._patience,
+            min_delta=self._min_delta,
+            validate_every=self._validate_every,
+        )
@@ -1,76 +1,55 @@
 import logging
-from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from pathlib import Path
 
 from src.readability_classifier.encoders.dataset_utils import (
     ReadabilityDataset,
+    collate_readability_batch,
     dataset_to_dataloader,
     load_encoded_dataset,
     split_train_test,
     split_train_val,
 )
+from src.readability_classifier.model_runner import (
+    ModelRunnerInterface,
+    aggregate_predictions,
+)
+from src.readability_classifier.toch.export import (
+    ExportedPredictor,
+    benchmark_latency,
+    export_model,
+    is_exported_model,
+)
 from src.readability_classifier.toch.model_buider import ClassifierBuilder
+from src.readability_classifier.toch.options import ExportMethod, Model
+from src.readability_classifier.toch.quantization import (
+    compare_quantized,
+    move_to_cpu,
+    quantize_model,
+)
 from src.readability_classifier.toch.towards_classifier import TowardsClassifier
+from src.readability_classifier.utils.config import (
+    DEFAULT_MODEL_BATCH_SIZE,
+    DEFAULT_NUM_WORKERS,
+    DEFAULT_PREFETCH_FACTOR,
+)
+from src.readability_classifier.utils.utils import save_content_to_file
 
 
-class ModelRunnerInterface(ABC):
+def _loader_options(parsed_args) -> dict:
     """
-    Interface for model runners.
+    Returns the data loader options of the parsed arguments.
+    :param parsed_args: Parsed arguments.
+    :return: The keyword arguments of dataset_to_dataloader.
     """
-
-    def run_train(self, parsed_args, encoded_data: ReadabilityDataset):
-        """
-        Runs the training of the readability classifier.
-        :param parsed_args: Parsed arguments.
-        :param encoded_data: The encoded dataset.
-        :return: None
-        """
-        k_fold = parsed_args.k_fold
-        if k_fold == 0:
-            self._run_without_cross_validation(parsed_args, encoded_data)
-        else:
-            self._run_with_cross_validation(parsed_args, encoded_data)
-
-    @abstractmethod
-    def _run_without_cross_validation(
-        self, parsed_args, encoded_data: ReadabilityDataset
-    ):
-        """
-        Runs the training of the readability classifier without cross-validation.
-        :param parsed_args: Parsed arguments.
-        :param encoded_data: The encoded dataset.
-        :return: None
-        """
-        pass
-
-    @abstractmethod
-    def _run_with_cross_validation(self, parsed_args, encoded_data: ReadabilityDataset):
-        """
-        Runs the training of the readability classifier with cross-validation.
-        :param parsed_args: Parsed arguments.
-        :param encoded_data: The encoded dataset.
-        :return: None
-        """
-        pass
-
-    @abstractmethod
-    def run_predict(self, parsed_args, encoded_data: ReadabilityDataset) -> any:
-        """
-        Runs the prediction of the readability classifier.
-        :param parsed_args: Parsed arguments.
-        :param encoded_data: A single encoded data point.
-        :return: None
-        """
-        pass
-
-    @abstractmethod
-    def run_evaluate(self, parsed_args, encoded_data: ReadabilityDataset):
-        """
-        Runs the evaluation of the readability classifier.
-        :param parsed_args: Parsed arguments.
-        :param encoded_data: The encoded dataset.
-        :return: None
-        """
-        pass
+    return {
+        "num_workers": getattr(parsed_args, "num_workers", DEFAULT_NUM_WORKERS),
+        "prefetch_factor": getattr(
+            parsed_args, "prefetch_factor", DEFAULT_PREFETCH_FACTOR
+        ),
+        "pin_memory": getattr(parsed_args, "pin_memory", None),
+        "persistent_workers": getattr(parsed_args, "persistent_workers", True),
+    }
 
 
 class TorchModelRunner(ModelRunnerInterface):
@@ -95,21 +74,48 @@ class TorchModelRunner(ModelRunnerInterface):
         batch_size = parsed_args.batch_size
         num_epochs = parsed_args.epochs
         learning_rate = parsed_args.learning_rate
+        loader_options = _loader_options(parsed_args)
+        mixed_precision = parsed_args.mixed_precision
+        accumulation_steps = parsed_args.accumulation_steps
+        keep_checkpoints = (
+            None if parsed_args.keep_checkpoints < 0 else parsed_args.keep_checkpoints
+        )
+        patience = parsed_args.patience
+        min_delta = parsed_args.min_delta
+        validate_every = parsed_args.validate_every
 
         # Split the dataset
         train_test = split_train_test(encoded_data)
         train_dataset, test_dataset = train_test.train_set, train_test.test_set
         train_val = split_train_val(train_dataset)
         train_dataset, test_dataset = train_val.train_set, train_val.val_set
-        train_loader = dataset_to_dataloader(train_dataset, batch_size)
-        val_loader = dataset_to_dataloader(test_dataset, batch_size)
-        test_loader = dataset_to_dataloader(train_test.test_set, batch_size)
+        train_loader = dataset_to_dataloader(
+            train_dataset, batch_size, **loader_options
+        )
+        val_loader = dataset_to_dataloader(
+            test_dataset, batch_size, shuffle=False, **loader_options
+        )
+        test_loader = dataset_to_dataloader(
+            train_test.test_set, batch_size, shuffle=False, **loader_options
+        )
 
         # Build the model
         builder = ClassifierBuilder()
         builder.set_model(model)
         builder.set_dataloaders(train_loader, test_loader, val_loader)
-        builder.set_parameters(store_dir, batch_size, num_epochs, learning_rate)
+        builder.set_parameters(
+            store_dir,
+            batch_size,
+            num_epochs,
+            learning_rate,
+            mixed_precision=mixed_precision,
+            accumulation_steps=accumulation_steps,
+            keep_checkpoints=keep_checkpoints,
+            patience=patience,
+            min_delta=min_delta,
+            validate_every=validate_every,
+            **loader_options,
+        )
         classifier = builder.build()
 
         # Train the model
@@ -132,6 +138,17 @@ class TorchModelRunner(ModelRunnerInterface):
         batch_size = parsed_args.batch_size
         num_epochs = parsed_args.epochs
         learning_rate = parsed_args.learning_rate
+        loader_options = _loader_options(parsed_args)
+        mixed_precision = parsed_args.mixed_precision
+        accumulation_steps = parsed_args.accumulation_steps
+        keep_checkpoints = (
+            None if parsed_args.keep_checkpoints < 0 else parsed_args.keep_checkpoints
+        )
+        patience = parsed_args.patience
+        min_delta = parsed_args.min_delta
+        validate_every = parsed_args.validate_every
+        k_fold = parsed_args.k_fold
+        fold_workers = parsed_args.fold_workers
 
         # Build the model
         train_test = split_train_test(encoded_data)
@@ -141,51 +158,121 @@ class TorchModelRunner(ModelRunnerInterface):
         builder = ClassifierBuilder()
         builder.set_model(model)
         builder.set_datasets(train_dataset, test_dataset)
-        builder.set_parameters(store_dir, batch_size, num_epochs, learning_rate)
+        builder.set_parameters(
+            store_dir,
+            batch_size,
+            num_epochs,
+            learning_rate,
+            mixed_precision=mixed_precision,
+            accumulation_steps=accumulation_steps,
+            keep_checkpoints=keep_checkpoints,
+            patience=patience,
+            min_delta=min_delta,
+            validate_every=validate_every,
+            **loader_options,
+        )
         classifier = builder.build()
 
         # Train the model
-        classifier.k_fold_cv()
+        classifier.k_fold_cv(k=k_fold, fold_workers=fold_workers)
 
-    def run_predict(self, parsed_args):
+    def run_predict(
+        self, parsed_args, encoded_dataset: ReadabilityDataset
+    ) -> tuple[str, float]:
         """
-        Runs the prediction of the readability classifier.
+        Runs the prediction of the readability classifier. Models exported with the
+        EXPORT task are run without the Python model code.
         :param parsed_args: Parsed arguments.
-        :return: None
+        :param encoded_dataset: A dataset of encoded data points.
+        :return: The prediction as binary and as float (1 = readable, 0 = not readable).
         """
         # Get the parsed arguments
         model_path = parsed_args.model
-        snippet_path = parsed_args.input
+        batch_size = getattr(parsed_args, "batch_size", None)
 
-        # Load the model
-        classifier = TowardsClassifier()
-        classifier.load(model_path)
+        # Predict the snippets in batches with the exported or the eager model
+        if is_exported_model(model_path):
+            predictor = ExportedPredictor(model_path)
+            predictions = predictor.predict(
+                encoded_dataset, batch_size or DEFAULT_MODEL_BATCH_SIZE
+            )
+        else:
+            classifier = TowardsClassifier(model_path=model_path)
+            predictions = classifier.predict_encoded(encoded_dataset, batch_size)
 
-        # Predict the readability of the snippet
-        with open(snippet_path) as snippet_file:
-            snippet = snippet_file.read()
-            readability = classifier.predict(snippet)
-            logging.info(f"Readability of snippet: {readability}")
+        return aggregate_predictions(encoded_dataset, predictions)
 
-    def run_evaluate(self, parsed_args):
+    def run_export(self, parsed_args):
         """
-        Runs the evaluation of the readability classifier.
+        Exports a trained readability classifier for inference.
         :param parsed_args: Parsed arguments.
         :return: None
         """
         # Get the parsed arguments
+        model = parsed_args.model
         model_path = parsed_args.load
         data_dir = parsed_args.input
+        output_path = parsed_args.output
+        method = parsed_args.method
+        batch_size = parsed_args.batch_size
+        benchmark = parsed_args.benchmark
+
+        # Load the dataset providing the example inputs
+        if data_dir is None:
+            raise ValueError("The torch export requires an encoded dataset (--input).")
+        encoded_data = load_encoded_dataset(data_dir)
+
+        # Load the model
+        builder = ClassifierBuilder()
+        builder.set_model(model)
+        builder.set_model_path(model_path)
+        builder.set_batch_size(batch_size)
+        classifier = builder.build()
+
+        # Export the model with an example batch (batch size > 1 for the batch dim)
+        num_samples = len(encoded_data)
+        example_batch = collate_readability_batch(
+            [encoded_data[i % num_samples] for i in range(max(2, batch_size))]
+        )
+        export_model(classifier, example_batch, output_path, method)
+
+        # Compare the latency of the eager and the exported model
+        if benchmark and method == ExportMethod.ONNX:
+            logging.warning("The latency of ONNX models is not benchmarked.")
+        elif benchmark:
+            predictor = ExportedPredictor(output_path)
+            stats = benchmark_latency(classifier, predictor, encoded_data)
+            save_content_to_file(
+                "\n".join(latency.to_json() for latency in stats),
+                Path(f"{output_path}.benchmark.json"),
+            )
+
+    def run_quantize(self, parsed_args):
+        """
+        Quantizes a trained readability classifier for cpu inference. The quantized
+        model is exported as TorchScript and compared with the float model.
+        :param parsed_args: Parsed arguments.
+        :return: None
+        """
+        # Get the parsed arguments
         model = parsed_args.model
+        model_path = parsed_args.load
+        data_dir = parsed_args.input
+        output_path = parsed_args.output
+        mode = parsed_args.mode
+        calibration_batches = parsed_args.calibration_batches
         batch_size = parsed_args.batch_size
+        num_workers = parsed_args.num_workers
 
         # Load the dataset
         encoded_data = load_encoded_dataset(data_dir)
-
-        # TODO: Split once and store the split
-        logging.warning("The test set used is not unseen data!")
-        test_dataset = split_train_test(encoded_data).test_set
-        test_loader = dataset_to_dataloader(test_dataset, batch_size)
+        split = split_train_test(encoded_data)
+        calibration_loader = dataset_to_dataloader(
+            split.train_set, batch_size, shuffle=True, num_workers=num_workers
+        )
+        test_loader = dataset_to_dataloader(
+            split.test_set, batch_size, shuffle=False, num_workers=num_workers
+        )
 
         # Load the model
         builder = ClassifierBuilder()
@@ -194,6 +281,41 @@ class TorchModelRunner(ModelRunnerInterface):
         builder.set_model_path(model_path)
         builder.set_batch_size(batch_size)
         classifier = builder.build()
+        move_to_cpu(classifier)
 
-        # Evaluate the model
-        classifier.evaluate()
+        # Quantize the model and compare it with the float model
+        quantized_model = quantize_model(
+            classifier, calibration_loader, mode, calibration_batches
+        )
+        report = compare_quantized(classifier, quantized_model, mode)
+        save_content_to_file(report.to_json(), Path(f"{output_path}.quantization.json"))
+
+        # Export the quantized model
+        classifier.model = quantized_model
+        example_batch = next(iter(test_loader))
+        export_model(classifier, example_batch, output_path, ExportMethod.TRACE)
+
+    def _load_scorer(
+        self, parsed_args
+    ) -> Callable[[ReadabilityDataset], Sequence[float]]:
+        """
+        Loads the model to evaluate once.
+        :param parsed_args: Parsed arguments.
+        :return: The function scoring encoded snippets.
+        """
+        # Get the parsed arguments
+        model_path = parsed_args.load
+        model = getattr(parsed_args, "model", Model.TOWARDS)
+        batch_size = getattr(parsed_args, "batch_size", None)
+
+        # Load the model
+        builder = ClassifierBuilder()
+        builder.set_model(model)
+        builder.set_model_path(model_path)
+        builder.set_batch_size(batch_size or DEFAULT_MODEL_BATCH_SIZE)
+        builder.set_loader_options(**_loader_options(parsed_args))
+        classifier = builder.build()
+
+        return lambda encoded: classifier.predict_encoded(
+            encoded, batch_size, classifier.num_workers
+        )
@@ -34,6 +34,7 @@ class SemanticClassifier(BaseClassifier):
         batch_size: int = DEFAULT_MODEL_BATCH_SIZE,
         num_epochs: int = 20,
         learning_rate: float = 0.0015,
+        **kwargs,
     ):
         """
         Initializes the classifier.
@@ -44,6 +45,7 @@ class SemanticClassifier(BaseClassifier):
         :param batch_size: The batch size.
         :param num_epochs: The number of epochs.
         :param learning_rate: The learning rate.
+        :param kwargs: Further parameters passed to the BaseClassifier.
         """
         if model_path is None:
             model = SemanticModel.build_from_config()
@@ -66,6 +68,7 @@ class SemanticClassifier(BaseClassifier):
             batch_size=batch_size,
             num_epochs=num_epochs,
             learning_rate=learning_rate,
+            **kwargs,
         )
 
     def _batch_to_input(self, batch: dict) -> ModelInput:
@@ -35,6 +35,7 @@ class ViStClassifier(BaseClassifier):
         batch_size: int = DEFAULT_MODEL_BATCH_SIZE,
         num_epochs: int = 20,
         learning_rate: float = 0.0015,
+        **kwargs,
     ):
         """
         Initializes the classifier.
@@ -45,6 +46,7 @@ class ViStClassifier(BaseClassifier):
         :param batch_size: The batch size.
         :param num_epochs: The number of epochs.
         :param learning_rate: The learning rate.
+        :param kwargs: Further parameters passed to the BaseClassifier.
         """
         if model_path is None:
             model = ViStModel.build_from_config()
@@ -67,6 +69,7 @@ class ViStClassifier(BaseClassifier):
             batch_size=batch_size,
             num_epochs=num_epochs,
             learning_rate=learning_rate,
+            **kwargs,
         )
 
     def _batch_to_input(self, batch: dict) -> ModelInput:
@@ -0,0 +1,54 @@
+from enum import Enum
+from typing import Any
+
+DEFAULT_CALIBRATION_BATCHES = 8
+
+
+class Model(Enum):
+    """
+    Enum for the different models.
+    """
+
+    TOWARDS = "TOWARDS"
+    STRUCTURAL = "STRUCTURAL"
+    VISUAL = "VISUAL"
+    SEMANTIC = "SEMANTIC"
+    VIST = "VIST"
+
+    @classmethod
+    def _missing_(cls, value: object) -> Any:
+        raise ModelNotSupportedException(f"{value} is not a supported model.")
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class ModelNotSupportedException(Exception):
+    """
+    Exception is thrown whenever a model is not supported.
+    """
+
+
+class ExportMethod(Enum):
+    """
+    Enum for the different export methods.
+    """
+
+    TRACE = "trace"  # TorchScript via torch.jit.trace
+    EXPORT = "export"  # torch.export
+    ONNX = "onnx"  # ONNX via torch.onnx.export, run with the onnx model runner
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class QuantizationMode(Enum):
+    """
+    Enum for the different quantization modes.
+    """
+
+    DYNAMIC = "dynamic"  # int8 weights of the linear and lstm layers
+    STATIC = "static"  # Additionally int8 conv stacks, calibrated on a sample
+
+    def __str__(self) -> str:
+        return self.value
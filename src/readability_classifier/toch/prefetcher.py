@@ -0,0 +1,182 @@
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
+import torch
+from torch.utils.data import DataLoader
+
+DEFAULT_PREFETCH_BATCHES = 2  # Number of batches staged ahead of the computation
+
+
+@dataclass(frozen=True)
+class _Failure:
+    """
+    Wraps an exception raised while staging a batch in the background thread.
+    """
+
+    error: BaseException
+
+
+_END = object()  # Marks the end of the data loader
+
+
+def _record_stream(value: object, stream: torch.cuda.Stream) -> None:
+    """
+    Marks all cuda tensors of a (nested) batch as used by the given stream, so that the
+    caching allocator does not reuse their memory while the stream still needs them.
+    :param value: The batch or a part of it.
+    :param stream: The stream that uses the tensors.
+    :return: None
+    """
+    if isinstance(value, torch.Tensor):
+        if value.is_cuda:
+            value.record_stream(stream)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _record_stream(item, stream)
+    elif isinstance(value, list | tuple):
+        for item in value:
+            _record_stream(item, stream)
+
+
+def _put(batches: queue.Queue, item: object, stop: threading.Event) -> bool:
+    """
+    Puts an item into the queue, waiting for free space until the consumer stops.
+    :param batches: The queue.
+    :param item: The item.
+    :param stop: Set when the consumer stops iterating.
+    :return: True if the item was put, False if the consumer stopped.
+    """
+    while not stop.is_set():
+        try:
+            batches.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class BatchPrefetcher:
+    """
+    Wraps a data loader and stages the next batch on the device while the current batch
+    is computed. On cuda, the host-to-device copy runs on a side stream. Otherwise, the
+    batches are loaded and staged by a background thread. The batches and their order
+    are the same as when iterating the data loader directly.
+    """
+
+    def __init__(
+        self,
+        loader: DataLoader,
+        to_device: Callable[[dict], dict],
+        device: torch.device,
+        prefetch_batches: int = DEFAULT_PREFETCH_BATCHES,
+    ):
+        """
+        Initializes the prefetcher.
+        :param loader: The data loader.
+        :param to_device: Sends a collated batch to the device.
+        :param device: The device.
+        :param prefetch_batches: The number of batches staged ahead (cpu only).
+        """
+        self.loader = loader
+        self.to_device = to_device
+        self.device = device
+        self.prefetch_batches = prefetch_batches
+
+    def __len__(self) -> int:
+        """
+        Return the number of batches of the data loader.
+        """
+        return len(self.loader)
+
+    def __iter__(self) -> Iterator[dict]:
+        """
+        Iterate over the batches of the data loader, staged on the device.
+        """
+        if self.device.type == "cuda":
+            return self._iter_cuda()
+        return self._iter_thread()
+
+    def _iter_cuda(self) -> Iterator[dict]:
+        """
+        Iterate over the batches and copy the next batch on a side stream.
+        :return: The batches on the device.
+        """
+        stream = torch.cuda.Stream(device=self.device)
+        current_stream = torch.cuda.current_stream(self.device)
+        iterator = iter(self.loader)
+
+        next_batch = self._stage_on_stream(iterator, stream)
+        while next_batch is not None:
+            # Wait for the copy of the batch before it is used
+            current_stream.wait_stream(stream)
+            batch = next_batch
+            _record_stream(batch, current_stream)
+
+            # Start copying the following batch
+            next_batch = self._stage_on_stream(iterator, stream)
+            yield batch
+
+    def _stage_on_stream(
+        self, iterator: Iterator[dict], stream: torch.cuda.Stream
+    ) -> dict | None:
+        """
+        Loads the next batch and sends it to the device on the given stream.
+        :param iterator: The iterator of the data loader.
+        :param stream: The side stream.
+        :return: The batch on the device or None if the data loader is exhausted.
+        """
+        try:
+            batch = next(iterator)
+        except StopIteration:
+            return None
+        with torch.cuda.stream(stream):
+            return self.to_device(batch)
+
+    def _iter_thread(self) -> Iterator[dict]:
+        """
+        Iterate over the batches while a background thread loads and stages the next
+        ones.
+        :return: The batches on the device.
+        """
+        # Create the iterator in this thread, so that workers and seeds are set up here
+        iterator = iter(self.loader)
+        batches = queue.Queue(maxsize=self.prefetch_batches)
+        stop = threading.Event()
+
+        thread = threading.Thread(
+            target=self._produce, args=(iterator, batches, stop), daemon=True
+        )
+        thread.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is _END:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+    def _produce(
+        self, iterator: Iterator[dict], batches: queue.Queue, stop: threading.Event
+    ) -> None:
+        """
+        Loads and stages the batches in the background thread until the data loader
+        is exhausted or the consumer stops. Exceptions are forwarded to the consumer.
+        :param iterator: The iterator of the data loader.
+        :param batches: The queue of the staged batches.
+        :param stop: Set when the consumer stops iterating.
+        :return: None
+        """
+        try:
+            for batch in iterator:
+                if not _put(batches, self.to_device(batch), stop):
+                    return
+        except BaseException as e:  # Forwarded to the consuming thread
+            _put(batches, _Failure(e), stop)
+            return
+        _put(batches, _END, stop)
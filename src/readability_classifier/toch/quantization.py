@@ -0,0 +1,289 @@
+import copy
+import io
+import json
+import logging
+from dataclasses import asdict, dataclass, fields
+from itertools import islice
+
+import torch
+from torch import nn
+from torch.ao.quantization import (
+    default_dynamic_qconfig,
+    get_default_qconfig_mapping,
+    quantize_dynamic,
+)
+from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+from torch.utils.data import DataLoader, Dataset
+
+from src.readability_classifier.encoders.dataset_utils import collate_readability_batch
+from src.readability_classifier.toch.base_classifier import (
+    BaseClassifier,
+    EvaluationStats,
+)
+from src.readability_classifier.toch.export import (
+    DEFAULT_BENCHMARK_BATCH_SIZES,
+    DEFAULT_BENCHMARK_REPEATS,
+    freeze_input_lengths,
+    median_latency_ms,
+)
+from src.readability_classifier.toch.extractors.structural_extractor import (
+    StructuralExtractor,
+)
+from src.readability_classifier.toch.extractors.visual_extractor import VisualExtractor
+from src.readability_classifier.toch.fc_model import FullyConnectedModel
+from src.readability_classifier.toch.options import (
+    DEFAULT_CALIBRATION_BATCHES,
+    QuantizationMode,
+)
+
+CONV_EXTRACTORS = (StructuralExtractor, VisualExtractor)  # Statically quantized
+DYNAMIC_MODULES = (FullyConnectedModel, nn.LSTM)  # Dynamically quantized
+
+
+@dataclass(frozen=True)
+class QuantizedLatency:
+    """
+    Data class for the latency of the float and the quantized model at a batch size.
+    """
+
+    batch_size: int
+    float_ms: float
+    quantized_ms: float
+
+    @property
+    def speedup(self) -> float:
+        """
+        The speedup of the quantized model over the float model.
+        """
+        return self.float_ms / self.quantized_ms
+
+
+@dataclass(frozen=True)
+class QuantizationReport:
+    """
+    Data class comparing a quantized model with its float model. Contains the
+    evaluation stats, the size of the weights and the latency of both models.
+    """
+
+    mode: str
+    float_stats: EvaluationStats
+    quantized_stats: EvaluationStats
+    float_mb: float
+    quantized_mb: float
+    latencies: list[QuantizedLatency]
+
+    @property
+    def deltas(self) -> dict[str, float]:
+        """
+        The change of each evaluation metric caused by the quantization.
+        """
+        return {
+            field.name: getattr(self.quantized_stats, field.name)
+            - getattr(self.float_stats, field.name)
+            for field in fields(EvaluationStats)
+        }
+
+    def to_json(self) -> str:
+        """
+        Convert to json.
+        :return: Returns the json string.
+        """
+        report = asdict(self)
+        report["deltas"] = self.deltas
+        for latency, stats in zip(report["latencies"], self.latencies, strict=True):
+            latency["speedup"] = stats.speedup
+        return json.dumps(report)
+
+
+def move_to_cpu(classifier: BaseClassifier) -> None:
+    """
+    Moves the classifier to the cpu, where the quantized kernels run. Mixed precision
+    is disabled, as autocasting does not apply to quantized models.
+    :param classifier: The classifier.
+    :return: None
+    """
+    classifier.move_to(torch.device("cpu"))
+    classifier.mixed_precision = False
+
+
+def _set_submodule(model: nn.Module, name: str, module: nn.Module) -> None:
+    """
+    Replaces the submodule with the given (dotted) name.
+    :param model: The model.
+    :param name: The name of the submodule.
+    :param module: The new submodule.
+    :return: None
+    """
+    parent_name, _, child_name = name.rpartition(".")
+    parent = model.get_submodule(parent_name) if parent_name else model
+    setattr(parent, child_name, module)
+
+
+def quantize_model(
+    classifier: BaseClassifier,
+    calibration_loader: DataLoader,
+    mode: QuantizationMode = QuantizationMode.DYNAMIC,
+    num_batches: int = DEFAULT_CALIBRATION_BATCHES,
+) -> nn.Module:
+    """
+    Quantizes a copy of the model of the classifier for cpu inference. The linear
+    layers of the classification layers and the lstm layers get dynamically
+    quantized int8 weights. In static mode, the conv stacks of the structural and
+    visual extractor are quantized with FX graph mode, calibrated on the first
+    batches of the loader.
+    :param classifier: The classifier with the trained model on the cpu.
+    :param calibration_loader: The loader of the calibration data.
+    :param mode: The quantization mode.
+    :param num_batches: The number of calibration batches (at least 1).
+    :return: The quantized model.
+    """
+    if num_batches < 1:
+        raise ValueError(
+            f"At least one calibration batch is required, got {num_batches}."
+        )
+    batches = [
+        classifier._batch_to_input(classifier._batch_to_device(batch))
+        for batch in islice(calibration_loader, num_batches)
+    ]
+    if not batches:
+        raise ValueError("No calibration data provided.")
+
+    model = copy.deepcopy(classifier.model).eval()
+
+    # Record the inputs of the conv extractors while freezing the input length
+    extractors = {
+        name: module
+        for name, module in model.named_modules()
+        if isinstance(module, CONV_EXTRACTORS)
+    }
+    example_inputs = {}
+    hooks = [
+        module.register_forward_pre_hook(
+            lambda _, args, name=name: example_inputs.setdefault(name, args)
+        )
+        for name, module in extractors.items()
+    ]
+    freeze_input_lengths(model, batches[0])
+    for hook in hooks:
+        hook.remove()
+
+    if mode == QuantizationMode.STATIC:
+        qconfig_mapping = get_default_qconfig_mapping(torch.backends.quantized.engine)
+        for name, module in extractors.items():
+            prepared = prepare_fx(module, qconfig_mapping, example_inputs[name])
+            _set_submodule(model, name, prepared)
+
+        # Record the activation ranges of the conv stacks
+        with torch.no_grad():
+            for model_input in batches:
+                model(model_input)
+
+        for name in extractors:
+            _set_submodule(model, name, convert_fx(model.get_submodule(name)))
+
+    qconfig_spec = {
+        name: default_dynamic_qconfig
+        for name, module in model.named_modules()
+        if isinstance(module, DYNAMIC_MODULES)
+    }
+    quantize_dynamic(model, qconfig_spec, dtype=torch.qint8, inplace=True)
+    logging.info(f"Model quantized ({mode})")
+    return model
+
+
+def _size_mb(model: nn.Module) -> float:
+    """
+    Calculates the size of the serialized weights of a model.
+    :param model: The model.
+    :return: The size in megabytes.
+    """
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes / 1e6
+
+
+def _median_latencies(
+    classifier: BaseClassifier,
+    model: nn.Module,
+    dataset: Dataset,
+    batch_sizes: tuple[int, ...],
+    repeats: int,
+) -> list[float]:
+    """
+    Measures the median latency of a model for each batch size.
+    :param classifier: The classifier converting the batches to model inputs.
+    :param model: The model.
+    :param dataset: The encoded samples, repeated to fill the batches if needed.
+    :param batch_sizes: The batch sizes.
+    :param repeats: The number of measured runs per batch size.
+    :return: The latency in milliseconds for each batch size.
+    """
+    latencies = []
+    for batch_size in batch_sizes:
+        samples = [dataset[i % len(dataset)] for i in range(batch_size)]
+        batch = classifier._batch_to_device(collate_readability_batch(samples))
+        model_input = classifier._batch_to_input(batch)
+
+        def run(model_input=model_input):
+            with torch.inference_mode():
+                model(model_input)
+
+        latencies.append(median_latency_ms(run, classifier.device, repeats))
+    return latencies
+
+
+def compare_quantized(
+    classifier: BaseClassifier,
+    quantized_model: nn.Module,
+    mode: QuantizationMode,
+    batch_sizes: tuple[int, ...] = DEFAULT_BENCHMARK_BATCH_SIZES,
+    repeats: int = DEFAULT_BENCHMARK_REPEATS,
+) -> QuantizationReport:
+    """
+    Evaluates the float and the quantized model on the test data of the classifier
+    and compares their size and latency.
+    :param classifier: The classifier with the float model and test loader on the cpu.
+    :param quantized_model: The quantized model.
+    :param mode: The quantization mode of the model.
+    :param batch_sizes: The batch sizes to measure the latency at.
+    :param repeats: The number of measured runs per batch size.
+    :return: The report.
+    """
+    float_model = classifier.model
+    dataset = classifier.test_loader.dataset
+
+    float_stats = classifier.evaluate()
+    float_ms = _median_latencies(classifier, float_model, dataset, batch_sizes, repeats)
+
+    classifier.model = quantized_model
+    try:
+        quantized_stats = classifier.evaluate()
+        quantized_ms = _median_latencies(
+            classifier, quantized_model, dataset, batch_sizes, repeats
+        )
+    finally:
+        classifier.model = float_model
+
+    report = QuantizationReport(
+        mode=str(mode),
+        float_stats=float_stats,
+        quantized_stats=quantized_stats,
+        float_mb=_size_mb(float_model),
+        quantized_mb=_size_mb(quantized_model),
+        latencies=[
+            QuantizedLatency(batch_size, float_latency, quantized_latency)
+            for batch_size, float_latency, quantized_latency in zip(
+                batch_sizes, float_ms, quantized_ms, strict=True
+            )
+        ],
+    )
+    logging.info(
+        f"Quantization ({mode}): accuracy delta {report.deltas['accuracy']:+.4f}, "
+        f"size {report.float_mb:.1f} MB -> {report.quantized_mb:.1f} MB"
+    )
+    for latency in report.latencies:
+        logging.info(
+            f"Batch size {latency.batch_size}: float {latency.float_ms:.2f} ms, "
+            f"quantized {latency.quantized_ms:.2f} ms ({latency.speedup:.2f}x)"
+        )
+    return report
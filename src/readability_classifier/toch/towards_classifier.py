@@ -11,7 +11,9 @@ from src.readability_classifier.utils.config import (
     DEFAULT_MODEL_BATCH_SIZE,
     ModelInput,
     SemanticInput,
+    StructuralInput,
     TowardsInput,
+    VisualInput,
 )
 
 
@@ -39,6 +41,7 @@ class TowardsClassifier(BaseClassifier):
         batch_size: int = DEFAULT_MODEL_BATCH_SIZE,
         num_epochs: int = 20,
         learning_rate: float = 0.0015,
+        **kwargs,
     ):
         """
         Initializes the classifier.
@@ -49,6 +52,7 @@ class TowardsClassifier(BaseClassifier):
         :param batch_size: The batch size.
         :param num_epochs: The number of epochs.
         :param learning_rate: The learning rate.
+        :param kwargs: Further parameters passed to the BaseClassifier.
         """
         if model_path is None:
             model = TowardsModel.build_from_config()
@@ -71,6 +75,7 @@ class TowardsClassifier(BaseClassifier):
             batch_size=batch_size,
             num_epochs=num_epochs,
             learning_rate=learning_rate,
+            **kwargs,
         )
 
     def _batch_to_input(self, batch: dict) -> ModelInput:
@@ -99,4 +104,4 @@ class TowardsClassifier(BaseClassifier):
             segment_ids=segment_ids,
         )
 
-        return TowardsInput(matrix, semantic_input, image)
+        return TowardsInput(StructuralInput(matrix), semantic_input, VisualInput(image))
@@ -2,7 +2,14 @@ from dataclasses import dataclass
 
 import torch
 
-DEFAULT_MODEL_BATCH_SIZE = 8  # Small - avoid CUDA out of memory errors on local machine
+# The defaults are defined without torch, so that the CLI can import them cheaply
+from src.readability_classifier.utils.defaults import (  # noqa: F401
+    DEFAULT_KEEP_CHECKPOINTS,
+    DEFAULT_MODEL_BATCH_SIZE,
+    DEFAULT_NUM_WORKERS,
+    DEFAULT_ONNX_OPSET,
+    DEFAULT_PREFETCH_FACTOR,
+)
 
 
 @dataclass(frozen=False)
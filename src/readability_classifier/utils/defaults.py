@@ -0,0 +1,10 @@
+import os
+
+DEFAULT_MODEL_BATCH_SIZE = 8  # Small - avoid CUDA out of memory errors on local machine
+DEFAULT_NUM_WORKERS = min(4, max(0, (os.cpu_count() or 1) - 1))  # Keep one core free
+DEFAULT_PREFETCH_FACTOR = 2  # Batches loaded in advance by each worker
+DEFAULT_KEEP_CHECKPOINTS = 3  # Most recent epoch checkpoints kept besides the best
+DEFAULT_ONNX_OPSET = 17  # Supported by onnxruntime >= 1.14
+DEFAULT_RENDER_CONCURRENCY = os.cpu_count() or 4  # Parallel wkhtmltoimage processes
+DEFAULT_BOOTSTRAP_SAMPLES = 1000  # Resamples of the confidence intervals
+DEFAULT_CONFIDENCE = 0.95
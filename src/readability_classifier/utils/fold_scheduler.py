@@ -0,0 +1,148 @@
+import logging
+import multiprocessing
+import os
+import sys
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Environment variables limiting the threads of the numerical libraries
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS",
+)
+KEY_SEPARATOR = "."  # Separates the keys of nested samples in the file names
+
+
+def flatten(sample: dict, prefix: str = "") -> dict[str, Any]:
+    """
+    Flattens a nested sample, e.g. {"bert": {"input_ids": x}} to {"bert.input_ids": x}.
+    :param sample: The sample.
+    :param prefix: The prefix of the keys.
+    :return: The flat sample.
+    """
+    flat = {}
+    for key, value in sample.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}{KEY_SEPARATOR}"))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def save_memmap_dataset(samples: Sequence[dict], data_dir: Path) -> None:
+    """
+    Stores the samples as one .npy file per (nested) field, so that worker processes
+    can memory map them instead of receiving a pickled copy of the dataset. All samples
+    must have the same fields and shapes.
+    :param samples: The samples (dicts of arrays or tensors, possibly nested).
+    :param data_dir: The directory to store the files in.
+    :return: None
+    """
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    flat_samples = [flatten(sample) for sample in samples]
+    for key in flat_samples[0]:
+        values = np.stack([np.asarray(sample[key]) for sample in flat_samples])
+        np.save(data_dir / f"{key}.npy", values)
+
+
+def load_memmap_dataset(data_dir: Path) -> dict[str, np.ndarray]:
+    """
+    Memory maps the fields stored by save_memmap_dataset.
+    :param data_dir: The directory of the files.
+    :return: The read-only arrays by (flat) field name.
+    """
+    return {
+        path.stem: np.load(path, mmap_mode="r")
+        for path in sorted(Path(data_dir).glob("*.npy"))
+    }
+
+
+def unflatten(flat: dict[str, Any]) -> dict[str, Any]:
+    """
+    Reverts the flattening of a sample.
+    :param flat: The flat sample.
+    :return: The nested sample.
+    """
+    sample = {}
+    for key, value in flat.items():
+        *parents, name = key.split(KEY_SEPARATOR)
+        node = sample
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[name] = value
+    return sample
+
+
+def _init_worker(num_threads: int) -> None:
+    """
+    Limits the threads used by the numerical libraries in a worker process.
+    :param num_threads: The thread budget of the worker.
+    :return: None
+    """
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(num_threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+
+    # The libraries may already be imported by the main module of the worker
+    try:
+        if "torch" in sys.modules:
+            torch = sys.modules["torch"]
+            torch.set_num_threads(num_threads)
+            torch.set_num_interop_threads(1)
+        if "tensorflow" in sys.modules:
+            tf = sys.modules["tensorflow"]
+            tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+            tf.config.threading.set_inter_op_parallelism_threads(1)
+    except RuntimeError:
+        # Raised if the thread pools are already in use
+        logging.warning("Could not limit the threads of the worker.")
+
+
+class FoldScheduler:
+    """
+    Runs the folds of a cross validation in parallel worker processes. Each worker gets
+    an equal share of the cpu cores as thread budget. The workers are spawned, so that
+    no state of the (possibly multithreaded) parent process is inherited.
+    """
+
+    def __init__(self, num_workers: int, threads_per_worker: int = None):
+        """
+        Initializes the scheduler.
+        :param num_workers: The number of worker processes.
+        :param threads_per_worker: The thread budget of each worker. If None, the cpu
+            cores are divided among the workers.
+        """
+        self.num_workers = max(1, num_workers)
+        self.threads_per_worker = threads_per_worker or max(
+            1, (os.cpu_count() or 1) // self.num_workers
+        )
+
+    def run(self, fold_fn: Callable[..., Any], fold_args: Sequence[tuple]) -> list:
+        """
+        Runs the folds and returns their results in the order of the folds.
+        :param fold_fn: A module level function training and evaluating one fold.
+        :param fold_args: The arguments of fold_fn for each fold.
+        :return: The results of fold_fn for each fold.
+        """
+        num_workers = min(self.num_workers, len(fold_args))
+        logging.info(
+            f"Running {len(fold_args)} folds in {num_workers} processes with "
+            f"{self.threads_per_worker} threads each"
+        )
+
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker,),
+        ) as executor:
+            futures = [executor.submit(fold_fn, *args) for args in fold_args]
+            return [future.result() for future in futures]
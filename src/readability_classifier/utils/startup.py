@@ -0,0 +1,92 @@
+import builtins
+import logging
+import sys
+import threading
+import time
+
+DEFAULT_SLOWEST_IMPORTS = 10  # Imports listed in the startup report
+
+
+class ImportProfiler:
+    """
+    Measures the time spent importing modules while it is active, like
+    "python -X importtime" but from within the CLI. The time of an import statement
+    is attributed to the imported module, including the modules it imports in turn,
+    so the lazily imported backends of a task show up with their total cost. Only
+    imports of the thread that activated the profiler are measured.
+    """
+
+    def __init__(self):
+        """
+        Initializes the profiler.
+        """
+        self.times: dict[str, float] = {}
+        self.modules = 0
+        self._import = None
+        self._thread = None
+        self._depth = 0
+        self._start = 0.0
+        self._loaded = 0
+
+    def __enter__(self) -> "ImportProfiler":
+        self._import = builtins.__import__
+        self._thread = threading.get_ident()
+        self._start = time.perf_counter()
+        self._loaded = len(sys.modules)
+        builtins.__import__ = self._timed_import
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        builtins.__import__ = self._import
+        self.modules = len(sys.modules) - self._loaded
+
+    @property
+    def total(self) -> float:
+        """
+        The total time spent importing in seconds.
+        """
+        return sum(self.times.values())
+
+    def slowest(self, count: int = DEFAULT_SLOWEST_IMPORTS) -> list[tuple[str, float]]:
+        """
+        Returns the slowest imports.
+        :param count: The maximum number of imports.
+        :return: The module names and import times in seconds, slowest first.
+        """
+        return sorted(self.times.items(), key=lambda item: item[1], reverse=True)[
+            :count
+        ]
+
+    def log_report(self, count: int = DEFAULT_SLOWEST_IMPORTS) -> None:
+        """
+        Logs the total import time and the slowest imports.
+        :param count: The maximum number of imports listed.
+        :return: None
+        """
+        elapsed = time.perf_counter() - self._start
+        logging.info(
+            f"Startup profile: {self.total:.3f}s of {elapsed:.3f}s spent importing "
+            f"{self.modules} modules"
+        )
+        for name, seconds in self.slowest(count):
+            logging.info(f"  {seconds:8.3f}s  {name}")
+
+    def _timed_import(self, name: str, *args, **kwargs):
+        """
+        Replaces builtins.__import__ and times the outermost import of modules that
+        are not loaded yet.
+        """
+        if (
+            self._depth > 0
+            or threading.get_ident() != self._thread
+            or name in sys.modules
+        ):
+            return self._import(name, *args, **kwargs)
+
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._import(name, *args, **kwargs)
+        finally:
+            self._depth -= 1
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - start
@@ -1,6 +1,22 @@
 import unittest
+from tempfile import TemporaryDirectory
 
-from src.readability_classifier.encoders.dataset_utils import load_encoded_dataset
+import torch
+from torch.utils.data import SequentialSampler
+
+from src.readability_classifier.encoders.dataset_utils import (
+    MemoryMappedDataset,
+    PackedBert,
+    collate_readability_batch,
+    dataset_to_dataloader,
+    k_fold_indices,
+    load_encoded_dataset,
+    split_k_fold,
+)
+from src.readability_classifier.utils.fold_scheduler import (
+    load_memmap_dataset,
+    save_memmap_dataset,
+)
 from tests.readability_classifier.utils.utils import ENCODED_SCALABRIO_DIR
 
 
@@ -19,3 +35,77 @@ class TestDatasetUtils(unittest.TestCase):
         encoded_data = load_encoded_dataset(data_dir)
         encoded_data = encoded_data.split(10)
         assert len(encoded_data) == 10
+
+    def test_dataset_to_dataloader_without_shuffle(self):
+        data_dir = str(ENCODED_SCALABRIO_DIR.absolute())
+        encoded_data = load_encoded_dataset(data_dir)
+
+        loader = dataset_to_dataloader(
+            encoded_data, batch_size=2, shuffle=False, num_workers=0
+        )
+
+        assert isinstance(loader.sampler, SequentialSampler)
+        assert loader.num_workers == 0
+        first = next(iter(loader))
+        assert first["matrix"].shape[0] == 2
+
+    def test_dataset_to_dataloader_with_worker_options(self):
+        data_dir = str(ENCODED_SCALABRIO_DIR.absolute())
+        encoded_data = load_encoded_dataset(data_dir)
+
+        loader = dataset_to_dataloader(
+            encoded_data,
+            batch_size=2,
+            num_workers=1,
+            prefetch_factor=3,
+            pin_memory=False,
+            persistent_workers=False,
+        )
+
+        assert loader.num_workers == 1
+        assert loader.prefetch_factor == 3
+        assert not loader.pin_memory
+        assert not loader.persistent_workers
+
+    def test_collate_readability_batch(self):
+        data_dir = str(ENCODED_SCALABRIO_DIR.absolute())
+        encoded_data = load_encoded_dataset(data_dir)
+        samples = [encoded_data[0], encoded_data[1]]
+
+        batch = collate_readability_batch(samples)
+
+        assert isinstance(batch["bert"], PackedBert)
+        assert batch["bert"].ids.is_contiguous()
+        bert = batch["bert"].unpack()
+        for field, ids in bert.items():
+            assert ids.shape == (2, *samples[0]["bert"][field].shape)
+            assert (ids[1] == samples[1]["bert"][field]).all()
+        assert batch["matrix"].shape == (2, *samples[0]["matrix"].shape)
+
+    def test_k_fold_indices_match_split_k_fold(self):
+        data_dir = str(ENCODED_SCALABRIO_DIR.absolute())
+        encoded_data = load_encoded_dataset(data_dir)
+
+        folds = split_k_fold(encoded_data, k_fold=5)
+        indices = k_fold_indices(len(encoded_data), 5)
+
+        assert len(indices) == 5
+        train_index, val_index = indices[0]
+        assert len(val_index) == len(folds[0].val_set)
+        assert torch.equal(
+            folds[0].val_set[0]["matrix"], encoded_data[val_index[0]]["matrix"]
+        )
+
+    def test_memory_mapped_dataset(self):
+        data_dir = str(ENCODED_SCALABRIO_DIR.absolute())
+        encoded_data = load_encoded_dataset(data_dir)
+
+        with TemporaryDirectory() as tmp_dir:
+            save_memmap_dataset(encoded_data.to_list(), tmp_dir)
+            dataset = MemoryMappedDataset(load_memmap_dataset(tmp_dir), [2, 0])
+
+            assert len(dataset) == 2
+            sample = dataset[0]
+            assert torch.equal(sample["matrix"], encoded_data[2]["matrix"])
+            for field, ids in encoded_data[2]["bert"].items():
+                assert torch.equal(sample["bert"][field], ids)
@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+
+import pytest
+
+from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+from src.readability_classifier.evaluation.engine import (
+    REPORT_FILE_NAME,
+    STATS_FILE_NAME,
+    MultiPartEvaluator,
+)
+from tests.readability_classifier.utils.utils import DirTest
+
+
+class CountingScorer:
+    """
+    Returns the predictions stored in the samples and counts the scored parts.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, encoded: ReadabilityDataset) -> list[float]:
+        with self.lock:
+            self.calls += 1
+        return [sample["prediction"] for sample in encoded]
+
+
+class TestMultiPartEvaluator(DirTest):
+    def setUp(self):
+        super().setUp()
+        samples = [
+            {"score": float(idx % 2), "prediction": 0.9 if idx % 3 else 0.1}
+            for idx in range(30)
+        ]
+        self.parts = ReadabilityDataset(samples).split(parts=3)
+
+    def test_evaluate_parts(self):
+        scorer = CountingScorer()
+
+        report = MultiPartEvaluator(scorer, bootstrap_samples=200).evaluate(self.parts)
+
+        assert scorer.calls == 3
+        assert [part.part for part in report.parts] == [0, 1, 2]
+        assert sum(len(part.y_true) for part in report.parts) == 30
+        total = sum(part.counts.tp for part in report.parts)
+        assert total == 10  # Odd indices that are not divisible by 3
+        lower, upper = report.intervals["acc"]
+        assert lower <= report.pooled["acc"] <= upper
+
+    def test_concurrent_parts_match_sequential(self):
+        sequential = MultiPartEvaluator(CountingScorer()).evaluate(self.parts)
+
+        concurrent = MultiPartEvaluator(CountingScorer(), workers=3).evaluate(
+            self.parts
+        )
+
+        assert concurrent.to_dict() == sequential.to_dict()
+
+    def test_without_bootstrap(self):
+        report = MultiPartEvaluator(CountingScorer(), bootstrap_samples=0).evaluate(
+            self.parts
+        )
+
+        assert report.intervals == {}
+
+    def test_store(self):
+        report = MultiPartEvaluator(CountingScorer(), bootstrap_samples=50).evaluate(
+            self.parts
+        )
+
+        report.store(self.output_dir)
+
+        with open(os.path.join(self.output_dir, STATS_FILE_NAME)) as f:
+            assert json.load(f) == report.pooled
+        with open(os.path.join(self.output_dir, REPORT_FILE_NAME)) as f:
+            stored = json.load(f)
+        assert len(stored["parts"]) == 3
+        assert stored["bootstrap_samples"] == 50
+        assert set(stored["confidence_intervals"]) == set(report.pooled)
+
+    def test_no_parts(self):
+        with pytest.raises(ValueError, match="No parts"):
+            MultiPartEvaluator(CountingScorer()).evaluate([])
@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+import pytest
+
+from src.readability_classifier.evaluation.metrics import (
+    METRICS,
+    ConfusionMatrix,
+    bootstrap_intervals,
+)
+
+
+class TestConfusionMatrix(unittest.TestCase):
+    def test_from_labels(self):
+        counts = ConfusionMatrix.from_labels(
+            np.array([True, True, False, False, True]),
+            np.array([True, False, False, True, True]),
+        )
+
+        assert counts == ConfusionMatrix(tp=2, tn=1, fp=1, fn=1)
+
+    def test_to_stats(self):
+        stats = ConfusionMatrix(tp=2, tn=1, fp=1, fn=1).to_stats()
+
+        assert list(stats) == list(METRICS)
+        assert stats["acc"] == 0.6
+        assert stats["precision"] == 2 / 3
+        assert stats["recall"] == 2 / 3
+
+    def test_auc_is_mean_of_true_positive_and_true_negative_rate(self):
+        stats = ConfusionMatrix(tp=3, tn=1, fp=1, fn=0).to_stats()
+
+        assert stats["auc"] == 0.75
+
+    def test_to_stats_empty(self):
+        stats = ConfusionMatrix(tp=0, tn=0, fp=0, fn=0).to_stats()
+
+        assert all(value == 0 for value in stats.values())
+
+
+class TestBootstrapIntervals(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.y_true = rng.random(200) > 0.5
+        self.y_pred = np.where(rng.random(200) > 0.2, self.y_true, ~self.y_true)
+
+    def test_intervals_contain_the_metrics(self):
+        stats = ConfusionMatrix.from_labels(self.y_true, self.y_pred).to_stats()
+
+        intervals = bootstrap_intervals(self.y_true, self.y_pred, samples=500)
+
+        for metric in METRICS:
+            lower, upper = intervals[metric]
+            assert lower <= stats[metric] <= upper
+            assert lower < upper
+
+    def test_reproducible(self):
+        intervals = bootstrap_intervals(self.y_true, self.y_pred, samples=100, seed=1)
+
+        assert intervals == bootstrap_intervals(
+            self.y_true, self.y_pred, samples=100, seed=1
+        )
+
+    def test_higher_confidence_is_wider(self):
+        narrow = bootstrap_intervals(self.y_true, self.y_pred, confidence=0.5)
+        wide = bootstrap_intervals(self.y_true, self.y_pred, confidence=0.99)
+
+        assert wide["acc"][0] < narrow["acc"][0]
+        assert wide["acc"][1] > narrow["acc"][1]
+
+    def test_empty(self):
+        with pytest.raises(ValueError, match="empty"):
+            bootstrap_intervals(np.array([]), np.array([]))
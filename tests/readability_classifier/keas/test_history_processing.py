@@ -76,6 +76,26 @@ class TestHistoryProcessor(DirTest):
         assert best_epoch.f1 == 0.8571428571428571
         assert best_epoch.mcc == 0.7071067811865476
 
+    def test_evaluate_fold_with_validation_freq(self):
+        fake_history = keras.callbacks.History()
+        fake_history.history["loss"] = [0.1, 0.2, 0.3, 0.4]
+        fake_history.history["acc"] = [0.9, 0.8, 0.7, 0.6]
+        fake_history.history["val_loss"] = [0.2, 0.4]
+        fake_history.history["val_acc"] = [0.8, 0.6]
+        fake_history.history["val_false_negatives"] = [0, 1]
+        fake_history.history["val_false_positives"] = [1, 2]
+        fake_history.history["val_true_positives"] = [3, 2]
+        fake_history.history["val_true_negatives"] = [2, 3]
+        fake_history.validation_freq = 2
+
+        fold_stats = HistoryProcessor().evaluate_fold(
+            fold_history=fake_history, fold_index=0
+        )
+
+        assert len(fold_stats.epoch_stats) == 2
+        assert fold_stats.epoch_stats[0].train_stats.loss == 0.2
+        assert fold_stats.epoch_stats[1].train_stats.loss == 0.4
+
     def test_evaluate(self):
         fake_history = keras.callbacks.History()
         fake_history.history["loss"] = [0.1, 0.2, 0.3]
@@ -0,0 +1,16 @@
+import unittest
+from types import SimpleNamespace
+
+import pytest
+
+from src.readability_classifier.onx.model_runner import OnnxModelRunner
+
+
+class TestOnnxModelRunner(unittest.TestCase):
+    def test_run_train_rejects_training(self):
+        with pytest.raises(ValueError, match="can not be trained"):
+            OnnxModelRunner().run_train(SimpleNamespace(k_fold=0), None)
+
+    def test_run_train_rejects_cross_validation(self):
+        with pytest.raises(ValueError, match="can not be trained"):
+            OnnxModelRunner().run_train(SimpleNamespace(k_fold=10), None)
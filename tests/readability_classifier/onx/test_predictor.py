@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+
+from src.readability_classifier.onx.predictor import is_onnx_model, sample_input
+
+
+def create_test_sample() -> dict:
+    return {
+        "name": "Snippet.java",
+        "matrix": np.ones((50, 305)),
+        "bert": {
+            "input_ids": np.arange(100),
+            "token_type_ids": np.zeros(100),
+            "position_ids": np.arange(100),
+        },
+        "image": np.zeros((3, 128, 128)),
+    }
+
+
+class TestOnnxPredictor(unittest.TestCase):
+    def test_keras_inputs(self):
+        sample = create_test_sample()
+
+        assert sample_input(sample, "struc_input").shape == (50, 305)
+        assert sample_input(sample, "vis_input").shape == (128, 128, 3)
+        assert np.array_equal(
+            sample_input(sample, "seman_input_segment"), np.arange(100)
+        )
+
+    def test_torch_inputs(self):
+        sample = create_test_sample()
+
+        assert np.array_equal(sample_input(sample, "bert.input_ids"), np.arange(100))
+        assert sample_input(sample, "image").shape == (3, 128, 128)
+
+    def test_is_onnx_model(self):
+        assert is_onnx_model("models/towards.onnx")
+        assert not is_onnx_model("models/towards.keras")
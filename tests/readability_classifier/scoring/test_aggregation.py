@@ -0,0 +1,75 @@
+import csv
+import json
+import os
+import unittest
+
+import pytest
+
+from src.readability_classifier.scoring.aggregation import (
+    PathTree,
+    percentile,
+    write_rollups,
+)
+from tests.readability_classifier.utils.utils import DirTest
+
+FILES = [
+    ("repo/a/A.java", 0.2, 10),
+    ("repo/a/B.java", 0.8, 30),
+    ("repo/b/c/C.java", 0.4, 5),
+    ("repo/D.java", 0.9, 5),
+]
+
+
+def _tree() -> PathTree:
+    tree = PathTree()
+    for path, score, lines in FILES:
+        tree.add(path, score, lines)
+    return tree
+
+
+class TestPathTree(unittest.TestCase):
+    def test_rollup_levels(self):
+        rollups = _tree().rollup()
+
+        assert [(rollup.path, rollup.files) for rollup in rollups] == [
+            ("", 4),
+            ("repo", 4),
+            (os.path.join("repo", "a"), 2),
+            (os.path.join("repo", "b"), 1),
+            (os.path.join("repo", "b", "c"), 1),
+        ]
+
+    def test_rollup_stats(self):
+        directory = _tree().rollup(threshold=0.5)[2]
+
+        assert abs(directory.mean - 0.5) < 1e-9
+        assert abs(directory.weighted_mean - 0.65) < 1e-9
+        assert directory.lines == 40
+        assert directory.below_threshold == 0.5
+        assert abs(directory.percentiles[50] - 0.5) < 1e-9
+
+    def test_percentile(self):
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+        assert percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
+        assert percentile([1.0], 10) == 1.0
+
+    def test_empty_tree(self):
+        with pytest.raises(ValueError, match="No files"):
+            PathTree().rollup()
+
+
+class TestWriteRollups(DirTest):
+    def test_jsonl_and_csv(self):
+        rollups = _tree().rollup()
+        jsonl = os.path.join(self.output_dir, "report.jsonl")
+        csv_file = os.path.join(self.output_dir, "report.csv")
+
+        write_rollups(rollups, jsonl)
+        write_rollups(rollups, csv_file)
+
+        with open(jsonl) as f:
+            rows = [json.loads(line) for line in f]
+        with open(csv_file) as f:
+            csv_rows = list(csv.DictReader(f))
+        assert len(rows) == len(csv_rows) == 5
+        assert rows[0]["p90"] == float(csv_rows[0]["p90"])
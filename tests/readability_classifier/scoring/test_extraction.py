@@ -0,0 +1,126 @@
+import os
+import unittest
+
+from src.readability_classifier.scoring.extraction import (
+    count_lines_of_code,
+    extract_files,
+    extract_methods,
+)
+from tests.readability_classifier.utils.utils import DIR_WITH_FOUR_SNIPPETS
+
+JAVA_FILE = """package a;
+
+public class Outer<T> implements Runnable {
+    private Runnable r = () -> { System.out.println("}"); };
+
+    static {
+        init();
+    }
+
+    @Override
+    public void run() {
+        new Thread() { public void run() {} }.start();
+    }
+
+    abstract int abstractMethod();
+
+    enum Color { RED; int code() { return 1; } }
+
+    private class Inner {
+        void inner() { char c = '}'; }
+    }
+}
+"""
+
+CONSTRUCTORS_FILE = """class A {
+    A() { super(); }
+
+    A(int x) { this(); }
+
+    A create() { return new A(); }
+
+    record R(int x) {
+        R { }
+    }
+}
+"""
+
+ANNOTATED_FILE = """class B {
+    @SuppressWarnings({"a", "b"})
+    void m() { int y = 1; }
+
+    int[] values = {1, 2};
+
+    void n() {}
+}
+"""
+
+
+class TestExtraction(unittest.TestCase):
+    def test_extract_methods(self):
+        methods = extract_methods(JAVA_FILE, "Outer.java")
+
+        assert [method.qualified_name for method in methods] == [
+            "Outer.run",
+            "Outer.Color.code",
+            "Outer.Inner.inner",
+        ]
+        run = methods[0]
+        assert (run.start_line, run.end_line) == (10, 13)
+        assert run.code.startswith("    @Override\n    public void run() {")
+        assert run.code.endswith("}")
+        assert methods[1].code == "int code() { return 1; }"
+
+    def test_extract_constructors(self):
+        methods = extract_methods(CONSTRUCTORS_FILE)
+
+        assert [method.qualified_name for method in methods] == [
+            "A.A",
+            "A.A",
+            "A.create",
+            "A.R.R",
+        ]
+        assert methods[0].code == "    A() { super(); }"
+        assert methods[3].code == "        R { }"
+
+    def test_extract_annotated_method(self):
+        methods = extract_methods(ANNOTATED_FILE)
+
+        assert [method.qualified_name for method in methods] == ["B.m", "B.n"]
+        assert methods[0].code == (
+            '    @SuppressWarnings({"a", "b"})\n    void m() { int y = 1; }'
+        )
+        assert methods[1].code == "    void n() {}"
+
+    def test_extract_snippet_without_class(self):
+        methods = extract_methods("// Comment\nint one() {\n    return 1;\n}\n")
+
+        assert len(methods) == 1
+        assert methods[0].qualified_name == "one"
+        assert methods[0].start_line == 2
+
+    def test_count_lines_of_code(self):
+        code = (
+            "/**\n * Javadoc\n */\n\n"
+            "int one() { // Comment\n"
+            "\n"
+            "    /* Block */\n"
+            '    String s = """\n        text\n        """;\n'
+            "    return 1;\n"
+            "}\n"
+        )
+
+        assert count_lines_of_code(code) == 6
+        assert count_lines_of_code("// Only a comment\n\n") == 0
+
+    def test_extract_files_parallel(self):
+        files = sorted(
+            os.path.join(DIR_WITH_FOUR_SNIPPETS, name)
+            for name in os.listdir(DIR_WITH_FOUR_SNIPPETS)
+        )
+
+        sequential = list(extract_files(files, workers=1))
+        parallel = list(extract_files(files, workers=2))
+
+        assert len(sequential) == 4
+        assert parallel == sequential
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from src.readability_classifier.scoring.files import chunked, find_source_files
+from tests.readability_classifier.utils.utils import DirTest
+
+
+class TestFindSourceFiles(DirTest):
+    def setUp(self):
+        super().setUp()
+        for name in ["A.java", "b.txt", "sub/B.java", "sub/deep/C.java", "test/D.java"]:
+            path = os.path.join(self.output_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("class X {}")
+
+    def _relative(self, files) -> list[str]:
+        return [os.path.relpath(file, self.output_dir) for file in files]
+
+    def test_top_level(self):
+        files = find_source_files([self.output_dir])
+
+        assert self._relative(files) == ["A.java"]
+
+    def test_recursive(self):
+        files = find_source_files([self.output_dir], recursive=True)
+
+        assert self._relative(files) == [
+            "A.java",
+            os.path.join("sub", "B.java"),
+            os.path.join("sub", "deep", "C.java"),
+            os.path.join("test", "D.java"),
+        ]
+
+    def test_glob_relative_path(self):
+        files = find_source_files([self.output_dir], ["sub/*.java"], recursive=True)
+
+        assert self._relative(files) == [
+            os.path.join("sub", "B.java"),
+            os.path.join("sub", "deep", "C.java"),
+        ]
+
+    def test_no_matches(self):
+        with pytest.raises(FileNotFoundError):
+            list(find_source_files([self.output_dir], ["*.kt"], recursive=True))
+
+    def test_chunked(self):
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
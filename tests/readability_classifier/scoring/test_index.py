@@ -0,0 +1,86 @@
+import os
+
+import torch
+
+from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+from src.readability_classifier.scoring.index import ScoreIndex, model_fingerprint
+from tests.readability_classifier.utils.utils import DirTest
+
+
+class CountingModel:
+    """
+    Encodes and scores snippets by their length and counts the calls.
+    """
+
+    def __init__(self, offset: float = 0.0):
+        self.offset = offset
+        self.encoded = 0
+        self.scored = 0
+
+    def encode(self, samples: list[dict]) -> ReadabilityDataset:
+        self.encoded += len(samples)
+        return ReadabilityDataset(
+            [
+                {
+                    "name": sample["name"],
+                    "matrix": torch.full((2,), float(len(sample["code_snippet"]))),
+                    "bert": {"input_ids": torch.zeros(3, dtype=torch.long)},
+                    "image": torch.zeros(1),
+                    "score": "",
+                }
+                for sample in samples
+            ]
+        )
+
+    def score(self, encoded: ReadabilityDataset) -> list[float]:
+        self.scored += len(encoded)
+        return [sample["matrix"][0].item() / 100 + self.offset for sample in encoded]
+
+
+def _samples(*snippets: str) -> list[dict]:
+    return [{"name": f"{i}.java", "code_snippet": s} for i, s in enumerate(snippets)]
+
+
+class TestScoreIndex(DirTest):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.output_dir, "index.sqlite")
+
+    def test_unchanged_snippets_are_cached(self):
+        model = CountingModel()
+        with ScoreIndex(self.path, "model") as index:
+            index.get_or_score(_samples("a", "bb"), model.encode, model.score)
+        with ScoreIndex(self.path, "model") as index:
+            scores = index.get_or_score(
+                _samples("a", "bb", "ccc", "ccc"), model.encode, model.score
+            )
+
+        assert scores == [0.01, 0.02, 0.03, 0.03]
+        assert model.encoded == 3
+        assert model.scored == 3
+
+    def test_changed_model_reuses_encodings(self):
+        old_model, new_model = CountingModel(), CountingModel(offset=0.5)
+        with ScoreIndex(self.path, "old") as index:
+            index.get_or_score(_samples("a"), old_model.encode, old_model.score)
+
+        with ScoreIndex(self.path, "new") as index:
+            removed = index.invalidate()
+            scores = index.get_or_score(
+                _samples("a"), new_model.encode, new_model.score
+            )
+
+        assert removed == 1
+        assert scores == [0.51]
+        assert new_model.encoded == 0
+        assert new_model.scored == 1
+
+    def test_model_fingerprint(self):
+        model_path = os.path.join(self.output_dir, "model.keras")
+        with open(model_path, "wb") as f:
+            f.write(b"weights")
+        fingerprint = model_fingerprint(model_path)
+        with open(model_path, "ab") as f:
+            f.write(b"retrained")
+
+        assert model_fingerprint(model_path) != fingerprint
@@ -0,0 +1,91 @@
+import csv
+import json
+import os
+
+import pytest
+
+from src.readability_classifier.scoring.extraction import MethodSnippet
+from src.readability_classifier.scoring.report import ScoreAggregator, ScoreWriter
+from tests.readability_classifier.utils.utils import DirTest
+
+SCORES = {"a/A.java": 0.2, "a/B.java": 0.4, "b/C.java": 0.9}
+
+
+class TestScoreAggregator(DirTest):
+    def _aggregate(self, output: str) -> tuple[str, float]:
+        with ScoreWriter(output) as writer:
+            aggregator = ScoreAggregator(writer)
+            aggregator.add_all(SCORES.keys(), SCORES.values(), [1] * len(SCORES))
+            return aggregator.finish()
+
+    def test_jsonl(self):
+        output = os.path.join(self.output_dir, "scores.jsonl")
+
+        clazz, score = self._aggregate(output)
+
+        with open(output) as f:
+            records = [json.loads(line) for line in f]
+        assert clazz == "Unreadable"
+        assert abs(score - 0.5) < 1e-6
+        assert [(record["kind"], record["path"]) for record in records] == [
+            ("file", "a/A.java"),
+            ("file", "a/B.java"),
+            ("directory", "a"),
+            ("file", "b/C.java"),
+            ("directory", "b"),
+            ("total", ""),
+        ]
+        assert abs(records[2]["score"] - 0.3) < 1e-6
+        assert records[2]["files"] == 2
+
+    def test_csv(self):
+        output = os.path.join(self.output_dir, "out", "scores.csv")
+
+        self._aggregate(output)
+
+        with open(output) as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 6
+        assert rows[-1]["kind"] == "total"
+        assert rows[-1]["files"] == "3"
+
+    def test_no_files(self):
+        with pytest.raises(ValueError, match="No files"):
+            ScoreAggregator().finish()
+
+    def test_methods(self):
+        output = os.path.join(self.output_dir, "scores.jsonl")
+        methods = [
+            MethodSnippet("a/A.java", "A", "m1", 1, 3, ""),
+            MethodSnippet("a/A.java", "A.Inner", "m2", 4, 6, ""),
+            MethodSnippet("a/A.java", "A", "m3", 7, 9, ""),
+            MethodSnippet("b/B.java", "B", "m4", 1, 3, ""),
+        ]
+
+        with ScoreWriter(output) as writer:
+            aggregator = ScoreAggregator(writer)
+            for method, score in zip(methods, [0.2, 0.6, 0.4, 0.8], strict=True):
+                aggregator.add_method(method, score)
+            clazz, score = aggregator.finish()
+
+        with open(output) as f:
+            records = [json.loads(line) for line in f]
+        assert [(record["kind"], record["name"]) for record in records] == [
+            ("method", "A.m1"),
+            ("method", "A.Inner.m2"),
+            ("method", "A.m3"),
+            ("class", "A"),
+            ("class", "A.Inner"),
+            ("file", ""),
+            ("method", "B.m4"),
+            ("class", "B"),
+            ("directory", ""),
+            ("file", ""),
+            ("directory", ""),
+            ("total", ""),
+        ]
+        assert abs(records[3]["score"] - 0.3) < 1e-6
+        assert records[5]["methods"] == 3
+        assert abs(records[5]["score"] - 0.4) < 1e-6
+        assert records[-1]["methods"] == 4
+        assert abs(score - 0.6) < 1e-6
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import unittest
+
+from src.readability_classifier.serving.async_server import start_async_server
+
+
+class AsyncLengthPredictor:
+    """
+    Scores the snippets by their length.
+    """
+
+    async def predict(self, code_snippets: list[str]) -> list[float]:
+        await asyncio.sleep(0.01)
+        return [len(snippet) / 100 for snippet in code_snippets]
+
+
+async def _request(
+    port: int, request: bytes, responses: int = 1
+) -> list[tuple[int, dict]]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request)
+    contents = []
+    for _ in range(responses):
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) != b"\r\n":
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        body = await reader.readexactly(int(headers["content-length"]))
+        contents.append((status, json.loads(body)))
+    writer.close()
+    return contents
+
+
+def _post(body: str, connection: str = "close") -> bytes:
+    return (
+        f"POST /predict HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: {connection}\r\n\r\n{body}"
+    ).encode()
+
+
+class TestAsyncServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = await start_async_server(AsyncLengthPredictor(), port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_concurrent_requests(self):
+        bodies = [json.dumps({"snippet": "x" * i}) for i in range(100)]
+
+        responses = await asyncio.gather(
+            *(_request(self.port, _post(body)) for body in bodies)
+        )
+
+        assert [response[0][1]["scores"] for response in responses] == [
+            [i / 100] for i in range(100)
+        ]
+
+    async def test_keep_alive(self):
+        request = _post("int a;", "keep-alive") + b"GET /health HTTP/1.1\r\n\r\n"
+
+        (_, predict), (status, health) = await _request(self.port, request, responses=2)
+
+        assert predict["readable"] == [False]
+        assert status == 200
+        assert health["requests"] == 1
+        assert health["in_flight"] == 0
+
+    async def test_invalid_requests(self):
+        invalid = await _request(self.port, _post(json.dumps({"code": 1})))
+        not_found = await _request(self.port, b"GET /predict HTTP/1.1\r\n\r\n")
+
+        assert invalid[0][0] == 400
+        assert not_found[0][0] == 404
@@ -0,0 +1,105 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.readability_classifier.serving.batcher import MicroBatchScheduler
+
+SLOW_PREDICTION_S = 0.3
+MAX_WAIT_MS = 200
+
+
+class RecordingPredictor:
+    """
+    Scores the snippets by their length and records the batch sizes.
+    """
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.release = threading.Event()
+
+    def predict(self, code_snippets: list[str]) -> list[float]:
+        self.release.wait()
+        self.batch_sizes.append(len(code_snippets))
+        return [float(len(snippet)) for snippet in code_snippets]
+
+
+class SlowPredictor:
+    """
+    Takes SLOW_PREDICTION_S per batch and records when the batches start and end.
+    """
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.starts = []
+        self.ends = []
+
+    def predict(self, code_snippets: list[str]) -> list[float]:
+        self.starts.append(time.monotonic())
+        self.started.set()
+        time.sleep(SLOW_PREDICTION_S)
+        self.ends.append(time.monotonic())
+        return [0.5] * len(code_snippets)
+
+
+class FailingPredictor:
+    def predict(self, code_snippets: list[str]) -> list[float]:
+        raise ValueError("Broken model")
+
+
+class TestMicroBatchScheduler(unittest.TestCase):
+    def test_concurrent_requests_share_batches(self):
+        predictor = RecordingPredictor()
+        requests = [["a" * i] for i in range(1, 9)]
+
+        with MicroBatchScheduler(predictor, max_batch_size=4, max_wait_ms=50) as sch:
+            futures = [sch.submit(request) for request in requests]
+            predictor.release.set()
+            scores = [future.result() for future in futures]
+            metrics = sch.metrics
+
+        assert scores == [[float(i)] for i in range(1, 9)]
+        assert sum(predictor.batch_sizes) == 8
+        assert max(predictor.batch_sizes) <= 4
+        assert len(predictor.batch_sizes) < 8
+        assert metrics["requests"] == 8
+        assert metrics["queue_depth"] == 0
+        assert 0 < metrics["fill_ratio"] <= 1
+
+    def test_large_request_is_not_split(self):
+        predictor = RecordingPredictor()
+        predictor.release.set()
+
+        with MicroBatchScheduler(predictor, max_batch_size=2, max_wait_ms=1) as sch:
+            scores = sch.predict(["a", "bb", "ccc"])
+
+        assert scores == [1.0, 2.0, 3.0]
+        assert predictor.batch_sizes == [3]
+
+    def test_errors_reach_all_requests(self):
+        with MicroBatchScheduler(FailingPredictor(), max_wait_ms=20) as scheduler:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [
+                    executor.submit(scheduler.predict, ["int a;"]) for _ in range(2)
+                ]
+
+            for future in futures:
+                with pytest.raises(ValueError, match="Broken model"):
+                    future.result()
+
+    def test_wait_counts_from_submission(self):
+        predictor = SlowPredictor()
+
+        with MicroBatchScheduler(predictor, max_wait_ms=MAX_WAIT_MS) as scheduler:
+            first = scheduler.submit(["int a;"])
+            predictor.started.wait()
+
+            # Queues behind the running batch for longer than max_wait
+            second = scheduler.submit(["int b;"])
+            first.result()
+            second.result()
+
+        assert len(predictor.starts) == 2
+        assert predictor.starts[1] - predictor.ends[0] < MAX_WAIT_MS / 1000 / 2
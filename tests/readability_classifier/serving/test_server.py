@@ -0,0 +1,61 @@
+import json
+import threading
+import unittest
+from http.client import HTTPConnection
+
+from src.readability_classifier.serving.server import create_server, parse_snippets
+
+
+class LengthPredictor:
+    """
+    Scores the snippets by their length.
+    """
+
+    def predict(self, code_snippets: list[str]) -> list[float]:
+        return [len(snippet) / 100 for snippet in code_snippets]
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.server = create_server(LengthPredictor(), port=0)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.connection = HTTPConnection(*self.server.server_address)
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def _request(self, method: str, path: str, body: str = None) -> tuple[int, dict]:
+        self.connection.request(method, path, body=body)
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_predict_batch(self):
+        body = json.dumps({"snippets": ["int a;", "x" * 80]})
+
+        status, content = self._request("POST", "/predict", body)
+
+        assert status == 200
+        assert content["scores"] == [0.06, 0.8]
+        assert content["readable"] == [False, True]
+
+    def test_health(self):
+        self._request("POST", "/predict", "int a;")
+
+        status, content = self._request("GET", "/health")
+
+        assert status == 200
+        assert content["status"] == "ok"
+        assert content["requests"] == 1
+        assert content["snippets"] == 1
+
+    def test_invalid_request(self):
+        status, _ = self._request("POST", "/predict", json.dumps({"code": 1}))
+
+        assert status == 400
+
+    def test_parse_plain_snippet(self):
+        assert parse_snippets(b"class A {}") == ["class A {}"]
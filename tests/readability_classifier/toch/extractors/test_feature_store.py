@@ -0,0 +1,86 @@
+import torch
+from transformers import BertConfig, BertModel
+
+from src.readability_classifier.toch.extractors.feature_store import (
+    BertFeatureStore,
+    bert_fingerprint,
+    sample_keys,
+)
+from tests.readability_classifier.utils.utils import DirTest
+
+CPU = torch.device("cpu")
+
+
+class TestBertFeatureStore(DirTest):
+    def test_computes_each_sample_once(self):
+        input_ids = torch.tensor([[1, 2, 3], [4, 5, 6], [1, 2, 3]])
+        features = torch.rand(3, 3, 8)
+        computed = []
+
+        def compute(indices: torch.Tensor) -> torch.Tensor:
+            computed.extend(indices.tolist())
+            return features[indices]
+
+        store = BertFeatureStore(self.output_dir, "bert-base-cased")
+        keys = sample_keys(input_ids)
+        first = store.get_or_compute(keys, compute, CPU)
+        second = store.get_or_compute(keys, compute, CPU)
+
+        assert computed == [0, 1]
+        assert len(store) == 2
+        assert torch.equal(first, second)
+        assert torch.allclose(first[:2], features[:2], atol=1e-3)
+        assert torch.equal(first[2], first[0])
+
+    def test_reloads_stored_features(self):
+        keys = sample_keys(torch.tensor([[1, 2], [3, 4]]))
+        features = torch.rand(2, 2, 4)
+
+        store = BertFeatureStore(self.output_dir, "bert-base-cased")
+        expected = store.get_or_compute(keys, lambda indices: features[indices], CPU)
+        store.close()
+
+        reloaded = BertFeatureStore(self.output_dir, "bert-base-cased")
+        actual = reloaded.get_or_compute(keys, lambda indices: 1 / 0, CPU)
+
+        assert len(reloaded) == 2
+        assert torch.equal(actual, expected)
+
+    def test_clears_store_of_other_model(self):
+        keys = sample_keys(torch.tensor([[1, 2]]))
+        store = BertFeatureStore(self.output_dir, "bert-base-cased")
+        store.get_or_compute(keys, lambda indices: torch.rand(1, 2, 4), CPU)
+        store.close()
+
+        other = BertFeatureStore(self.output_dir, "bert-base-uncased")
+
+        assert len(other) == 0
+
+    def test_concurrent_store_uses_worker_dir(self):
+        keys = sample_keys(torch.tensor([[1, 2]]))
+        store = BertFeatureStore(self.output_dir, "bert-base-cased")
+        store.get_or_compute(keys, lambda indices: torch.rand(1, 2, 4), CPU)
+
+        concurrent = BertFeatureStore(self.output_dir, "bert-base-cased")
+
+        assert concurrent.store_dir == store.store_dir / "worker_1"
+        assert len(concurrent) == 0
+
+    def test_fingerprint_of_resized_embeddings(self):
+        config = BertConfig(
+            vocab_size=16,
+            hidden_size=8,
+            num_hidden_layers=1,
+            num_attention_heads=2,
+            intermediate_size=8,
+        )
+        model = BertModel(config)
+        other = BertModel(config)
+        other.load_state_dict(model.state_dict())
+
+        assert bert_fingerprint(model) == bert_fingerprint(other)
+
+        model.resize_token_embeddings(17)
+        other.resize_token_embeddings(17)
+
+        assert bert_fingerprint(model) != bert_fingerprint(other)
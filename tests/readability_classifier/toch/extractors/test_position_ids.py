@@ -0,0 +1,36 @@
+import unittest
+
+import torch
+from torch import nn
+
+from src.readability_classifier.toch.extractors.position_ids import PositionIdsModule
+
+MAX_POSITIONS = 4
+
+
+class Embedding(PositionIdsModule):
+    def __init__(self):
+        super().__init__()
+        self.position_embedding = nn.Embedding(MAX_POSITIONS, 2)
+        self.register_position_ids(MAX_POSITIONS)
+
+
+class TestPositionIdsModule(unittest.TestCase):
+    def test_slices_the_buffer(self):
+        embedding = Embedding()
+
+        assert embedding._position_ids(3).tolist() == [[0, 1, 2]]
+        assert "position_ids" not in embedding.state_dict()
+
+    def test_longer_sequences_wrap_around(self):
+        embedding = Embedding()
+
+        position_ids = embedding._position_ids(6)
+
+        assert position_ids.tolist() == [[0, 1, 2, 3, 0, 1]]
+        assert embedding.position_ids.size(1) == 6
+
+    def test_buffer_follows_the_module(self):
+        embedding = Embedding().to(torch.device("meta"))
+
+        assert embedding._position_ids(2).device.type == "meta"
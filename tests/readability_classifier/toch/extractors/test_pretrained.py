@@ -0,0 +1,95 @@
+import copy
+import unittest
+from unittest import mock
+
+import torch
+from torch import nn
+from transformers import BertConfig, BertModel
+
+from src.readability_classifier.toch.extractors.pretrained import (
+    FrozenBertModule,
+    _resize_token_embeddings,
+)
+
+CONFIG = BertConfig(
+    vocab_size=16,
+    hidden_size=8,
+    num_hidden_layers=1,
+    num_attention_heads=2,
+    intermediate_size=8,
+)
+
+
+class Embedding(FrozenBertModule):
+    def __init__(self, model_name: str):
+        super().__init__()
+        self.linear = nn.Linear(8, 8)
+        self.attach_frozen_bert("model", model_name, device=torch.device("cpu"))
+
+
+class TestFrozenBertModule(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch(
+            "src.readability_classifier.toch.extractors.pretrained._from_pretrained",
+            side_effect=lambda *args: BertModel(CONFIG),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_shared_model_is_not_a_submodule(self):
+        first = Embedding(self.id())
+        second = Embedding(self.id())
+
+        first.train()
+        second.load_state_dict(first.state_dict())
+
+        assert first.model is second.model
+        assert not first.model.training
+        assert all(not key.startswith("model.") for key in first.state_dict())
+        assert first.model not in list(first.modules())
+
+    def test_ignores_bert_weights_of_old_checkpoints(self):
+        embedding = Embedding(self.id())
+        weights = embedding.model.get_input_embeddings().weight.clone()
+        state_dict = embedding.state_dict()
+        state_dict["model.embeddings.word_embeddings.weight"] = torch.zeros(16, 8)
+
+        embedding.load_state_dict(state_dict)
+
+        assert torch.equal(embedding.model.get_input_embeddings().weight, weights)
+
+    def test_moving_attaches_shared_model_of_device(self):
+        first = Embedding(self.id())
+        second = Embedding(self.id())
+        cpu_model = first.model
+
+        first.to("meta")
+        second.to("meta")
+
+        assert first.linear.weight.device.type == "meta"
+        assert first.model.device.type == "meta"
+        assert first.model is second.model
+        assert cpu_model.device.type == "cpu"
+
+    def test_copies_share_model(self):
+        embedding = Embedding(self.id())
+
+        copied = copy.deepcopy(embedding)
+
+        assert copied.model is embedding.model
+        assert copied.linear is not embedding.linear
+        assert torch.equal(copied.linear.weight, embedding.linear.weight)
+
+
+class TestResizeTokenEmbeddings(unittest.TestCase):
+    def test_added_rows_are_reproducible(self):
+        first = BertModel(CONFIG)
+        second = BertModel(CONFIG)
+
+        _resize_token_embeddings(first, 17)
+        _resize_token_embeddings(second, 17)
+
+        first_weight = first.get_input_embeddings().weight
+        second_weight = second.get_input_embeddings().weight
+        assert first_weight.shape == (17, 8)
+        assert torch.equal(first_weight[16], second_weight[16])
@@ -4,7 +4,9 @@ import torch
 
 # TODO: Use transformers library instead of local copy
 from src.readability_classifier.toch.extractors.semantic_extractor import (
+    BertEmbedding,
     SemanticExtractor,
+    TowardsBertConfig,
 )
 from src.readability_classifier.utils.config import SemanticInput
 
@@ -46,3 +48,15 @@ class TestSemanticExtractor(unittest.TestCase):
         assert output.shape == (1, 1792)
 
         # TODO: Check range of output values
+
+
+class TestBertEmbedding(unittest.TestCase):
+    def test_position_ids_buffer(self):
+        config = TowardsBertConfig(max_position_embeddings=4)
+        embedding = BertEmbedding(config)
+
+        assert "position_ids" not in embedding.state_dict()
+        assert embedding._position_ids(3).tolist() == [[0, 1, 2]]
+
+        # Longer sequences wrap around at max_position_embeddings
+        assert embedding._position_ids(6).tolist() == [[0, 1, 2, 3, 0, 1]]
@@ -1,12 +1,30 @@
 import os
 import unittest
+from unittest.mock import patch
 
+import numpy as np
+import torch
+from sklearn.metrics import (
+    accuracy_score,
+    f1_score,
+    matthews_corrcoef,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+
+from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+from src.readability_classifier.evaluation.metrics import ConfusionMatrix
+from src.readability_classifier.toch.base_classifier import EvaluationStats
 from src.readability_classifier.toch.towards_classifier import TowardsClassifier
-from tests.readability_classifier.utils.utils import DirTest
+from tests.readability_classifier.utils.utils import DirTest, create_test_dataset
 
 BATCH_SIZE = 1
 NUM_EPOCHS = 1
 LEARNING_RATE = 0.0015
+TOLERANCE = 1e-7
+PREDICT_BATCH_SIZE = 3  # Not a divisor of the number of test samples
+PREDICT_TOLERANCE = 1e-5
 
 
 class TestTowardsClassifier(DirTest):
@@ -26,3 +44,77 @@ class TestTowardsClassifier(DirTest):
 
         # Check if the model was stored successfully
         assert os.path.exists(os.path.join(self.output_dir, "model.pt"))
+
+    def test_move_to_updates_submodule_devices(self):
+        classifier = TowardsClassifier(batch_size=BATCH_SIZE)
+        device = torch.device("meta")
+
+        classifier.move_to(device)
+
+        assert classifier.device == device
+        assert all(param.device == device for param in classifier.model.parameters())
+        assert all(
+            module.device == device
+            for module in classifier.model.modules()
+            if hasattr(module, "device")
+        )
+
+
+class TestPredict(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(42)
+        self.dataset = create_test_dataset()
+        self.classifier = TowardsClassifier(batch_size=PREDICT_BATCH_SIZE)
+
+    def test_predict_encoded_keeps_order(self):
+        scores = self.classifier.predict_encoded(self.dataset)
+
+        expected = [
+            self.classifier.predict_encoded(ReadabilityDataset([sample]))[0]
+            for sample in self.dataset
+        ]
+        assert scores.shape == (len(self.dataset),)
+        assert np.allclose(scores, expected, atol=PREDICT_TOLERANCE)
+
+    def test_predict_matches_predict_batch(self):
+        # The snippets are the indices of their encoded samples
+        snippets = [str(i) for i in range(len(self.dataset))]
+
+        def encode_dataset(samples):
+            return ReadabilityDataset(
+                [self.dataset[int(sample["code_snippet"])] for sample in samples]
+            )
+
+        with patch(
+            "src.readability_classifier.toch.base_classifier.DatasetEncoder"
+        ) as encoder:
+            encoder.return_value.encode_dataset.side_effect = encode_dataset
+            scores = self.classifier.predict_batch(snippets)
+            single_scores = [self.classifier.predict(snippet) for snippet in snippets]
+            first_score = self.classifier.predict_batch(snippets[:1])[0]
+
+        assert encoder.call_count == 1
+        assert single_scores[0] == first_score
+        assert np.allclose(scores, single_scores, atol=PREDICT_TOLERANCE)
+
+
+class TestConfusionMatrix(unittest.TestCase):
+    def test_matches_sklearn(self):
+        rng = np.random.default_rng(42)
+        y_true = rng.random(100) >= 0.5
+        y_pred = rng.random(100) >= 0.5
+
+        confusion_matrix = ConfusionMatrix()
+        for start in range(0, 100, 32):
+            confusion_matrix.update(
+                y_true[start : start + 32], y_pred[start : start + 32]
+            )
+        stats = EvaluationStats.from_confusion_matrix(confusion_matrix)
+
+        assert confusion_matrix.tp + confusion_matrix.tn == np.sum(y_true == y_pred)
+        assert abs(stats.accuracy - accuracy_score(y_true, y_pred)) < TOLERANCE
+        assert abs(stats.precision - precision_score(y_true, y_pred)) < TOLERANCE
+        assert abs(stats.recall - recall_score(y_true, y_pred)) < TOLERANCE
+        assert abs(stats.f1 - f1_score(y_true, y_pred)) < TOLERANCE
+        assert abs(stats.auc - roc_auc_score(y_true, y_pred)) < TOLERANCE
+        assert abs(stats.mcc - matthews_corrcoef(y_true, y_pred)) < TOLERANCE
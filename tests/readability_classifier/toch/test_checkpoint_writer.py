@@ -0,0 +1,44 @@
+import os
+from pathlib import Path
+
+import torch
+
+from src.readability_classifier.toch.checkpoint_writer import (
+    CheckpointWriter,
+    atomic_save,
+)
+from tests.readability_classifier.utils.utils import DirTest
+
+
+class TestCheckpointWriter(DirTest):
+    def test_keeps_last_and_best(self):
+        output_dir = Path(self.output_dir)
+        best_path = output_dir / "best_model.pt"
+
+        with CheckpointWriter(best_path, keep_last=2) as writer:
+            for epoch in range(1, 5):
+                state_dict = {"weight": torch.full((2,), float(epoch))}
+                path = output_dir / f"model_{epoch}.pt"
+                writer.save(state_dict, path, best=epoch == 1)
+
+        stored = sorted(path.name for path in output_dir.iterdir())
+        assert stored == ["best_model.pt", "model_3.pt", "model_4.pt"]
+        assert torch.equal(torch.load(best_path)["weight"], torch.full((2,), 1.0))
+
+    def test_snapshot_is_independent_of_training(self):
+        output_dir = Path(self.output_dir)
+        weight = torch.zeros(3)
+
+        with CheckpointWriter(output_dir / "best_model.pt") as writer:
+            writer.save({"weight": weight}, output_dir / "model_1.pt")
+            weight.add_(1)
+
+        stored = torch.load(output_dir / "model_1.pt")
+        assert torch.equal(stored["weight"], torch.zeros(3))
+
+    def test_atomic_save_leaves_no_temporary_file(self):
+        path = Path(self.output_dir) / "model.pt"
+
+        atomic_save({"weight": torch.ones(1)}, path)
+
+        assert os.listdir(self.output_dir) == ["model.pt"]
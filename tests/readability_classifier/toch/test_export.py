@@ -0,0 +1,63 @@
+import unittest
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from src.readability_classifier.encoders.dataset_utils import collate_readability_batch
+from src.readability_classifier.toch.export import (
+    ExportedPredictor,
+    LatencyStats,
+    _input_names,
+    export_model,
+)
+from src.readability_classifier.toch.options import ExportMethod
+from src.readability_classifier.toch.towards_classifier import TowardsClassifier
+from tests.readability_classifier.utils.utils import DirTest, create_test_dataset
+
+BATCH_SIZE = 3  # Not a divisor of the number of samples, to vary the batch size
+TOLERANCE = 1e-5
+
+
+class TestExport(unittest.TestCase):
+    def test_input_names_skip_scores_and_names(self):
+        batch = {
+            "name": ["a.java", "b.java"],
+            "matrix": torch.zeros(2, 3),
+            "bert": {"input_ids": torch.zeros(2, 4), "attention_mask": None},
+            "score": torch.ones(2),
+        }
+
+        assert _input_names(batch) == ["matrix", "bert.input_ids"]
+
+    def test_latency_speedup(self):
+        latency = LatencyStats(batch_size=32, eager_ms=10.0, exported_ms=4.0)
+
+        assert latency.speedup == 2.5
+
+
+class TestExportRoundTrip(DirTest):
+    def assert_round_trip(self, method: ExportMethod):
+        torch.manual_seed(42)
+        dataset = create_test_dataset()
+        classifier = TowardsClassifier(batch_size=BATCH_SIZE)
+        path = Path(self.output_dir) / "model.pt"
+
+        export_model(
+            classifier,
+            collate_readability_batch([dataset[0], dataset[1]]),
+            path,
+            method,
+        )
+        predictor = ExportedPredictor(path)
+
+        assert predictor.device == classifier.device
+        scores = predictor.predict(dataset, BATCH_SIZE)
+        expected = classifier.predict_encoded(dataset, BATCH_SIZE)
+        assert np.allclose(scores, expected, atol=TOLERANCE)
+
+    def test_trace(self):
+        self.assert_round_trip(ExportMethod.TRACE)
+
+    def test_export(self):
+        self.assert_round_trip(ExportMethod.EXPORT)
@@ -0,0 +1,42 @@
+import unittest
+
+import pytest
+import torch
+from torch.utils.data import DataLoader
+
+from src.readability_classifier.toch.prefetcher import BatchPrefetcher
+
+CPU = torch.device("cpu")
+
+
+class TestBatchPrefetcher(unittest.TestCase):
+    def test_same_batches_as_loader(self):
+        data = [{"x": torch.tensor([i])} for i in range(10)]
+        loader = DataLoader(data, batch_size=3, shuffle=False)
+
+        prefetcher = BatchPrefetcher(loader, lambda batch: batch, CPU)
+        batches = list(prefetcher)
+
+        assert len(prefetcher) == len(loader)
+        assert len(batches) == 4
+        for batch, expected in zip(batches, loader, strict=True):
+            assert torch.equal(batch["x"], expected["x"])
+
+    def test_forwards_exceptions(self):
+        def fail(batch):
+            raise ValueError("Staging failed")
+
+        loader = DataLoader([{"x": torch.tensor([0])}], batch_size=1)
+        prefetcher = BatchPrefetcher(loader, fail, CPU)
+
+        with pytest.raises(ValueError, match="Staging failed"):
+            list(prefetcher)
+
+    def test_early_break(self):
+        data = [{"x": torch.tensor([i])} for i in range(100)]
+        loader = DataLoader(data, batch_size=1, shuffle=False)
+        prefetcher = BatchPrefetcher(loader, lambda batch: batch, CPU)
+
+        for batch in prefetcher:
+            assert batch["x"].item() == 0
+            break
@@ -0,0 +1,110 @@
+import json
+import unittest
+
+import pytest
+import torch
+from torch.ao.nn.intrinsic.quantized import ConvReLU2d
+from torch.ao.nn.quantized.dynamic import LSTM as DynamicLSTM
+from torch.ao.nn.quantized.dynamic import Linear as DynamicLinear
+
+from src.readability_classifier.encoders.dataset_utils import (
+    ReadabilityDataset,
+    dataset_to_dataloader,
+)
+from src.readability_classifier.toch.base_classifier import EvaluationStats
+from src.readability_classifier.toch.options import QuantizationMode
+from src.readability_classifier.toch.quantization import (
+    QuantizationReport,
+    QuantizedLatency,
+    move_to_cpu,
+    quantize_model,
+)
+from src.readability_classifier.toch.towards_classifier import TowardsClassifier
+from tests.readability_classifier.utils.utils import create_test_dataset
+
+BATCH_SIZE = 2
+TOLERANCE = 0.05
+
+
+def create_test_data():
+    return dataset_to_dataloader(
+        create_test_dataset(), BATCH_SIZE, shuffle=False, num_workers=0
+    )
+
+
+class TestQuantizeModel(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(42)
+        self.loader = create_test_data()
+        self.classifier = TowardsClassifier(
+            test_loader=self.loader, batch_size=BATCH_SIZE
+        )
+        move_to_cpu(self.classifier)
+        self.classifier.model.eval()
+        batch = self.classifier._batch_to_device(next(iter(self.loader)))
+        self.model_input = self.classifier._batch_to_input(batch)
+
+        # Build the lazily sized classification layers of the float model
+        with torch.no_grad():
+            self.float_output = self.classifier.model(self.model_input)
+
+    def assert_close_to_float(self, quantized_model):
+        with torch.no_grad():
+            output = quantized_model(self.model_input)
+
+        assert output.shape == self.float_output.shape
+        assert torch.allclose(output, self.float_output, atol=TOLERANCE)
+
+    def test_dynamic(self):
+        model = quantize_model(self.classifier, self.loader, QuantizationMode.DYNAMIC)
+
+        lstm = model.semantic_extractor.bidirectional_lstm
+        assert isinstance(model.fc_model.dense1, DynamicLinear)
+        assert isinstance(model.fc_model.dense3, DynamicLinear)
+        assert isinstance(lstm, DynamicLSTM)
+        assert type(model.structural_extractor.conv1) is torch.nn.Conv2d
+        assert type(model.visual_extractor.conv1) is torch.nn.Conv2d
+        assert type(self.classifier.model.fc_model.dense1) is torch.nn.Linear
+        self.assert_close_to_float(model)
+
+    def test_static(self):
+        model = quantize_model(self.classifier, self.loader, QuantizationMode.STATIC)
+
+        for extractor in (model.structural_extractor, model.visual_extractor):
+            assert isinstance(extractor, torch.fx.GraphModule)
+            assert isinstance(extractor.conv1, ConvReLU2d)
+            assert isinstance(extractor.conv3, ConvReLU2d)
+        assert isinstance(model.semantic_extractor.bidirectional_lstm, DynamicLSTM)
+        assert isinstance(model.fc_model.dense1, DynamicLinear)
+        self.assert_close_to_float(model)
+
+    def test_no_calibration_batches(self):
+        with pytest.raises(ValueError, match="calibration batch"):
+            quantize_model(self.classifier, self.loader, num_batches=0)
+
+    def test_empty_calibration_loader(self):
+        loader = dataset_to_dataloader(
+            ReadabilityDataset([]), BATCH_SIZE, shuffle=False, num_workers=0
+        )
+
+        with pytest.raises(ValueError, match="No calibration data"):
+            quantize_model(self.classifier, loader)
+
+
+class TestQuantizationReport(unittest.TestCase):
+    def test_deltas_and_json(self):
+        report = QuantizationReport(
+            mode="dynamic",
+            float_stats=EvaluationStats(0.8, 0.8, 0.8, 0.8, 0.8, 0.6),
+            quantized_stats=EvaluationStats(0.75, 0.8, 0.7, 0.75, 0.75, 0.5),
+            float_mb=4.0,
+            quantized_mb=1.0,
+            latencies=[QuantizedLatency(batch_size=1, float_ms=3.0, quantized_ms=2.0)],
+        )
+
+        assert round(report.deltas["accuracy"], 4) == -0.05
+        assert report.deltas["precision"] == 0.0
+
+        stored = json.loads(report.to_json())
+        assert stored["latencies"][0]["speedup"] == 1.5
+        assert stored["quantized_stats"]["mcc"] == 0.5
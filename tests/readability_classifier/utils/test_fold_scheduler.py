@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import numpy as np
+
+from src.readability_classifier.utils.fold_scheduler import (
+    FoldScheduler,
+    load_memmap_dataset,
+    save_memmap_dataset,
+    unflatten,
+)
+from tests.readability_classifier.utils.utils import DirTest
+
+
+class TestFoldScheduler(DirTest):
+    def test_run_keeps_fold_order(self):
+        scheduler = FoldScheduler(num_workers=2, threads_per_worker=1)
+
+        results = scheduler.run(pow, [(2, 3), (3, 2), (4, 1)])
+
+        assert results == [8, 9, 4]
+
+    def test_memmap_dataset(self):
+        samples = [
+            {"matrix": np.full((2, 3), i), "bert": {"input_ids": np.arange(4) + i}}
+            for i in range(5)
+        ]
+        data_dir = Path(self.output_dir) / "data"
+
+        save_memmap_dataset(samples, data_dir)
+        arrays = load_memmap_dataset(data_dir)
+
+        assert set(arrays) == {"matrix", "bert.input_ids"}
+        assert isinstance(arrays["matrix"], np.memmap)
+        assert arrays["matrix"].shape == (5, 2, 3)
+        sample = unflatten({key: array[3] for key, array in arrays.items()})
+        assert (sample["bert"]["input_ids"] == samples[3]["bert"]["input_ids"]).all()
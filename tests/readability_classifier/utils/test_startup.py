@@ -0,0 +1,51 @@
+import builtins
+import importlib
+import os
+import sys
+
+import pytest
+
+from src.readability_classifier.utils.startup import ImportProfiler
+from tests.readability_classifier.utils.utils import DirTest
+
+
+class TestImportProfiler(DirTest):
+    def setUp(self):
+        super().setUp()
+        for name in ("startup_outer", "startup_inner"):
+            sys.modules.pop(name, None)
+        with open(os.path.join(self.output_dir, "startup_inner.py"), "w") as f:
+            f.write("VALUE = 1\n")
+        with open(os.path.join(self.output_dir, "startup_outer.py"), "w") as f:
+            f.write("import startup_inner\n")
+        sys.path.insert(0, self.output_dir)
+        importlib.invalidate_caches()
+
+    def tearDown(self):
+        sys.path.remove(self.output_dir)
+        for name in ("startup_outer", "startup_inner"):
+            sys.modules.pop(name, None)
+        super().tearDown()
+
+    def test_times_outermost_imports(self):
+        original_import = builtins.__import__
+
+        with ImportProfiler() as profiler:
+            import json  # noqa: F401 - Already loaded, not timed
+
+            import startup_outer  # noqa: F401
+
+        assert builtins.__import__ is original_import
+        assert list(profiler.times) == ["startup_outer"]
+        assert profiler.total > 0
+        assert profiler.modules == 2
+        assert profiler.slowest(1) == [("startup_outer", profiler.total)]
+
+    def test_restores_import_on_error(self):
+        original_import = builtins.__import__
+
+        with pytest.raises(ModuleNotFoundError), ImportProfiler() as profiler:
+            import startup_missing  # noqa: F401
+
+        assert builtins.__import__ is original_import
+        assert "startup_missing" in profiler.times
@@ -3,6 +3,10 @@ import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
+import torch
+
+from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+
 CURR_DIR = Path(os.path.dirname(os.path.relpath(__file__)))
 RES_DIR = CURR_DIR / "../../res"
 
@@ -37,6 +41,38 @@ TOWARDS_CODE_SNIPPET = CODE_SNIPPETS_DIR / "towards.java"
 DIR_WITH_ONE_SNIPPET = CODE_SNIPPETS_DIR / "AreaShop/AreaShopInterface.java"
 DIR_WITH_FOUR_SNIPPETS = CODE_SNIPPETS_DIR / "AreaShop/AddCommand.java"
 
+ASCII_MIN = 1
+ASCII_MAX = 128
+HEIGHT = 305
+WIDTH = 50
+TOKEN_LENGTH = 100
+VOCAB_SIZE = 28996
+IMAGE_SHAPE = (3, 128, 128)
+NUM_SAMPLES = 4
+
+
+def create_test_dataset(num_samples: int = NUM_SAMPLES) -> ReadabilityDataset:
+    """
+    Creates a dataset of random encoded samples with the shapes of the encoders.
+    :param num_samples: The number of samples.
+    :return: The dataset.
+    """
+    samples = [
+        {
+            "matrix": torch.randint(ASCII_MIN, ASCII_MAX, (HEIGHT, WIDTH)).float(),
+            "bert": {
+                "input_ids": torch.randint(0, VOCAB_SIZE, (TOKEN_LENGTH,)),
+                "token_type_ids": torch.zeros(TOKEN_LENGTH, dtype=torch.long),
+                "attention_mask": torch.ones(TOKEN_LENGTH, dtype=torch.long),
+                "segment_ids": torch.zeros(TOKEN_LENGTH, dtype=torch.long),
+            },
+            "image": torch.rand(IMAGE_SHAPE),
+            "score": torch.rand(()),
+        }
+        for _ in range(num_samples)
+    ]
+    return ReadabilityDataset(samples)
+
 
 class DirTest(unittest.TestCase):
     output_dir_name = None  # Set to "output" to generate output